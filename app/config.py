@@ -1,16 +1,64 @@
 import os
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
+
+# Ключ для локального запуска без .env (alembic, seed_data, тесты).
+# Приложение с API_DEBUG=False с ним не стартует, см. lifespan в main.py
+DEV_SECRET_KEY = "dev-only-insecure-secret-key"
 
 class Settings(BaseSettings):
     # Database
-    DATABASE_URL: str
-    DB_NAME: str
+    DATABASE_URL: str = "sqlite:///./test.db"
+    DB_NAME: str = "test.db"
+
+    # Database pool (QueuePool; для SQLite :memory: не применяется)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool = False
+
+    # SQLite PRAGMA, применяются к каждому новому соединению
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -64000  # отрицательное значение — размер в KiB
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    
+    # Кэш каталога (товары, листинги), ролей и пользователей
+    # CACHE_BACKEND: memory — в памяти воркера, sqlite или redis — общий для воркеров (CACHE_URL)
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: Optional[str] = None
+    # Канал инвалидации для memory при нескольких воркерах: redis://... или путь к файлу SQLite
+    CACHE_INVALIDATION_URL: Optional[str] = None
+    CACHE_INVALIDATION_POLL_INTERVAL: float = 0.5
+    CATALOG_CACHE_TTL: int = 30
+    CATALOG_CACHE_MAX_SIZE: int = 1024
+    LOOKUP_CACHE_TTL: int = 60
+    LOOKUP_CACHE_MAX_SIZE: int = 1024
+    # max-age в Cache-Control каталога; 0 — браузер каждый раз проверяет ETag
+    HTTP_CACHE_MAX_AGE: int = 0
+    # Границы диапазонов цены в фасетах каталога: <100, 100-500, ..., 5000+
+    CATALOG_PRICE_BUCKETS: List[int] = [100, 500, 1000, 5000]
+    # Как часто индекс подсказок догоняет change_log (изменения других воркеров), секунды
+    SUGGEST_SYNC_INTERVAL: float = 1.0
+    # Ответы на POST с Idempotency-Key; хранятся в кэше "idempotency" бэкенда CACHE_BACKEND
+    IDEMPOTENCY_TTL: int = 86400
+    IDEMPOTENCY_MAX_SIZE: int = 10000
     
     # Security
-    SECRET_KEY: str
+    SECRET_KEY: str = DEV_SECRET_KEY
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Пока фронтенд не передаёт токен, принимаем X-User-Id / ?user_id= без подписи
+    AUTH_ALLOW_LEGACY_USER_ID: bool = True
+
+    # Пул для bcrypt: не больше N хешей одновременно, сверх очереди — 503
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_USE_PROCESSES: bool = False
     
     # API
     API_HOST: str = "0.0.0.0"
@@ -1,28 +1,88 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
-import os
-from dotenv import load_dotenv
+from typing import Any, AsyncGenerator, Dict, Generator
+from app.config import settings
+from app.database.search_index import ensure_search_index
 
-load_dotenv()
+DATABASE_URL = settings.DATABASE_URL
+
+# Асинхронный драйвер для SQLite (aiosqlite), остальные URL передаются как есть
+ASYNC_DATABASE_URL = settings.get_db_url
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+IS_SQLITE_MEMORY = IS_SQLITE and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") == "sqlite:")
+
+
+def get_engine_options() -> Dict[str, Any]:
+    """Параметры пула соединений из настроек"""
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    # In-memory SQLite живёт в одном соединении (StaticPool/SingletonThreadPool),
+    # параметры QueuePool к нему не применимы
+    if not IS_SQLITE_MEMORY:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Профиль SQLite: WAL, чтобы читатели не ждали писателя, и ожидание блокировки вместо ошибки"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    if not IS_SQLITE_MEMORY:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+    cursor.close()
 
-DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
-    "sqlite:///./test.db"
-)
 
+def configure_engine(sync_engine: Engine) -> None:
+    if IS_SQLITE:
+        event.listen(sync_engine, "connect", apply_sqlite_pragmas)
+
+
+# Синхронный движок: миграции, create_tables, seed_data
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+    connect_args={"check_same_thread": False} if IS_SQLITE else {},
+    **get_engine_options()
 )
+configure_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронный движок: все HTTP-запросы
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **get_engine_options())
+configure_engine(async_engine.sync_engine)
+
+async_session_maker = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_maker() as db:
+        yield db
+
+
+def get_sync_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
         yield db
@@ -32,7 +92,10 @@ def get_db() -> Generator[Session, None, None]:
 
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    # FTS5-индекс каталога не описывается моделями, создаётся отдельно
+    with engine.begin() as connection:
+        ensure_search_index(connection)
 
 
 def drop_tables():
-    Base.metadata.drop_all(bind=engine)
\ No newline at end of file
+    Base.metadata.drop_all(bind=engine)
@@ -1,16 +1,17 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from app.database.database import async_session_maker
-from app.repositories.roles import RolesRepository
-from app.repositories.users import UsersRepository
+from app.repositories.role_repository import RoleRepository
+from app.repositories.user_repository import UserRepository
 
 
 class DBManager:
-    def __init__(self, session_factory: async_session_maker):
+    def __init__(self, session_factory: async_sessionmaker = async_session_maker):
         self.session_factory = session_factory
 
     async def __aenter__(self):
         self.session = self.session_factory()
-        self.users = UsersRepository(self.session)
-        self.roles = RolesRepository(self.session)
+        self.users = UserRepository(self.session)
+        self.roles = RoleRepository(self.session)
         return self
 
     async def __aexit__(self, *args):
@@ -18,4 +19,4 @@ class DBManager:
         await self.session.close()
 
     async def commit(self):
-        await self.session.commit()
\ No newline at end of file
+        await self.session.commit()
@@ -0,0 +1,189 @@
+"""Проверка индексов для фильтров репозиториев и сервисов.
+
+Разбирает исходники app/repositories и app/services и собирает колонки, по
+которым методы фильтруют (``.filter``/``.where`` и именованные аргументы
+``filter_by``, ``get_one_by``, ``delete_where`` и т.п.). В сервисах вызов
+``self.<имя>_repository.filter_by(...)`` относится к модели этого репозитория.
+Фильтр считается покрытым, если хотя бы одна из его колонок является первой
+колонкой индекса, уникального ограничения или первичного ключа. Непокрытые
+фильтры печатаются, код выхода 1:
+
+    python -m app.database.index_check
+"""
+import ast
+import importlib
+import inspect
+import pkgutil
+import sys
+import textwrap
+import typing
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint
+
+import app.models
+import app.repositories
+import app.services
+from app.database.database import Base
+from app.services.service import BaseService
+
+EXPRESSION_METHODS = {"filter", "where"}
+KEYWORD_METHODS = {
+    "filter_by", "get_one_by", "get_by", "get_page", "count", "exists", "delete_where",
+}
+
+
+def _import_package(package) -> None:
+    for module in pkgutil.iter_modules(package.__path__):
+        importlib.import_module(f"{package.__name__}.{module.name}")
+
+
+def indexed_leading_columns(table) -> Set[str]:
+    """Колонки, с которых начинается какой-либо индекс таблицы"""
+    leading = set()
+    for index in table.indexes:
+        leading.add(list(index.columns)[0].name)
+    for constraint in table.constraints:
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)) and constraint.columns:
+            leading.add(list(constraint.columns)[0].name)
+    for column in table.columns:
+        if column.unique or column.index:
+            leading.add(column.name)
+    return leading
+
+
+def _self_attribute(node: ast.AST) -> Optional[str]:
+    """Имя атрибута для выражения ``self.<имя>``"""
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self":
+        return node.attr
+    return None
+
+
+class _FilterCollector(ast.NodeVisitor):
+    """Группы колонок (модель, колонки) из фильтров одного метода.
+
+    ``own_model`` - модель для ``self.model`` и вызовов без явного получателя
+    (``self.filter_by`` в репозитории), ``receivers`` - модели репозиториев,
+    доступных как ``self.<имя>``.
+    """
+
+    def __init__(self, models: Dict[str, type], own_model=None, receivers: Optional[Dict[str, type]] = None):
+        self.models = models
+        self.own_model = own_model
+        self.receivers = receivers or {}
+        self.expression_columns: Dict[type, Set[str]] = {}
+        self.keyword_groups: List[Tuple[type, Set[str]]] = []
+
+    def _expression_model(self, node: ast.AST):
+        if isinstance(node, ast.Name):
+            return self.models.get(node.id)
+        if _self_attribute(node) == "model":
+            return self.own_model
+        return None
+
+    def _receiver_model(self, node: ast.AST):
+        name = _self_attribute(node)
+        if name is not None and name in self.receivers:
+            return self.receivers[name]
+        return self.own_model
+
+    def groups(self) -> List[Tuple[type, Set[str]]]:
+        return self.keyword_groups + list(self.expression_columns.items())
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Attribute):
+            method = node.func.attr
+            if method in EXPRESSION_METHODS:
+                for arg in node.args:
+                    for sub in ast.walk(arg):
+                        if isinstance(sub, ast.Attribute):
+                            model = self._expression_model(sub.value)
+                            if model is not None:
+                                self.expression_columns.setdefault(model, set()).add(sub.attr)
+            elif method in KEYWORD_METHODS:
+                model = self._receiver_model(node.func.value)
+                group = {kw.arg for kw in node.keywords if kw.arg is not None}
+                if model is not None and group:
+                    self.keyword_groups.append((model, group))
+        self.generic_visit(node)
+
+
+def _repository_model(cls, models: Dict[str, type]):
+    """Модель репозитория по вызову super().__init__(Model, db) или (db, Model)"""
+    source = inspect.getsource(cls.__init__)
+    for node in ast.walk(ast.parse(textwrap.dedent(source))):
+        if isinstance(node, ast.Name) and node.id in models:
+            return models[node.id]
+    return None
+
+
+def _service_receivers(cls, repository_models: Dict[type, type]) -> Dict[str, type]:
+    """Модели репозиториев сервиса: по аннотациям __init__ и BaseService[Model]"""
+    receivers = {}
+    for base in getattr(cls, "__orig_bases__", ()):
+        if typing.get_origin(base) is BaseService:
+            receivers["repository"] = typing.get_args(base)[0]
+    for parameter in inspect.signature(cls.__init__).parameters.values():
+        if parameter.annotation in repository_models:
+            receivers[parameter.name] = repository_models[parameter.annotation]
+    return receivers
+
+
+def _classes(package, suffix: str) -> List[type]:
+    _import_package(package)
+    classes = set()
+    for module_name in list(sys.modules):
+        if module_name.startswith(f"{package.__name__}."):
+            for _, cls in inspect.getmembers(sys.modules[module_name], inspect.isclass):
+                if cls.__module__ == module_name and cls.__name__.endswith(suffix):
+                    classes.add(cls)
+    return sorted(classes, key=lambda c: c.__name__)
+
+
+def _check_class(cls, collector_factory) -> List[Tuple[str, str, Set[str]]]:
+    problems = []
+    for name, func in inspect.getmembers(cls, inspect.isfunction):
+        if func.__qualname__.split(".")[0] != cls.__name__:
+            continue
+        collector = collector_factory()
+        collector.visit(ast.parse(textwrap.dedent(inspect.getsource(func))))
+        for model, group in collector.groups():
+            table = model.__table__
+            columns = {column for column in group if column in table.columns}
+            if columns and not columns & indexed_leading_columns(table):
+                problems.append((f"{cls.__name__}.{name}", table.name, columns))
+    return problems
+
+
+def find_unindexed_filters() -> List[Tuple[str, str, Set[str]]]:
+    """Список (метод, таблица, колонки) для фильтров без индекса"""
+    _import_package(app.models)
+    models = {mapper.class_.__name__: mapper.class_ for mapper in Base.registry.mappers}
+
+    problems = []
+    repository_models = {}
+    for cls in _classes(app.repositories, "Repository"):
+        model = _repository_model(cls, models)
+        if model is None:
+            continue
+        repository_models[cls] = model
+        problems += _check_class(cls, lambda: _FilterCollector(models, own_model=model))
+
+    for cls in _classes(app.services, "Service"):
+        receivers = _service_receivers(cls, repository_models)
+        problems += _check_class(cls, lambda: _FilterCollector(models, receivers=receivers))
+    return problems
+
+
+def main() -> int:
+    problems = find_unindexed_filters()
+    for method, table, columns in problems:
+        print(f"{method}: {table}({', '.join(sorted(columns))}) без индекса")
+    if problems:
+        return 1
+    print("Все фильтры репозиториев и сервисов покрыты индексами")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Полнотекстовый индекс каталога на SQLite FTS5.
+
+Одна виртуальная таблица catalog_search на товары, листинги и авторские
+листинги. rowid строки индекса = id * 4 + код типа, поэтому триггеры
+обновляют и удаляют запись по rowid без сканирования индекса. Триггеры
+срабатывают на любую запись в таблицы каталога, в том числе из массовых
+UPDATE/DELETE репозиториев и seed_data.
+"""
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+SEARCH_TABLE = "catalog_search"
+
+# тип -> (код в rowid, таблица, колонка title, колонка description, колонка темы)
+SEARCH_SOURCES = {
+    "product": (1, "products", "title", "description", "category"),
+    "listing": (2, "listing", "title", None, "game_topic"),
+    "author_listing": (3, "author_listing", "title", None, "topics_games"),
+}
+
+
+def is_search_table(name: str) -> bool:
+    """catalog_search и её служебные таблицы FTS5 (_data, _idx, _content, ...)"""
+    return name == SEARCH_TABLE or name.startswith(f"{SEARCH_TABLE}_")
+
+
+def _row_values(item_type: str, alias: str) -> str:
+    code, _, title, description, topic = SEARCH_SOURCES[item_type]
+    description_sql = f"{alias}.{description}" if description else "NULL"
+    return (
+        f"{alias}.id * 4 + {code}, '{item_type}', {alias}.id, "
+        f"{alias}.{title}, {description_sql}, {alias}.{topic}"
+    )
+
+
+def search_index_ddl() -> List[str]:
+    """CREATE для таблицы FTS5 и триггеров синхронизации"""
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "item_type UNINDEXED, item_id UNINDEXED, title, description, topic, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    ]
+    columns = "rowid, item_type, item_id, title, description, topic"
+    for item_type, (code, table, title, description, topic) in SEARCH_SOURCES.items():
+        indexed = ", ".join(column for column in (title, description, topic) if column)
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {SEARCH_TABLE} ({columns}) VALUES ({_row_values(item_type, 'new')}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {indexed} ON {table} BEGIN "
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 4 + {code}; "
+            f"INSERT INTO {SEARCH_TABLE} ({columns}) VALUES ({_row_values(item_type, 'new')}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 4 + {code}; END",
+        ]
+    return statements
+
+
+def rebuild_search_index_sql() -> List[str]:
+    """Полная перестройка индекса по текущим данным каталога"""
+    statements = [f"DELETE FROM {SEARCH_TABLE}"]
+    for item_type, (_, table, *_) in SEARCH_SOURCES.items():
+        statements.append(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, item_type, item_id, title, description, topic) "
+            f"SELECT {_row_values(item_type, 't')} FROM {table} t"
+        )
+    return statements
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """Создать индекс и триггеры, если их нет (для create_tables); только SQLite"""
+    if connection.dialect.name != "sqlite":
+        return
+    created = SEARCH_TABLE not in inspect(connection).get_table_names()
+    for statement in search_index_ddl():
+        connection.execute(text(statement))
+    if created:
+        for statement in rebuild_search_index_sql():
+            connection.execute(text(statement))
@@ -0,0 +1,32 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """Транзакция операции сервиса.
+
+    Репозитории только делают flush, а commit выполняется один раз при выходе
+    из самого внешнего блока ``async with``. Вложенные блоки (сервис вызывает
+    другой метод сервиса) не коммитят сами, решение принимает внешний блок.
+    При исключении вся транзакция откатывается.
+    """
+
+    DEPTH_KEY = "uow_depth"
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self.db.info[self.DEPTH_KEY] = self.db.info.get(self.DEPTH_KEY, 0) + 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        depth = self.db.info[self.DEPTH_KEY] - 1
+        self.db.info[self.DEPTH_KEY] = depth
+        if depth:
+            return False
+
+        if exc_type is None:
+            await self.db.commit()
+        else:
+            await self.db.rollback()
+        return False
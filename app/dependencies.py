@@ -1,38 +1,89 @@
-from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, Query, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.config import settings
 from app.database.database import get_db
 from app.models.users import UserModel
+from app.schemas.user_schema import TokenPayload
+from app.utils.security import decode_access_token, is_admin_role
 
+bearer_scheme = HTTPBearer(auto_error=False)
 
-def get_current_user(user_id: int = None, db: Session = Depends(get_db)) -> UserModel:
-    if not user_id:
+
+def get_token_payload(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[TokenPayload]:
+    """Данные из Bearer-токена, None если заголовка Authorization нет"""
+    if credentials is None:
+        return None
+    return decode_access_token(credentials.credentials)
+
+
+def get_caller_id(
+    payload: Optional[TokenPayload] = Depends(get_token_payload),
+    x_user_id: Optional[int] = Header(None)
+) -> Optional[int]:
+    """id вызывающего из токена, без токена — из X-User-Id.
+
+    Пока включён AUTH_ALLOW_LEGACY_USER_ID, можно не представляться (None):
+    страницы избранного и заказов ещё не передают ни токен, ни X-User-Id.
+    """
+    if payload is not None:
+        return payload.user_id
+    if not settings.AUTH_ALLOW_LEGACY_USER_ID:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User ID required"
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
         )
-    
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
+    return x_user_id
+
+
+def get_current_user_id(caller_id: Optional[int] = Depends(get_caller_id)) -> int:
+    if caller_id is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
         )
-    return user
+    return caller_id
 
 
-def require_admin(current_user: UserModel = Depends(get_current_user)) -> UserModel:
-    if current_user.role.name.lower() != "admin":
+def check_owner(owner_id: int, caller_id: Optional[int]) -> None:
+    """Чужие избранное и заказы — 403; caller_id из get_caller_id"""
+    if caller_id is not None and caller_id != owner_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
+            detail="Access to another user's data is forbidden"
         )
-    return current_user
 
 
-def require_user(current_user: UserModel = Depends(get_current_user)) -> UserModel:
-    if not current_user:
+async def require_admin(
+    user_id: Optional[int] = Query(None),
+    payload: Optional[TokenPayload] = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db)
+) -> TokenPayload:
+    """Проверить что пользователь админ: по токену без запроса в БД, иначе по user_id"""
+    if payload is None:
+        if user_id is None or not settings.AUTH_ALLOW_LEGACY_USER_ID:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        user = await db.get(UserModel, user_id, options=[selectinload(UserModel.role)])
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        payload = TokenPayload(user_id=user.id, role_id=user.role_id, is_admin=is_admin_role(user.role.name))
+    
+    if not payload.is_admin:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
         )
-    return current_user
\ No newline at end of file
+    return payload
@@ -9,12 +9,9 @@ class CartNotFoundException(NotFoundException):
         if cart_id:
             super().__init__(resource_name="Cart", resource_id=str(cart_id))
         elif user_id:
-            detail = f"Cart for user with ID {user_id} not found"
-            super().__init__(
-                status_code=404,
-                error_code="cart_not_found",
-                detail=detail
-            )
+            super().__init__(resource_name="Cart")
+            self.error_code = "cart_not_found"
+            self.detail = f"Cart for user with ID {user_id} not found"
             self.extra = {"user_id": user_id}
         else:
             super().__init__(resource_name="Cart")
@@ -43,4 +40,15 @@ class EmptyCartException(BadRequestException):
             detail=detail,
             error_code="cart_empty"
         )
-        self.extra = {"cart_id": cart_id}
\ No newline at end of file
+        self.extra = {"cart_id": cart_id}
+
+class CartItemsUnavailableException(BadRequestException):
+    """Исключение, когда часть товаров корзины снята с продажи или удалена"""
+    
+    def __init__(self, cart_item_ids: list):
+        detail = f"Cart items are no longer available: {', '.join(map(str, cart_item_ids))}"
+        super().__init__(
+            detail=detail,
+            error_code="cart_items_unavailable",
+            extra={"cart_item_ids": cart_item_ids}
+        )
@@ -0,0 +1,35 @@
+from app.exceptions.base_exceptions import BaseAPIException
+
+
+class InvalidIdempotencyKeyException(BaseAPIException):
+    """Исключение: пустой или слишком длинный Idempotency-Key"""
+    
+    def __init__(self, max_length: int):
+        super().__init__(
+            status_code=400,
+            error_code="idempotency_key_invalid",
+            detail=f"Idempotency-Key must be 1-{max_length} characters"
+        )
+
+
+class IdempotencyKeyInUseException(BaseAPIException):
+    """Исключение: запрос с этим ключом ещё выполняется"""
+    
+    def __init__(self):
+        super().__init__(
+            status_code=409,
+            error_code="idempotency_key_in_use",
+            detail="A request with this Idempotency-Key is still being processed",
+            headers={"Retry-After": "1"}
+        )
+
+
+class IdempotencyKeyMismatchException(BaseAPIException):
+    """Исключение: ключ уже использован с другим телом запроса"""
+    
+    def __init__(self):
+        super().__init__(
+            status_code=422,
+            error_code="idempotency_key_mismatch",
+            detail="Idempotency-Key was already used with a different request body"
+        )
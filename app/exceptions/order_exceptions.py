@@ -28,4 +28,14 @@ class OrderStatusException(BadRequestException):
                 "current_status": current_status,
                 "target_status": target_status
             }
-        )
\ No newline at end of file
+        )
+
+class OrderQueueException(BadRequestException):
+    """Исключение, когда из очереди статуса нельзя забирать заказы"""
+    
+    def __init__(self, status: str):
+        super().__init__(
+            detail=f"Orders in status '{status}' cannot be claimed",
+            error_code="ORDER_QUEUE_ERROR",
+            extra={"status": status}
+        )
@@ -0,0 +1,14 @@
+from app.exceptions.base_exceptions import BaseAPIException
+
+class SearchUnavailableException(BaseAPIException):
+    """Исключение: полнотекстовый поиск недоступен для текущей БД"""
+    
+    def __init__(self, detail: str = None):
+        if detail is None:
+            detail = "Полнотекстовый поиск доступен только с SQLite (FTS5)"
+            
+        super().__init__(
+            status_code=501,
+            error_code="search_unavailable",
+            detail=detail
+        )
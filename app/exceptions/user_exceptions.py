@@ -34,6 +34,16 @@ class UserAlreadyExistsException(BaseAPIException):
             detail=detail
         )
 
+class UserHasRecordsException(BaseAPIException):
+    """Исключение: у пользователя есть заказы, публикации или другие записи, удалять нельзя"""
+    
+    def __init__(self, user_id: int, tables: list):
+        super().__init__(
+            status_code=409,
+            error_code="user_has_records",
+            detail=f"Пользователь с ID {user_id} не может быть удалён: есть записи в {', '.join(tables)}"
+        )
+
 class InvalidCredentialsException(BaseAPIException):
     """Исключение: неверные учетные данные"""
     
@@ -47,6 +57,34 @@ class InvalidCredentialsException(BaseAPIException):
             detail=detail
         )
 
+class InvalidTokenException(BaseAPIException):
+    """Исключение: токен недействителен или истёк"""
+    
+    def __init__(self, detail: str = None):
+        if detail is None:
+            detail = "Недействительный токен доступа"
+            
+        super().__init__(
+            status_code=401,
+            error_code="invalid_token",
+            detail=detail,
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+class PasswordHasherBusyException(BaseAPIException):
+    """Исключение: очередь на проверку паролей переполнена"""
+    
+    def __init__(self, detail: str = None, retry_after: int = 1):
+        if detail is None:
+            detail = "Сервис авторизации перегружен, повторите попытку позже"
+            
+        super().__init__(
+            status_code=503,
+            error_code="password_hasher_busy",
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+
 class InsufficientPermissionsException(BaseAPIException):
     """Исключение: недостаточно прав"""
     
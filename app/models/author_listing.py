@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, DateTime, ForeignKey, Integer, DECIMAL
+from sqlalchemy import String, DateTime, ForeignKey, Integer, DECIMAL, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship 
 from app.database.database import Base
 
@@ -10,12 +10,20 @@ if TYPE_CHECKING:
 
 class AuthorListingModel(Base):
     __tablename__ = "author_listing"
+    __table_args__ = (
+        Index("ix_author_listing_status_created_at", "status", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     prise: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
-    topics_games: Mapped[str] = mapped_column(String(100), nullable=False)
+    topics_games: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default="active")
\ No newline at end of file
+    status: Mapped[str] = mapped_column(String(50), nullable=False, default="active", index=True)
+    row_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1", onupdate=text("row_version + 1")
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Float, ForeignKey, Integer, DateTime, Enum as SQLEnum
+from sqlalchemy import String, Float, ForeignKey, Integer, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 from .carts import CartModel
@@ -7,9 +7,15 @@ from .carts import CartModel
 
 class CartItemModel(Base):
     __tablename__ = "cart_items"
+    __table_args__ = (
+        # Позиция корзины уникальна по товару, повторное добавление увеличивает quantity
+        Index("uq_cart_items_cart_id_item_type_product_id", "cart_id", "item_type", "product_id", unique=True),
+        Index("uq_cart_items_cart_id_item_type_listing_id", "cart_id", "item_type", "listing_id", unique=True),
+        Index("uq_cart_items_cart_id_item_type_author_listing_id", "cart_id", "item_type", "author_listing_id", unique=True),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    cart_id: Mapped[int] = mapped_column(ForeignKey("carts.id"), nullable=False)
+    cart_id: Mapped[int] = mapped_column(ForeignKey("carts.id"), nullable=False, index=True)
     item_type: Mapped[str] = mapped_column(String(20), nullable=False)  # 'product', 'listing', 'author_listing'
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=True)
     listing_id: Mapped[int] = mapped_column(ForeignKey("listing.id"), nullable=True)
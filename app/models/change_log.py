@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import String, Integer, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class ChangeLogModel(Base):
+    """Журнал изменений отслеживаемых таблиц; id растёт монотонно и служит позицией для /changes?since="""
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_table_name_id", "table_name", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    table_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    row_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,12 +1,20 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Float, ForeignKey, Integer, DateTime
+from sqlalchemy import String, Float, ForeignKey, Integer, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
 class FavoriteModel(Base):
     __tablename__ = "favorite"
+    __table_args__ = (
+        # Избранное пользователя выбирается в порядке added_at
+        Index("ix_favorite_user_id_added_at", "user_id", "added_at"),
+        # Один товар в избранном пользователя один раз (NULL не конфликтуют)
+        Index("uq_favorite_user_id_products_id", "user_id", "products_id", unique=True),
+        Index("uq_favorite_user_id_listing_id", "user_id", "listing_id", unique=True),
+        Index("uq_favorite_user_id_author_listing_id", "user_id", "author_listing_id", unique=True),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
@@ -6,14 +6,21 @@ from app.database.database import Base
 
 if TYPE_CHECKING:
     from app.models.users import UserModel
+    from app.models.orders import OrderModel
 
 class OrderItemModel(Base):
     __tablename__ = "order_items"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), nullable=False)
+    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), nullable=False, index=True)
     products_id: Mapped[Optional[int]] = mapped_column(ForeignKey("products.id"), nullable=True)
     listing_id: Mapped[Optional[int]] = mapped_column(ForeignKey("listing.id"), nullable=True)
     author_listing_id: Mapped[Optional[int]] = mapped_column(ForeignKey("author_listing.id"), nullable=True)
     unit_price: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
-    quantity: Mapped[int] = mapped_column(Integer, default=1)
\ No newline at end of file
+    quantity: Mapped[int] = mapped_column(Integer, default=1)
+    
+    # Связи
+    order: Mapped["OrderModel"] = relationship("OrderModel", back_populates="items")
+    product = relationship("ProductModel")
+    listing = relationship("ListingModel")
+    author_listing = relationship("AuthorListingModel")
\ No newline at end of file
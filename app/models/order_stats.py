@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Integer, DECIMAL, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class OrderStatsModel(Base):
+    """Сводка заказов пользователя, обновляется в транзакции каждой записи заказа.
+
+    Отменённые заказы не учитываются: ни в количестве, ни в сумме, ни в дате последнего заказа.
+    """
+    __tablename__ = "user_order_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_spent: Mapped[float] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+    last_order_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,65 @@
+from enum import Enum
+from typing import Dict, FrozenSet, Optional
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class OrderStatus(str, Enum):
+    PENDING = "pending"
+    PAID = "paid"
+    PROCESSING = "processing"
+    SHIPPED = "shipped"
+    DELIVERED = "delivered"
+    CANCELLED = "cancelled"
+
+
+# Допустимые переходы; из delivered и cancelled выхода нет
+ORDER_STATUS_TRANSITIONS: Dict[OrderStatus, FrozenSet[OrderStatus]] = {
+    OrderStatus.PENDING: frozenset({OrderStatus.PAID, OrderStatus.CANCELLED}),
+    OrderStatus.PAID: frozenset({OrderStatus.PROCESSING, OrderStatus.CANCELLED}),
+    OrderStatus.PROCESSING: frozenset({OrderStatus.SHIPPED, OrderStatus.CANCELLED}),
+    OrderStatus.SHIPPED: frozenset({OrderStatus.DELIVERED}),
+    OrderStatus.DELIVERED: frozenset(),
+    OrderStatus.CANCELLED: frozenset(),
+}
+
+# Куда переводит заказ воркер, забравший его из очереди статуса.
+# Очереди pending нет: в paid заказ переводит только оплата, а не воркер
+ORDER_QUEUE_NEXT_STATUS: Dict[OrderStatus, OrderStatus] = {
+    OrderStatus.PAID: OrderStatus.PROCESSING,
+    OrderStatus.PROCESSING: OrderStatus.SHIPPED,
+    OrderStatus.SHIPPED: OrderStatus.DELIVERED,
+}
+
+# Коды в БД; менять существующие нельзя, только добавлять новые
+ORDER_STATUS_CODES: Dict[OrderStatus, int] = {
+    OrderStatus.PENDING: 1,
+    OrderStatus.PAID: 2,
+    OrderStatus.PROCESSING: 3,
+    OrderStatus.SHIPPED: 4,
+    OrderStatus.DELIVERED: 5,
+    OrderStatus.CANCELLED: 6,
+}
+_STATUS_BY_CODE = {code: status for status, code in ORDER_STATUS_CODES.items()}
+
+
+def can_transition(current: OrderStatus, target: OrderStatus) -> bool:
+    return target in ORDER_STATUS_TRANSITIONS[current]
+
+
+class OrderStatusType(TypeDecorator):
+    """Статус заказа: в Python — OrderStatus, в БД — SmallInteger-код"""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return ORDER_STATUS_CODES[OrderStatus(value)]
+
+    def process_result_value(self, value, dialect) -> Optional[OrderStatus]:
+        if value is None:
+            return None
+        return _STATUS_BY_CODE[value]
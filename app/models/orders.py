@@ -1,22 +1,35 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
-from sqlalchemy import String, DateTime, ForeignKey, Integer, DECIMAL
+from sqlalchemy import String, DateTime, ForeignKey, Integer, DECIMAL, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
+from app.models.order_status import OrderStatus, OrderStatusType
 
 if TYPE_CHECKING:
     from app.models.users import UserModel
+    from app.models.order_items import OrderItemModel
 
 class OrderModel(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Заказы пользователя выбираются в порядке creat_at
+        Index("ix_orders_user_id_creat_at", "user_id", "creat_at"),
+        # Очередь статуса: старые заказы первыми без сортировки всей таблицы
+        Index("ix_orders_status_creat_at", "status", "creat_at"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     total_amount: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
-    status: Mapped[str] = mapped_column(String(50), nullable=False, default="pending")
+    # Сумма quantity позиций, записывается вместе с ними: итог не пересчитывается при чтении
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    status: Mapped[OrderStatus] = mapped_column(OrderStatusType, nullable=False, default=OrderStatus.PENDING)
     customer_name: Mapped[str] = mapped_column(String(255), nullable=False)
     customer_email: Mapped[str] = mapped_column(String(100), nullable=False)
     payment_method: Mapped[str] = mapped_column(String(50), nullable=False)
     payment_data: Mapped[str] = mapped_column(String(500), nullable=True)
-    creat_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    creat_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    
+    # Связи
+    items: Mapped[List["OrderItemModel"]] = relationship("OrderItemModel", back_populates="order", cascade="all, delete-orphan")
\ No newline at end of file
@@ -1,17 +1,30 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Integer, DECIMAL, Boolean, Text
+from sqlalchemy import String, Integer, DECIMAL, Boolean, Text, DateTime, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 
 class ProductModel(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Лента каталога: активные товары от новых к старым
+        Index("ix_products_is_active_created_at", "is_active", "created_at"),
+    )
+    # row_version считается в БД; после INSERT/UPDATE забираем его через RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     price: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
-    category: Mapped[str] = mapped_column(String(100), nullable=False)
+    category: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     image_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     popularity: Mapped[int] = mapped_column(Integer, default=0)
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
\ No newline at end of file
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    # Версия строки и время изменения: по ним клиенты синхронизируются через /changes
+    row_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1", onupdate=text("row_version + 1")
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
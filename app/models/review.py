@@ -9,11 +9,11 @@ class ReviewModel(Base):
     __tablename__ = "review"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
-    products_id: Mapped[Optional[int]] = mapped_column(ForeignKey("products.id"), nullable=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    products_id: Mapped[Optional[int]] = mapped_column(ForeignKey("products.id"), nullable=True, index=True)
     listing_id: Mapped[Optional[int]] = mapped_column(ForeignKey("listing.id"), nullable=True)
     author_listing_id: Mapped[Optional[int]] = mapped_column(ForeignKey("author_listing.id"), nullable=True)
-    rating: Mapped[int] = mapped_column(Integer, nullable=False)
+    rating: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     comment: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
\ No newline at end of file
+    is_verified: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
\ No newline at end of file
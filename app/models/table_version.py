@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class TableVersionModel(Base):
+    """Счётчик изменений таблицы, увеличивается репозиториями при каждой записи"""
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
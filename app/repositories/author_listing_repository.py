@@ -1,21 +1,28 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.author_listing import AuthorListingModel
 from app.repositories.repository import BaseRepository
 
 class AuthorListingRepository(BaseRepository[AuthorListingModel]):
-    def __init__(self, db: Session):
+    track_changes = True
+
+    def __init__(self, db: AsyncSession):
         super().__init__(AuthorListingModel, db)
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
-        return self.db.query(self.model)\
-            .filter(self.model.user_id == user_id)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
+    async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.user_id == user_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
     
-    def get_by_topic(self, topic: str, skip: int = 0, limit: int = 100):
-        return self.db.query(self.model)\
-            .filter(self.model.topics_games == topic)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
\ No newline at end of file
+    async def get_by_topic(self, topic: str, skip: int = 0, limit: int = 100):
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.topics_games == topic)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
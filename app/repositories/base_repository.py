@@ -1,30 +1,34 @@
-
-from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Union
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
+from datetime import datetime
+from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Tuple, Union
+from sqlalchemy import select, update, delete, func, asc, desc, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import Base
+from app.repositories.pagination import apply_keyset, split_page
+from app.repositories.versions import bump_table_version, get_table_version, record_changes
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 class BaseRepository(Generic[ModelType]):
-    def __init__(self, db: Session, model: Type[ModelType]):
+    track_changes: bool = False  # писать ли изменения строк в change_log
+
+    def __init__(self, db: AsyncSession, model: Type[ModelType]):
         self.db = db
         self.model = model
 
-    def get(self, id: Any) -> Optional[ModelType]:
+    async def get(self, id: Any) -> Optional[ModelType]:
         """Получить запись по ID"""
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        return await self.db.get(self.model, id)
 
-    def get_all(
-        self, 
-        skip: int = 0, 
+    async def get_all(
+        self,
+        skip: int = 0,
         limit: int = 100,
         order_by: Optional[str] = None,
         order_desc: bool = False
     ) -> List[ModelType]:
         """Получить все записи с пагинацией и сортировкой"""
-        query = self.db.query(self.model)
-        
+        query = select(self.model)
+
         if order_by:
             column = getattr(self.model, order_by, None)
             if column:
@@ -32,18 +36,19 @@ class BaseRepository(Generic[ModelType]):
                     query = query.order_by(desc(column))
                 else:
                     query = query.order_by(asc(column))
-        
-        return query.offset(skip).limit(limit).all()
 
-    def get_by(
-        self, 
-        skip: int = 0, 
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_by(
+        self,
+        skip: int = 0,
         limit: int = 100,
         **filters
     ) -> List[ModelType]:
         """Получить записи по фильтрам"""
-        query = self.db.query(self.model)
-        
+        query = select(self.model)
+
         for attr, value in filters.items():
             if value is not None:
                 if isinstance(value, list):
@@ -51,71 +56,141 @@ class BaseRepository(Generic[ModelType]):
                     query = query.filter(column.in_(value))
                 else:
                     query = query.filter(getattr(self.model, attr) == value)
-        
-        return query.offset(skip).limit(limit).all()
 
-    def get_one_by(self, **filters) -> Optional[ModelType]:
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc",
+        **filters
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Получить страницу записей по курсору (keyset) и курсор следующей страницы"""
+        query = select(self.model)
+
+        for attr, value in filters.items():
+            if value is not None:
+                query = query.filter(getattr(self.model, attr) == value)
+
+        query = apply_keyset(query, self.model, order_by, order_direction, after)
+        result = await self.db.execute(query.limit(limit + 1))
+        return split_page(list(result.scalars().all()), limit, order_by)
+
+    async def get_one_by(self, **filters) -> Optional[ModelType]:
         """Получить одну запись по фильтрам"""
-        query = self.db.query(self.model)
-        
+        query = select(self.model)
+
         for attr, value in filters.items():
             if value is not None:
                 query = query.filter(getattr(self.model, attr) == value)
-        
-        return query.first()
 
-    def create(self, obj_in: Union[Dict[str, Any], ModelType]) -> ModelType:
+        result = await self.db.execute(query.limit(1))
+        return result.scalars().first()
+
+    async def create(self, obj_in: Union[Dict[str, Any], ModelType]) -> ModelType:
         """Создать новую запись"""
         if isinstance(obj_in, dict):
             obj_in_data = obj_in
         else:
             obj_in_data = obj_in.dict() if hasattr(obj_in, 'dict') else obj_in.__dict__
-        
+
         db_obj = self.model(**obj_in_data)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        await self.db.flush()
+        await self._touch("insert", [inspect(db_obj).identity[0]])
         return db_obj
 
-    def update(self, id: Any, obj_in: Union[Dict[str, Any], ModelType]) -> Optional[ModelType]:
+    async def update(self, id: Any, obj_in: Union[Dict[str, Any], ModelType]) -> Optional[ModelType]:
         """Обновить запись"""
-        db_obj = self.get(id)
+        db_obj = await self.get(id)
         if not db_obj:
             return None
-        
+
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True) if hasattr(obj_in, 'dict') else obj_in.__dict__
-        
+
         for field, value in update_data.items():
             if hasattr(db_obj, field) and value is not None:
                 setattr(db_obj, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_obj)
+
+        await self.db.flush()
+        await self._touch("update", [id])
         return db_obj
 
-    def delete(self, id: Any) -> bool:
+    async def delete(self, id: Any) -> bool:
         """Удалить запись"""
-        db_obj = self.get(id)
+        db_obj = await self.get(id)
         if not db_obj:
             return False
-        
-        self.db.delete(db_obj)
-        self.db.commit()
+
+        await self.db.delete(db_obj)
+        await self.db.flush()
+        await self._touch("delete", [id])
         return True
 
-    def count(self, **filters) -> int:
+    async def _touch(self, operation: str, row_ids: List[Any]) -> None:
+        """Увеличить счётчик изменений таблицы и, если включено, записать строки в change_log"""
+        await bump_table_version(self.db, self.model.__tablename__)
+        if self.track_changes:
+            await record_changes(self.db, self.model.__tablename__, operation, row_ids)
+
+    async def _execute_where(self, stmt, operation: str) -> int:
+        """Выполнить массовый UPDATE/DELETE и отметить изменение, вернуть количество строк"""
+        if self.track_changes:
+            primary_key = inspect(self.model).primary_key[0]
+            row_ids = list((await self.db.execute(stmt.returning(primary_key))).scalars())
+            count = len(row_ids)
+        else:
+            row_ids = []
+            count = (await self.db.execute(stmt)).rowcount
+        if count:
+            await self._touch(operation, row_ids)
+        return count
+
+    async def table_version(self) -> Tuple[int, Optional[datetime]]:
+        """Счётчик изменений таблицы и время последнего изменения"""
+        return await get_table_version(self.db, self.model.__tablename__)
+
+    def _where(self, filters: Dict[str, Any]) -> list:
+        """Условия WHERE для массовых операций (список значений -> IN)"""
+        if not filters:
+            raise ValueError(f"{self.model.__name__}: set-based operation requires at least one filter")
+
+        conditions = []
+        for attr, value in filters.items():
+            column = getattr(self.model, attr)
+            if isinstance(value, (list, tuple, set)):
+                conditions.append(column.in_(value))
+            else:
+                conditions.append(column == value)
+        return conditions
+
+    async def delete_where(self, **filters) -> int:
+        """Удалить записи по фильтрам одним DELETE, вернуть количество строк"""
+        return await self._execute_where(delete(self.model).where(*self._where(filters)), "delete")
+
+    async def update_where(self, filters: Dict[str, Any], values: Dict[str, Any]) -> int:
+        """Обновить записи по фильтрам одним UPDATE, вернуть количество строк"""
+        return await self._execute_where(
+            update(self.model).where(*self._where(filters)).values(**values), "update"
+        )
+
+    async def count(self, **filters) -> int:
         """Получить количество записей по фильтрам"""
-        query = self.db.query(self.model)
-        
+        query = select(func.count()).select_from(self.model)
+
         for attr, value in filters.items():
             if value is not None:
                 query = query.filter(getattr(self.model, attr) == value)
-        
-        return query.count()
 
-    def exists(self, **filters) -> bool:
+        result = await self.db.execute(query)
+        return result.scalar_one()
+
+    async def exists(self, **filters) -> bool:
         """Проверить существование записи по фильтрам"""
-        return self.get_one_by(**filters) is not None
+        return await self.get_one_by(**filters) is not None
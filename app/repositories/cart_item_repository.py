@@ -1,23 +1,113 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, and_, case, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.author_listing import AuthorListingModel
 from app.models.cart_items import CartItemModel
+from app.models.listing import ListingModel
+from app.models.products import ProductModel
 from app.repositories.repository import BaseRepository
+from app.repositories.upsert import dialect_insert
 
 
 class CartItemRepository(BaseRepository[CartItemModel]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(CartItemModel, db)
     
-    def get_by_cart_id(self, cart_id: int, skip: int = 0, limit: int = 100) -> List[CartItemModel]:
-        return self.db.query(self.model)\
-            .filter(self.model.cart_id == cart_id)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
+    async def get_by_cart_id(self, cart_id: int, skip: int = 0, limit: int = 100) -> List[CartItemModel]:
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.cart_id == cart_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
     
-    def get_by_cart_and_item(self, cart_id: int, item_type: str, item_id: int) -> Optional[CartItemModel]:
+    async def get_by_cart_id_with_catalog(self, cart_id: int, skip: int = 0, limit: int = 100) -> List[CartItemModel]:
+        # Товары подгружаются одним IN-запросом на каждую таблицу каталога, а не запросом на элемент
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.cart_id == cart_id)
+            .options(
+                selectinload(self.model.product),
+                selectinload(self.model.listing),
+                selectinload(self.model.author_listing),
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+    
+    async def get_priced_items(self, cart_id: int) -> List[Row]:
+        """Позиции корзины с текущей ценой каталога и признаком доступности.
+
+        Один SELECT с LEFT JOIN на три таблицы каталога; для удалённого
+        товара unit_price и available равны NULL.
+        """
+        item_type = self.model.item_type
+        result = await self.db.execute(
+            select(
+                self.model.id,
+                item_type,
+                self.model.product_id,
+                self.model.listing_id,
+                self.model.author_listing_id,
+                self.model.quantity,
+                case(
+                    (item_type == "product", ProductModel.price),
+                    (item_type == "listing", ListingModel.price),
+                    else_=AuthorListingModel.prise,
+                ).label("unit_price"),
+                case(
+                    (item_type == "product", ProductModel.is_active),
+                    (item_type == "listing", ListingModel.status == "active"),
+                    else_=AuthorListingModel.status == "active",
+                ).label("available"),
+            )
+            .outerjoin(ProductModel, and_(item_type == "product", ProductModel.id == self.model.product_id))
+            .outerjoin(ListingModel, and_(item_type == "listing", ListingModel.id == self.model.listing_id))
+            .outerjoin(
+                AuthorListingModel,
+                and_(item_type == "author_listing", AuthorListingModel.id == self.model.author_listing_id)
+            )
+            .filter(self.model.cart_id == cart_id)
+            .order_by(self.model.id)
+        )
+        return list(result.all())
+    
+    async def get_total(self, cart_id: int) -> float:
+        # SUM(price * quantity) на стороне БД, без выборки позиций
+        result = await self.db.scalar(
+            select(func.coalesce(func.sum(self.model.price * self.model.quantity), 0.0))
+            .filter(self.model.cart_id == cart_id)
+        )
+        return float(result)
+    
+    async def get_by_cart_and_item(self, cart_id: int, item_type: str, item_id: int) -> Optional[CartItemModel]:
         filters = {
             "cart_id": cart_id,
             item_type + "_id": item_id  # Например: product_id=5 или listing_id=3
         }
-        return self.get_one_by(**filters)
\ No newline at end of file
+        return await self.get_one_by(**filters)
+    
+    async def upsert_item(self, cart_id: int, item_type: str, item_id: int, quantity: int, price: float) -> CartItemModel:
+        # Один INSERT ... ON CONFLICT: новая позиция или quantity += quantity у существующей
+        item_column = f"{item_type}_id"
+        stmt = dialect_insert(self.db, self.model).values(
+            cart_id=cart_id,
+            item_type=item_type,
+            quantity=quantity,
+            price=price,
+            **{item_column: item_id}
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cart_id", "item_type", item_column],
+            set_={
+                "quantity": self.model.quantity + stmt.excluded.quantity,
+                "price": stmt.excluded.price,
+            },
+        ).returning(self.model)
+        result = await self.db.scalars(stmt, execution_options={"populate_existing": True})
+        item = result.one()
+        await self._touch("update", [item.id])
+        return item
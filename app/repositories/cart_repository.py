@@ -1,11 +1,11 @@
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.carts import CartModel
 from app.repositories.repository import BaseRepository
 
 class CartRepository(BaseRepository[CartModel]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(CartModel, db)
     
-    def get_by_user(self, user_id: int) -> Optional[CartModel]:
-        return self.get_one_by(user_id=user_id)
\ No newline at end of file
+    async def get_by_user(self, user_id: int) -> Optional[CartModel]:
+        return await self.get_one_by(user_id=user_id)
@@ -0,0 +1,114 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, asc, desc, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.products import ProductModel
+from app.models.listing import ListingModel
+from app.models.author_listing import AuthorListingModel
+from app.repositories.pagination import decode_values, encode_values
+from app.repositories.versions import get_table_version
+from app.exceptions.base_exceptions import BadRequestException
+
+# Сортировки ленты: имя -> (колонка общей проекции, направление, тип значения в курсоре)
+FEED_SORTS = {
+    "recent": ("created_at", "desc", datetime.fromisoformat),
+    "price_asc": ("price", "asc", Decimal),
+    "price_desc": ("price", "desc", Decimal),
+    "popular": ("popularity", "desc", int),
+}
+
+
+def _feed_sources():
+    """Активные позиции трёх таблиц в общей проекции"""
+    return [
+        ("product", ProductModel, ProductModel.is_active == True, {
+            "title": ProductModel.title, "price": ProductModel.price, "image_url": ProductModel.image_url,
+            "created_at": ProductModel.created_at, "popularity": ProductModel.popularity,
+        }),
+        ("listing", ListingModel, ListingModel.status == "active", {
+            "title": ListingModel.title, "price": ListingModel.price, "image_url": ListingModel.image_url,
+            "created_at": ListingModel.create_at, "popularity": literal(0),
+        }),
+        ("author_listing", AuthorListingModel, AuthorListingModel.status == "active", {
+            "title": AuthorListingModel.title, "price": AuthorListingModel.prise,
+            "image_url": AuthorListingModel.image_url, "created_at": AuthorListingModel.created_at,
+            "popularity": literal(0),
+        }),
+    ]
+
+
+class CatalogRepository:
+    """Лента каталога: товары, листинги и авторские листинги одним UNION ALL"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _after(self, item_type: str, model, sort_column, descending: bool, cursor: Tuple[Any, str, int]):
+        # Порядок ленты — (значение сортировки, тип, id); тип в ветке постоянный,
+        # поэтому сравнение по нему решается здесь, а в SQL остаётся условие по (значение, id)
+        value, last_type, last_id = cursor
+        before = (lambda a, b: a < b) if descending else (lambda a, b: a > b)
+        beyond = sort_column < value if descending else sort_column > value
+        if item_type == last_type:
+            return or_(beyond, and_(sort_column == value, before(model.id, last_id)))
+        if before(item_type, last_type):
+            return or_(beyond, sort_column == value)
+        return beyond
+
+    def decode_cursor(self, sort: str, token: str) -> Tuple[Any, str, int]:
+        values = decode_values(token)
+        try:
+            value, item_type, item_id = values
+            return FEED_SORTS[sort][2](value), str(item_type), int(item_id)
+        except (ValueError, TypeError, ArithmeticError):
+            raise BadRequestException(detail="Invalid pagination cursor", error_code="invalid_cursor")
+
+    async def get_feed(
+        self,
+        sort: str = "recent",
+        limit: int = 24,
+        after: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Страница ленты и курсор следующей страницы.
+
+        Каждая ветка UNION ALL сама сортируется и ограничивается limit + 1
+        строками (по индексу status/is_active + created_at для "recent"), так что
+        внешняя сортировка работает не больше чем с 3 * (limit + 1) строками.
+        """
+        key, direction, _ = FEED_SORTS[sort]
+        descending = direction == "desc"
+        order = desc if descending else asc
+        cursor = self.decode_cursor(sort, after) if after else None
+
+        branches = []
+        for item_type, model, is_active, columns in _feed_sources():
+            sort_column = columns[key]
+            query = select(
+                literal(item_type).label("type"),
+                model.id.label("id"),
+                *(column.label(name) for name, column in columns.items()),
+            ).where(is_active)
+            if cursor:
+                query = query.where(self._after(item_type, model, sort_column, descending, cursor))
+            query = query.order_by(order(sort_column), order(model.id)).limit(limit + 1)
+            branches.append(select(query.subquery()))
+
+        feed = union_all(*branches).subquery()
+        result = await self.db.execute(
+            select(feed)
+            .order_by(order(feed.c[key]), order(feed.c.type), order(feed.c.id))
+            .limit(limit + 1)
+        )
+        rows = [dict(row) for row in result.mappings()]
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            return rows, encode_values([last[key], last["type"], last["id"]])
+        return rows, None
+
+    async def table_versions(self) -> List[Tuple[int, Optional[datetime]]]:
+        return [
+            await get_table_version(self.db, model.__tablename__)
+            for _, model, _, _ in _feed_sources()
+        ]
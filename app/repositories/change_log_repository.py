@@ -0,0 +1,20 @@
+from typing import List, Optional
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.change_log import ChangeLogModel
+from app.repositories.repository import BaseRepository
+
+class ChangeLogRepository(BaseRepository[ChangeLogModel]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(ChangeLogModel, db)
+    
+    async def get_since(self, since: int, limit: int, table_name: Optional[str] = None) -> List[ChangeLogModel]:
+        """Записи журнала с id > since в порядке id"""
+        query = select(self.model).filter(self.model.id > since)
+        if table_name:
+            query = query.filter(self.model.table_name == table_name)
+        result = await self.db.execute(query.order_by(self.model.id).limit(limit))
+        return list(result.scalars().all())
+    
+    async def get_last_id(self) -> int:
+        return await self.db.scalar(select(func.max(self.model.id))) or 0
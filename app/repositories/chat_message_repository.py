@@ -1,22 +1,27 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.chat_massage import ChatMessageModel
 from app.repositories.repository import BaseRepository
 
 class ChatMessageRepository(BaseRepository[ChatMessageModel]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(ChatMessageModel, db)
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
-        return self.db.query(self.model)\
-            .filter(self.model.user_id == user_id)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
+    async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.user_id == user_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
     
-    def get_conversation(self, user_id: int, skip: int = 0, limit: int = 100):
-        return self.db.query(self.model)\
-            .filter(self.model.user_id == user_id)\
-            .order_by(self.model.sent_at)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
\ No newline at end of file
+    async def get_conversation(self, user_id: int, skip: int = 0, limit: int = 100):
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.user_id == user_id)
+            .order_by(self.model.sent_at)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
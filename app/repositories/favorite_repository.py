@@ -1,26 +1,28 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.favorite import FavoriteModel
 from app.repositories.base_repository import BaseRepository
+from app.repositories.upsert import dialect_insert
 
 class FavoriteRepository(BaseRepository[FavoriteModel]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(db, FavoriteModel)
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[FavoriteModel]:
+    async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100) -> List[FavoriteModel]:
         """Получить все избранное пользователя"""
-        return (
-            self.db.query(FavoriteModel)
+        result = await self.db.execute(
+            select(FavoriteModel)
             .filter(FavoriteModel.user_id == user_id)
             .order_by(FavoriteModel.added_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
         )
+        return list(result.scalars().all())
     
-    def get_one_by(self, user_id: int, **filters) -> Optional[FavoriteModel]:
+    async def get_one_by(self, user_id: int, **filters) -> Optional[FavoriteModel]:
         """Найти одну запись избранного по фильтрам"""
-        query = self.db.query(FavoriteModel).filter(FavoriteModel.user_id == user_id)
+        query = select(FavoriteModel).filter(FavoriteModel.user_id == user_id)
         
         if filters.get("products_id"):
             query = query.filter(FavoriteModel.products_id == filters["products_id"])
@@ -29,9 +31,26 @@ class FavoriteRepository(BaseRepository[FavoriteModel]):
         if filters.get("author_listing_id"):
             query = query.filter(FavoriteModel.author_listing_id == filters["author_listing_id"])
         
-        return query.first()
+        result = await self.db.execute(query.limit(1))
+        return result.scalars().first()
     
-    def get_by_user_and_item(self, user_id: int, item_type: str, item_id: int) -> Optional[FavoriteModel]:
+    async def add_if_absent(self, values: Dict[str, Any]) -> Optional[FavoriteModel]:
+        """Добавить в избранное одним INSERT ... ON CONFLICT DO NOTHING.
+
+        Возвращает None, если товар уже в избранном у пользователя.
+        """
+        result = await self.db.scalars(
+            dialect_insert(self.db, FavoriteModel)
+            .values(**values)
+            .on_conflict_do_nothing()
+            .returning(FavoriteModel)
+        )
+        favorite = result.first()
+        if favorite is not None:
+            await self._touch("insert", [favorite.id])
+        return favorite
+    
+    async def get_by_user_and_item(self, user_id: int, item_type: str, item_id: int) -> Optional[FavoriteModel]:
         """Получить избранное пользователя для конкретного товара"""
         filters = {}
         if item_type == "product":
@@ -41,12 +60,13 @@ class FavoriteRepository(BaseRepository[FavoriteModel]):
         elif item_type == "author_listing":
             filters["author_listing_id"] = item_id
         
-        return self.get_one_by(user_id, **filters)
+        return await self.get_one_by(user_id, **filters)
     
-    def user_has_favorites(self, user_id: int) -> bool:
+    async def user_has_favorites(self, user_id: int) -> bool:
         """Проверить, есть ли у пользователя избранное"""
-        return (
-            self.db.query(FavoriteModel)
+        result = await self.db.execute(
+            select(FavoriteModel.id)
             .filter(FavoriteModel.user_id == user_id)
-            .first() is not None
-        )
\ No newline at end of file
+            .limit(1)
+        )
+        return result.first() is not None
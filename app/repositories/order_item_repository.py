@@ -1,14 +1,42 @@
-from sqlalchemy.orm import Session
+from decimal import Decimal
+from typing import List
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.models.order_items import OrderItemModel
 from app.repositories.repository import BaseRepository
 
 class OrderItemRepository(BaseRepository[OrderItemModel]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(OrderItemModel, db)
     
-    def get_by_order(self, order_id: int, skip: int = 0, limit: int = 100):
-        return self.db.query(self.model)\
-            .filter(self.model.order_id == order_id)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
\ No newline at end of file
+    async def get_by_order(self, order_id: int, skip: int = 0, limit: int = 100):
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.order_id == order_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+    
+    async def get_total(self, order_id: int) -> Decimal:
+        # SUM(unit_price * quantity) на стороне БД, без выборки позиций
+        result = await self.db.scalar(
+            select(func.coalesce(func.sum(self.model.unit_price * self.model.quantity), 0))
+            .filter(self.model.order_id == order_id)
+        )
+        return Decimal(result)
+    
+    async def get_by_orders_with_catalog(self, order_ids: List[int]) -> List[OrderItemModel]:
+        # Позиции всех заказов одним IN-запросом, товары — одним IN-запросом на таблицу каталога
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.order_id.in_(order_ids))
+            .options(
+                selectinload(self.model.product),
+                selectinload(self.model.listing),
+                selectinload(self.model.author_listing),
+            )
+            .order_by(self.model.order_id, self.model.id)
+        )
+        return list(result.scalars().all())
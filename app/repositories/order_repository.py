@@ -1,21 +1,72 @@
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.orders import OrderModel
+from app.models.order_status import OrderStatus
 from app.repositories.repository import BaseRepository
 
 class OrderRepository(BaseRepository[OrderModel]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(OrderModel, db)
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
-        return self.db.query(self.model)\
-            .filter(self.model.user_id == user_id)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
+    async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100, status: Optional[OrderStatus] = None):
+        query = select(self.model).filter(self.model.user_id == user_id)
+        if status:
+            query = query.filter(self.model.status == status)
+        result = await self.db.execute(
+            query
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
     
-    def get_by_status(self, status: str, skip: int = 0, limit: int = 100):
-        return self.db.query(self.model)\
-            .filter(self.model.status == status)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
\ No newline at end of file
+    async def get_by_status(self, status: OrderStatus, skip: int = 0, limit: int = 100):
+        # Порядок индекса (status, creat_at): старые заказы первыми
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.status == status)
+            .order_by(self.model.creat_at, self.model.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+    
+    async def set_status(self, order_id: int, current: OrderStatus, target: OrderStatus) -> Optional[OrderModel]:
+        """UPDATE только если статус всё ещё current; None, если заказ успели изменить"""
+        stmt = (
+            update(self.model)
+            .where(self.model.id == order_id, self.model.status == current)
+            .values(status=target)
+            .returning(self.model)
+        )
+        result = await self.db.scalars(stmt, execution_options={"populate_existing": True})
+        order = result.one_or_none()
+        if order:
+            await self._touch("update", [order.id])
+        return order
+    
+    async def claim(self, status: OrderStatus, target: OrderStatus, limit: int) -> List[OrderModel]:
+        """Забрать из очереди status до limit самых старых заказов, переведя их в target.
+
+        Один UPDATE ... RETURNING: два воркера не получат один и тот же заказ.
+        В PostgreSQL подзапрос пропускает строки, уже заблокированные другим
+        воркером (SKIP LOCKED), в SQLite запись и так идёт по одной.
+        """
+        oldest = (
+            select(self.model.id)
+            .filter(self.model.status == status)
+            .order_by(self.model.creat_at, self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(oldest), self.model.status == status)
+            .values(status=target)
+            .returning(self.model)
+        )
+        result = await self.db.scalars(stmt, execution_options={"populate_existing": True})
+        orders = sorted(result.all(), key=lambda order: (order.creat_at, order.id))
+        if orders:
+            await self._touch("update", [order.id for order in orders])
+        return orders
@@ -0,0 +1,69 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import DateTime, Integer, case, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.order_stats import OrderStatsModel
+from app.models.orders import OrderModel
+from app.models.order_status import OrderStatus
+from app.repositories.repository import BaseRepository
+from app.repositories.upsert import dialect_insert
+
+
+class OrderStatsRepository(BaseRepository[OrderStatsModel]):
+    def __init__(self, db: AsyncSession):
+        super().__init__(OrderStatsModel, db)
+
+    async def get_by_user(self, user_id: int) -> Optional[OrderStatsModel]:
+        return await self.get(user_id)
+
+    async def add_order(self, user_id: int, amount: Decimal, ordered_at: datetime) -> None:
+        """Учесть новый заказ одним upsert, история заказов не читается"""
+        now = datetime.utcnow()
+        stmt = dialect_insert(self.db, self.model).values(
+            user_id=user_id, order_count=1, total_spent=amount, last_order_at=ordered_at, updated_at=now
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    "order_count": self.model.order_count + 1,
+                    "total_spent": self.model.total_spent + stmt.excluded.total_spent,
+                    "last_order_at": case(
+                        (self.model.last_order_at > stmt.excluded.last_order_at, self.model.last_order_at),
+                        else_=stmt.excluded.last_order_at,
+                    ),
+                    "updated_at": now,
+                }
+            )
+        )
+        await self._touch("update", [user_id])
+
+    async def refresh(self, user_id: int) -> None:
+        """Пересчитать сводку по заказам пользователя (после изменения суммы, отмены или удаления заказа).
+
+        INSERT ... SELECT по индексу (user_id, creat_at), одним оператором; отменённые заказы не входят.
+        """
+        now = datetime.utcnow()
+        totals = select(
+            literal(user_id, Integer),
+            func.count(OrderModel.id),
+            func.coalesce(func.sum(OrderModel.total_amount), 0),
+            func.max(OrderModel.creat_at),
+            literal(now, DateTime),
+        ).where(OrderModel.user_id == user_id, OrderModel.status != OrderStatus.CANCELLED)
+        stmt = dialect_insert(self.db, self.model).from_select(
+            ["user_id", "order_count", "total_spent", "last_order_at", "updated_at"], totals
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    "order_count": stmt.excluded.order_count,
+                    "total_spent": stmt.excluded.total_spent,
+                    "last_order_at": stmt.excluded.last_order_at,
+                    "updated_at": now,
+                }
+            )
+        )
+        await self._touch("update", [user_id])
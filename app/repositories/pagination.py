@@ -0,0 +1,92 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, asc, desc
+from sqlalchemy.sql import Select
+
+from app.exceptions.base_exceptions import BadRequestException
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _load_value(column, raw: Any) -> Any:
+    if raw is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    return python_type(raw)
+
+
+def encode_values(values: List[Any]) -> str:
+    """Непрозрачный курсор из списка значений ключа сортировки"""
+    payload = json.dumps([_dump_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_values(token: str) -> List[Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, binascii.Error):
+        values = None
+    if not isinstance(values, list):
+        raise BadRequestException(detail="Invalid pagination cursor", error_code="invalid_cursor")
+    return values
+
+
+def encode_cursor(obj: Any, order_by: str = "id") -> str:
+    """Непрозрачный курсор: значение ключа сортировки + id последней записи"""
+    return encode_values([getattr(obj, order_by), obj.id])
+
+
+def decode_cursor(model, order_by: str, token: str) -> Tuple[Any, int]:
+    try:
+        value, last_id = decode_values(token)
+        return _load_value(getattr(model, order_by), value), int(last_id)
+    except (ValueError, TypeError):
+        raise BadRequestException(detail="Invalid pagination cursor", error_code="invalid_cursor")
+
+
+def apply_keyset(
+    query: Select,
+    model,
+    order_by: str = "id",
+    order_direction: str = "asc",
+    after: Optional[str] = None
+) -> Select:
+    """Сортировка по (order_by, id) и условие «после курсора» вместо OFFSET"""
+    column = getattr(model, order_by)
+    descending = order_direction.lower() == "desc"
+    direction = desc if descending else asc
+
+    if after:
+        value, last_id = decode_cursor(model, order_by, after)
+        if order_by == "id":
+            query = query.filter(model.id < last_id if descending else model.id > last_id)
+        elif descending:
+            query = query.filter(or_(column < value, and_(column == value, model.id < last_id)))
+        else:
+            query = query.filter(or_(column > value, and_(column == value, model.id > last_id)))
+
+    if order_by == "id":
+        return query.order_by(direction(model.id))
+    return query.order_by(direction(column), direction(model.id))
+
+
+def split_page(rows: List[Any], limit: int, order_by: str = "id") -> Tuple[List[Any], Optional[str]]:
+    """Запрос выбирает limit + 1 строк: лишняя строка означает, что есть следующая страница"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1], order_by)
+    return rows, None
@@ -1,14 +1,19 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.products import ProductModel
 from app.repositories.repository import BaseRepository
 
 class ProductRepository(BaseRepository[ProductModel]):
-    def __init__(self, db: Session):
+    track_changes = True
+
+    def __init__(self, db: AsyncSession):
         super().__init__(ProductModel, db)
     
-    def get_by_category(self, category: str, skip: int = 0, limit: int = 100):
-        return self.db.query(self.model)\
-            .filter(self.model.category == category)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
\ No newline at end of file
+    async def get_by_category(self, category: str, skip: int = 0, limit: int = 100):
+        result = await self.db.execute(
+            select(self.model)
+            .filter(self.model.category == category)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
@@ -1,68 +1,232 @@
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
+from datetime import datetime
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Tuple, Union
+from sqlalchemy import select, insert, update, delete, func, asc, desc, case
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import Base
+from app.repositories.pagination import apply_keyset, split_page
+from app.repositories.versions import bump_table_version, get_table_version, record_changes
 
 ModelType = TypeVar("ModelType", bound=Base) # type: ignore
 
 class BaseRepository(Generic[ModelType]):
-    def __init__(self, model: Type[ModelType], db: Session):
+    # Писать ли изменения строк в change_log (для /changes); включается в репозиториях каталога
+    track_changes: bool = False
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
         self.model = model
         self.db = db
 
-    def get(self, id: int) -> Optional[ModelType]:
-        return self.db.query(self.model).filter(self.model.id == id).first()
+    async def get(self, id: int) -> Optional[ModelType]:
+        return await self.db.get(self.model, id)
 
-    def get_all(
-        self, 
-        skip: int = 0, 
-        limit: int = 100,
-        order_by: Optional[str] = None,
-        order_direction: str = "asc"
-    ) -> List[ModelType]:
-        query = self.db.query(self.model)
-        
+    def _apply_order(self, query, order_by: Optional[str], order_direction: str = "asc"):
         if order_by:
             column = getattr(self.model, order_by, None)
-            if column:
+            if column is not None:
                 if order_direction.lower() == "desc":
                     query = query.order_by(desc(column))
                 else:
                     query = query.order_by(asc(column))
-        
-        return query.offset(skip).limit(limit).all()
+        return query
 
-    def create(self, obj_in: Dict[str, Any]) -> ModelType:
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: Optional[str] = None,
+        order_direction: str = "asc"
+    ) -> List[ModelType]:
+        query = self._apply_order(select(self.model), order_by, order_direction)
+
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc",
+        **filters
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Keyset-пагинация: страница записей и курсор следующей страницы"""
+        query = apply_keyset(
+            select(self.model).filter_by(**filters), self.model, order_by, order_direction, after
+        )
+        result = await self.db.execute(query.limit(limit + 1))
+        return split_page(list(result.scalars().all()), limit, order_by)
+
+    async def create(self, obj_in: Dict[str, Any]) -> ModelType:
         db_obj = self.model(**obj_in)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        await self.db.flush()
+        await self._touch("insert", [db_obj.id])
         return db_obj
 
-    def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
-        db_obj = self.get(id)
+    async def create_many(self, objs_in: List[Dict[str, Any]]) -> int:
+        """Один INSERT на все строки, объекты в сессию не загружаются"""
+        if not objs_in:
+            return 0
+        stmt = insert(self.model)
+        if self.track_changes:
+            row_ids = list((await self.db.scalars(stmt.returning(self.model.id), objs_in)).all())
+        else:
+            row_ids = []
+            await self.db.execute(stmt, objs_in)
+        await self._touch("insert", row_ids)
+        return len(objs_in)
+
+    async def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        db_obj = await self.get(id)
         if not db_obj:
             return None
-            
+
         for field, value in obj_in.items():
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
-        
-        self.db.commit()
-        self.db.refresh(db_obj)
+
+        await self.db.flush()
+        await self._touch("update", [id])
         return db_obj
 
-    def delete(self, id: int) -> bool:
-        db_obj = self.get(id)
+    async def delete(self, id: int) -> bool:
+        db_obj = await self.get(id)
         if not db_obj:
             return False
-        
-        self.db.delete(db_obj)
-        self.db.commit()
+
+        await self.db.delete(db_obj)
+        await self.db.flush()
+        await self._touch("delete", [id])
         return True
 
-    def filter_by(self, **filters) -> List[ModelType]:
-        return self.db.query(self.model).filter_by(**filters).all()
+    async def _touch(self, operation: str, row_ids: List[Any]) -> None:
+        # Счётчик изменений таблицы: по нему строятся ETag списков
+        await bump_table_version(self.db, self.model.__tablename__)
+        if self.track_changes:
+            await record_changes(self.db, self.model.__tablename__, operation, row_ids)
+
+    async def _execute_where(self, stmt, operation: str) -> int:
+        """Массовый UPDATE/DELETE; для журнала изменений id строк забираются через RETURNING"""
+        if self.track_changes:
+            row_ids = list((await self.db.execute(stmt.returning(self.model.id))).scalars())
+            count = len(row_ids)
+        else:
+            row_ids = []
+            count = (await self.db.execute(stmt)).rowcount
+        if count:
+            await self._touch(operation, row_ids)
+        return count
+
+    async def table_version(self) -> Tuple[int, Optional[datetime]]:
+        return await get_table_version(self.db, self.model.__tablename__)
+
+    def _where(self, filters: Dict[str, Any]) -> list:
+        if not filters:
+            raise ValueError(f"{self.model.__name__}: set-based operation requires at least one filter")
+
+        conditions = []
+        for attr, value in filters.items():
+            column = getattr(self.model, attr)
+            if isinstance(value, (list, tuple, set)):
+                conditions.append(column.in_(value))
+            else:
+                conditions.append(column == value)
+        return conditions
+
+    async def delete_where(self, **filters) -> int:
+        """Один DELETE ... WHERE, возвращает количество удалённых строк"""
+        return await self._execute_where(delete(self.model).where(*self._where(filters)), "delete")
+
+    async def update_where(self, filters: Dict[str, Any], values: Dict[str, Any]) -> int:
+        """Один UPDATE ... WHERE, возвращает количество изменённых строк"""
+        return await self._execute_where(
+            update(self.model).where(*self._where(filters)).values(**values), "update"
+        )
+
+    async def filter_by(
+        self,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        order_by: Optional[str] = None,
+        order_direction: str = "asc",
+        with_total: bool = False,
+        **filters
+    ) -> Union[List[ModelType], Tuple[List[ModelType], int]]:
+        """Записи по фильтрам равенства.
+
+        skip/limit/order_by применяются в SQL, без limit выбираются все строки.
+        С with_total=True возвращается кортеж (записи, общее количество по фильтрам).
+        """
+        query = self._apply_order(select(self.model).filter_by(**filters), order_by, order_direction)
+        if skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await self.db.execute(query)
+        items = list(result.scalars().all())
+
+        if with_total:
+            total = await self.db.scalar(
+                select(func.count()).select_from(self.model).filter_by(**filters)
+            )
+            return items, total
+        return items
+
+    async def get_one_by(self, **filters) -> Optional[ModelType]:
+        result = await self.db.execute(select(self.model).filter_by(**filters).limit(1))
+        return result.scalars().first()
+
+    def facet_conditions(
+        self,
+        filters: Dict[str, Any],
+        ranges: Optional[Dict[str, Tuple[Any, Any]]] = None
+    ) -> list:
+        """Условия фасетного поиска: None и пустые списки пропускаются, список -> IN, диапазон [от, до)"""
+        conditions = []
+        for attr, value in filters.items():
+            if value is None or (isinstance(value, (list, tuple, set)) and not value):
+                continue
+            column = getattr(self.model, attr)
+            if isinstance(value, (list, tuple, set)):
+                conditions.append(column.in_(value))
+            else:
+                conditions.append(column == value)
+        for attr, (low, high) in (ranges or {}).items():
+            column = getattr(self.model, attr)
+            if low is not None:
+                conditions.append(column >= low)
+            if high is not None:
+                conditions.append(column < high)
+        return conditions
+
+    async def find(
+        self,
+        conditions: list,
+        skip: int = 0,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc"
+    ) -> Tuple[List[ModelType], int]:
+        """Страница записей по условиям и их общее количество"""
+        query = self._apply_order(select(self.model).where(*conditions), order_by, order_direction)
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        total = await self.db.scalar(select(func.count()).select_from(self.model).where(*conditions))
+        return list(result.scalars().all()), total
+
+    async def count_by(self, attr: str, conditions: list) -> List[Tuple[Any, int]]:
+        """GROUP BY по колонке: (значение, количество), самые частые первыми"""
+        column = getattr(self.model, attr)
+        count = func.count().label("count")
+        result = await self.db.execute(
+            select(column, count).where(*conditions).group_by(column).order_by(count.desc(), column)
+        )
+        return [(value, total) for value, total in result.all()]
 
-    def get_one_by(self, **filters) -> Optional[ModelType]:
-        return self.db.query(self.model).filter_by(**filters).first()
\ No newline at end of file
+    async def count_by_ranges(self, attr: str, edges: List[Any], conditions: list) -> List[int]:
+        """Количество записей в диапазонах колонки: (-inf, e0), [e0, e1), ..., [en, +inf)"""
+        column = getattr(self.model, attr)
+        bucket = case(*[(column < edge, i) for i, edge in enumerate(edges)], else_=len(edges))
+        result = await self.db.execute(select(bucket, func.count()).where(*conditions).group_by(bucket))
+        counts = dict(result.all())
+        return [counts.get(i, 0) for i in range(len(edges) + 1)]
@@ -1,11 +1,11 @@
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.roles import RoleModel
 from app.repositories.repository import BaseRepository
 
 class RoleRepository(BaseRepository[RoleModel]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(RoleModel, db)
     
-    def get_by_name(self, name: str) -> Optional[RoleModel]:
-        return self.get_one_by(name=name)
\ No newline at end of file
+    async def get_by_name(self, name: str) -> Optional[RoleModel]:
+        return await self.get_one_by(name=name)
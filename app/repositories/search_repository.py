@@ -0,0 +1,82 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.search_index import SEARCH_TABLE
+from app.models.products import ProductModel
+from app.models.listing import ListingModel
+from app.models.author_listing import AuthorListingModel
+
+# Строка индекса соединяется со своей таблицей; неактивные товары и листинги не выдаются
+_FROM = f"""
+    FROM {SEARCH_TABLE} s
+    LEFT JOIN products p ON s.item_type = 'product' AND p.id = s.item_id
+    LEFT JOIN listing l ON s.item_type = 'listing' AND l.id = s.item_id
+    LEFT JOIN author_listing a ON s.item_type = 'author_listing' AND a.id = s.item_id
+    WHERE {SEARCH_TABLE} MATCH :match
+      AND (p.is_active = 1 OR l.status = 'active' OR a.status = 'active')
+      AND (:item_type IS NULL OR s.item_type = :item_type)
+"""
+
+# Источники подсказок: тип -> (модель, колонка темы, условие активности)
+SUGGEST_SOURCES = {
+    "product": (ProductModel, ProductModel.category, ProductModel.is_active == True),
+    "listing": (ListingModel, ListingModel.game_topic, ListingModel.status == "active"),
+    "author_listing": (AuthorListingModel, AuthorListingModel.topics_games, AuthorListingModel.status == "active"),
+}
+
+# Веса bm25 по колонкам индекса: item_type, item_id, title, description, topic
+_RANK = f"bm25({SEARCH_TABLE}, 0.0, 0.0, 10.0, 2.0, 5.0)"
+
+
+class SearchRepository:
+    """Запросы к FTS5-индексу каталога (app/database/search_index.py)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @property
+    def is_supported(self) -> bool:
+        return self.db.get_bind().dialect.name == "sqlite"
+
+    async def search(
+        self,
+        match: str,
+        item_type: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Найденные позиции по релевантности (меньше rank — выше)"""
+        result = await self.db.execute(
+            text(f"""
+                SELECT s.item_type AS type, s.item_id AS id,
+                       COALESCE(p.title, l.title, a.title) AS title,
+                       COALESCE(p.price, l.price, a.prise) AS price,
+                       COALESCE(p.image_url, l.image_url, a.image_url) AS image_url,
+                       COALESCE(p.category, l.game_topic, a.topics_games) AS topic,
+                       snippet({SEARCH_TABLE}, -1, '<b>', '</b>', '…', 12) AS snippet,
+                       {_RANK} AS rank
+                {_FROM}
+                ORDER BY rank, s.rowid
+                LIMIT :limit OFFSET :skip
+            """),
+            {"match": match, "item_type": item_type, "limit": limit, "skip": skip}
+        )
+        return [dict(row) for row in result.mappings()]
+
+    async def count(self, match: str, item_type: Optional[str] = None) -> int:
+        return await self.db.scalar(
+            text(f"SELECT COUNT(*) {_FROM}"), {"match": match, "item_type": item_type}
+        )
+
+    async def get_suggest_items(
+        self,
+        item_type: str,
+        ids: Optional[Iterable[int]] = None
+    ) -> List[Tuple[str, int, str, Optional[str]]]:
+        """Активные позиции типа для индекса подсказок: (тип, id, название, тема)"""
+        model, topic, is_active = SUGGEST_SOURCES[item_type]
+        query = select(model.id, model.title, topic).filter(is_active)
+        if ids is not None:
+            query = query.filter(model.id.in_(list(ids)))
+        result = await self.db.execute(query)
+        return [(item_type, row[0], row[1], row[2]) for row in result.all()]
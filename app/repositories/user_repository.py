@@ -1,12 +1,36 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.models.author_listing import AuthorListingModel
+from app.models.chat_massage import ChatMessageModel
+from app.models.listing import ListingModel
+from app.models.orders import OrderModel
+from app.models.review import ReviewModel
 from app.models.users import UserModel
 from app.repositories.repository import BaseRepository
 from app.schemas.user_schema import UserCreate
 
 class UserRepository(BaseRepository[UserModel]):
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(UserModel, db)
     
-    def get_by_email(self, email: str) -> Optional[UserModel]:
-        return self.get_one_by(email=email)
\ No newline at end of file
+    async def get_by_email(self, email: str) -> Optional[UserModel]:
+        return await self.get_one_by(email=email)
+    
+    async def get_by_email_with_role(self, email: str) -> Optional[UserModel]:
+        result = await self.db.execute(
+            select(UserModel).options(selectinload(UserModel.role)).filter_by(email=email).limit(1)
+        )
+        return result.scalars().first()
+    
+    async def get_owned_tables(self, user_id: int) -> List[str]:
+        """Таблицы, где у пользователя есть заказы, публикации, отзывы или сообщения; один SELECT из EXISTS"""
+        owned_models = (OrderModel, ListingModel, AuthorListingModel, ReviewModel, ChatMessageModel)
+        row = (await self.db.execute(
+            select(*[
+                exists().where(model.user_id == user_id).label(model.__tablename__)
+                for model in owned_models
+            ])
+        )).one()
+        return [model.__tablename__ for model, found in zip(owned_models, row) if found]
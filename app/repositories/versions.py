@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any, Iterable, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.change_log import ChangeLogModel
+from app.models.table_version import TableVersionModel
+from app.repositories.upsert import dialect_insert
+
+
+async def bump_table_version(db: AsyncSession, table_name: str) -> None:
+    """version + 1 в той же транзакции, что и сама запись"""
+    now = datetime.utcnow()
+    stmt = dialect_insert(db, TableVersionModel).values(table_name=table_name, version=1, updated_at=now)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["table_name"],
+            set_={"version": TableVersionModel.version + 1, "updated_at": now}
+        )
+    )
+
+
+async def get_table_version(db: AsyncSession, table_name: str) -> Tuple[int, Optional[datetime]]:
+    """(версия, время последнего изменения); (0, None) для ещё не менявшейся таблицы"""
+    row = (await db.execute(
+        select(TableVersionModel.version, TableVersionModel.updated_at)
+        .filter(TableVersionModel.table_name == table_name)
+    )).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+async def record_changes(db: AsyncSession, table_name: str, operation: str, row_ids: Iterable[Any]) -> None:
+    """Записать изменённые строки в change_log одним INSERT"""
+    now = datetime.utcnow()
+    rows = [
+        {"table_name": table_name, "row_id": row_id, "operation": operation, "changed_at": now}
+        for row_id in row_ids
+    ]
+    if rows:
+        await db.execute(insert(ChangeLogModel), rows)
@@ -1,53 +1,48 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.database.database import get_db
 from app.models.products import ProductModel
 from app.models.orders import OrderModel
 from app.models.users import UserModel
+from app.models.roles import RoleModel
 from app.schemas.product_schema import Product, ProductCreate, ProductUpdate
 from app.schemas.order_schema import OrderResponse
 from app.repositories.product_repository import ProductRepository
 from app.services.product_service import ProductService
+from app.services.user_service import UserService
+from app.router.user_router import get_user_service
+from app.schemas.user_schema import TokenPayload
+from app.utils.security import ADMIN_ROLE_NAME
+from app.dependencies import require_admin
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-def get_product_service(db: Session = Depends(get_db)) -> ProductService:
+def get_product_service(db: AsyncSession = Depends(get_db)) -> ProductService:
     product_repository = ProductRepository(db)
     return ProductService(product_repository)
 
 
-def check_admin(user_id: int = Query(...), db: Session = Depends(get_db)):
-    """Проверить что пользователь админ"""
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    if user.role_id != 2:  # role_id 2 = admin
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    return user
-
-
 # ===== ПОЛУЧЕНИЕ ОБЩЕЙ ИНФОРМАЦИИ =====
 
 @router.get("/dashboard")
 async def admin_dashboard(
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db)
+    user_id: Optional[int] = Query(None),
+    admin_user: TokenPayload = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Получить генеральную информацию для дашборда админа.
     """
-    products_count = db.query(ProductModel).count()
-    users_count = db.query(UserModel).count()
-    admin_count = db.query(UserModel).filter(UserModel.role_id == 2).count()
+    products_count = await db.scalar(select(func.count()).select_from(ProductModel))
+    users_count = await db.scalar(select(func.count()).select_from(UserModel))
+    admin_count = await db.scalar(
+        select(func.count()).select_from(UserModel).join(UserModel.role)
+        .filter(func.lower(RoleModel.name) == ADMIN_ROLE_NAME)
+    )
     
     return {
         "total_products": products_count,
@@ -61,42 +56,42 @@ async def admin_dashboard(
 @router.post("/products", response_model=Product)
 async def admin_create_product(
     product_data: ProductCreate,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db),
+    user_id: Optional[int] = Query(None),
+    admin_user: TokenPayload = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
     product_service: ProductService = Depends(get_product_service)
 ):
     """
     Создать новый товар (только для админа).
     """
-    return product_service.create(product_data.dict())
+    return await product_service.create(product_data.dict())
 
 
 @router.get("/products", response_model=List[Product])
 async def admin_get_products(
-    user_id: int = Query(...),
+    user_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    admin_user: UserModel = Depends(check_admin),
+    admin_user: TokenPayload = Depends(require_admin),
     product_service: ProductService = Depends(get_product_service)
 ):
     """
     Получить все товары (только для админа).
     """
-    return product_service.get_all(skip, limit)
+    return await product_service.get_all(skip, limit)
 
 
 @router.get("/products/{product_id}", response_model=Product)
 async def admin_get_product(
     product_id: int,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
+    user_id: Optional[int] = Query(None),
+    admin_user: TokenPayload = Depends(require_admin),
     product_service: ProductService = Depends(get_product_service)
 ):
     """
     Получить детали товара (только для админа).
     """
-    product = product_service.get(product_id)
+    product = await product_service.get(product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -109,34 +104,34 @@ async def admin_get_product(
 async def admin_update_product(
     product_id: int,
     product_data: ProductUpdate,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
+    user_id: Optional[int] = Query(None),
+    admin_user: TokenPayload = Depends(require_admin),
     product_service: ProductService = Depends(get_product_service)
 ):
     """
     Обновить товар (только для админа).
     """
-    product = product_service.get(product_id)
+    product = await product_service.get(product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
     
-    return product_service.update(product_id, product_data.dict(exclude_unset=True))
+    return await product_service.update(product_id, product_data.dict(exclude_unset=True))
 
 
 @router.delete("/products/{product_id}")
 async def admin_delete_product(
     product_id: int,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
+    user_id: Optional[int] = Query(None),
+    admin_user: TokenPayload = Depends(require_admin),
     product_service: ProductService = Depends(get_product_service)
 ):
     """
     Удалить товар (только для админа).
     """
-    success = product_service.delete(product_id)
+    success = await product_service.delete(product_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -145,20 +140,41 @@ async def admin_delete_product(
     return {"message": "Product deleted successfully"}
 
 
+@router.patch("/products/status")
+async def admin_set_products_status(
+    is_active: bool,
+    product_ids: List[int] = Query(...),
+    user_id: Optional[int] = Query(None),
+    admin_user: TokenPayload = Depends(require_admin),
+    product_service: ProductService = Depends(get_product_service)
+):
+    """
+    Массово активировать/деактивировать товары одним UPDATE (только для админа).
+    """
+    updated = await product_service.set_active(product_ids, is_active)
+    return {"updated": updated, "is_active": is_active}
+
+
 # ===== УПРАВЛЕНИЕ ПОЛЬЗОВАТЕЛЯМИ =====
 
 @router.get("/users", response_model=List[dict])
 async def admin_get_users(
-    user_id: int = Query(...),
+    user_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db)
+    admin_user: TokenPayload = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Получить всех пользователей (только для админа).
     """
-    users = db.query(UserModel).offset(skip).limit(limit).all()
+    result = await db.execute(
+        select(UserModel)
+        .options(selectinload(UserModel.role))
+        .offset(skip)
+        .limit(limit)
+    )
+    users = result.scalars().all()
     
     return [
         {
@@ -175,14 +191,14 @@ async def admin_get_users(
 @router.get("/users/{user_id_param}", response_model=dict)
 async def admin_get_user(
     user_id_param: int,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db)
+    user_id: Optional[int] = Query(None),
+    admin_user: TokenPayload = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Получить детали пользователя (только для админа).
     """
-    user = db.query(UserModel).filter(UserModel.id == user_id_param).first()
+    user = await db.get(UserModel, user_id_param, options=[selectinload(UserModel.role)])
     
     if not user:
         raise HTTPException(
@@ -202,22 +218,15 @@ async def admin_get_user(
 @router.delete("/users/{user_id_param}")
 async def admin_delete_user(
     user_id_param: int,
-    user_id: int = Query(...),
-    admin_user: UserModel = Depends(check_admin),
-    db: Session = Depends(get_db)
+    user_id: Optional[int] = Query(None),
+    admin_user: TokenPayload = Depends(require_admin),
+    user_service: UserService = Depends(get_user_service)
 ):
     """
     Удалить пользователя (только для админа).
     """
-    user = db.query(UserModel).filter(UserModel.id == user_id_param).first()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    db.delete(user)
-    db.commit()
+    # Корзина и избранное удаляются вместе с пользователем; при заказах и публикациях — 409
+    user = await user_service.get(user_id_param)
+    await user_service.delete(user_id_param)
     
     return {"message": f"User {user.name} deleted successfully"}
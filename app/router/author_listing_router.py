@@ -1,70 +1,127 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from decimal import Decimal
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
-from app.schemas import AuthorListing, AuthorListingCreate, AuthorListingUpdate
+from app.schemas import AuthorListing, AuthorListingCreate, AuthorListingUpdate, FacetPage
 from app.services.author_listing_service import AuthorListingService
 from app.repositories.author_listing_repository import AuthorListingRepository
+from app.utils.pagination import set_next_cursor, set_total_count
+from app.utils.http_cache import check_not_modified
 
 router = APIRouter(prefix="/author-listings", tags=["author-listings"])
 
-def get_author_listing_service(db: Session = Depends(get_db)) -> AuthorListingService:
+def get_author_listing_service(db: AsyncSession = Depends(get_db)) -> AuthorListingService:
     author_listing_repository = AuthorListingRepository(db)
     return AuthorListingService(author_listing_repository)
 
 @router.get("/", response_model=List[AuthorListing])
-def get_author_listings(
+async def get_author_listings(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     user_id: int = None,
     topic: str = None,
     active_only: bool = True,
+    include_total: bool = False,
+    cursor: bool = False,
+    after: Optional[str] = None,
     author_listing_service: AuthorListingService = Depends(get_author_listing_service)
 ):
+    cached = await check_not_modified(request, response, author_listing_service)
+    if cached:
+        return cached
+
+    if cursor or after:
+        if user_id:
+            filters = {"user_id": user_id}
+        elif topic:
+            filters = {"topics_games": topic}
+        else:
+            filters = {"status": "active"} if active_only else {}
+        listings, next_cursor = await author_listing_service.get_page(after, limit, **filters)
+        set_next_cursor(response, next_cursor)
+        return listings
+    
     if user_id:
-        return author_listing_service.get_by_user(user_id, skip, limit)
+        return await author_listing_service.get_by_user(user_id, skip, limit)
     elif topic:
-        return author_listing_service.get_by_topic(topic, skip, limit)
+        return await author_listing_service.get_by_topic(topic, skip, limit)
     elif active_only:
-        return author_listing_service.get_active_listings(skip, limit)
+        if include_total:
+            listings, total = await author_listing_service.get_active_listings(skip, limit, with_total=True)
+            set_total_count(response, total)
+            return listings
+        return await author_listing_service.get_active_listings(skip, limit)
     else:
-        return author_listing_service.get_all(skip, limit)
+        return await author_listing_service.get_all(skip, limit)
+
+@router.get("/facets", response_model=FacetPage[AuthorListing])
+async def browse_author_listings(
+    request: Request,
+    response: Response,
+    topics_games: List[str] = Query(default=[]),
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    active_only: bool = True,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    author_listing_service: AuthorListingService = Depends(get_author_listing_service)
+):
+    """
+    Фасетный просмотр: несколько значений topics_games, диапазон цены [min_price, max_price)
+    и активность. Вместе со страницей возвращаются счётчики по каждому фасету.
+    """
+    cached = await check_not_modified(request, response, author_listing_service)
+    if cached:
+        return cached
+
+    items, total, facets = await author_listing_service.browse(
+        {"topics_games": topics_games, "status": "active" if active_only else None}, min_price, max_price, skip, limit
+    )
+    return {"items": items, "total": total, "facets": facets}
 
 @router.get("/{listing_id}", response_model=AuthorListing)
-def get_author_listing(
+async def get_author_listing(
     listing_id: int,
+    request: Request,
+    response: Response,
     author_listing_service: AuthorListingService = Depends(get_author_listing_service)
 ):
-    listing = author_listing_service.get(listing_id)
+    cached = await check_not_modified(request, response, author_listing_service)
+    if cached:
+        return cached
+    listing = await author_listing_service.get(listing_id)
     if not listing:
         raise HTTPException(status_code=404, detail="Author listing not found")
     return listing
 
 @router.post("/", response_model=AuthorListing)
-def create_author_listing(
+async def create_author_listing(
     listing_data: AuthorListingCreate,
     author_listing_service: AuthorListingService = Depends(get_author_listing_service)
 ):
-    return author_listing_service.create(listing_data.dict())
+    return await author_listing_service.create(listing_data.dict())
 
 @router.put("/{listing_id}", response_model=AuthorListing)
-def update_author_listing(
+async def update_author_listing(
     listing_id: int,
     listing_data: AuthorListingUpdate,
     author_listing_service: AuthorListingService = Depends(get_author_listing_service)
 ):
-    listing = author_listing_service.get(listing_id)
+    listing = await author_listing_service.get(listing_id)
     if not listing:
         raise HTTPException(status_code=404, detail="Author listing not found")
     
-    return author_listing_service.update(listing_id, listing_data.dict(exclude_unset=True))
+    return await author_listing_service.update(listing_id, listing_data.dict(exclude_unset=True))
 
 @router.delete("/{listing_id}")
-def delete_author_listing(
+async def delete_author_listing(
     listing_id: int,
     author_listing_service: AuthorListingService = Depends(get_author_listing_service)
 ):
-    success = author_listing_service.delete(listing_id)
+    success = await author_listing_service.delete(listing_id)
     if not success:
         raise HTTPException(status_code=404, detail="Author listing not found")
     return {"message": "Author listing deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,39 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_db
+from app.schemas.catalog_schema import FeedItem
+from app.services.catalog_service import CatalogService
+from app.repositories.catalog_repository import CatalogRepository
+from app.utils.pagination import set_next_cursor
+from app.utils.http_cache import CATALOG_CACHE_CONTROL, make_etag, not_modified
+
+router = APIRouter(prefix="/catalog", tags=["catalog"])
+
+def get_catalog_service(db: AsyncSession = Depends(get_db)) -> CatalogService:
+    catalog_repository = CatalogRepository(db)
+    return CatalogService(catalog_repository)
+
+@router.get("/feed", response_model=List[FeedItem])
+async def get_feed(
+    request: Request,
+    response: Response,
+    sort: Literal["recent", "price_asc", "price_desc", "popular"] = "recent",
+    limit: int = Query(24, ge=1, le=100),
+    after: Optional[str] = None,
+    catalog_service: CatalogService = Depends(get_catalog_service)
+):
+    """
+    Общая лента активных товаров, листингов и авторских листингов.
+    Курсор следующей страницы — в заголовке X-Next-Cursor, передаётся в after.
+    """
+    versions = await catalog_service.table_versions()
+    etag = make_etag("catalog", *(version for version, _ in versions), request.url.path, request.url.query)
+    last_modified = max((updated_at for _, updated_at in versions if updated_at), default=None)
+    cached = not_modified(request, response, etag, CATALOG_CACHE_CONTROL, last_modified)
+    if cached:
+        return cached
+
+    items, next_cursor = await catalog_service.get_feed(sort, limit, after)
+    set_next_cursor(response, next_cursor)
+    return items
@@ -0,0 +1,29 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_db
+from app.schemas.change_schema import ChangeFeed
+from app.services.change_log_service import ChangeLogService
+from app.repositories.change_log_repository import ChangeLogRepository
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+def get_change_log_service(db: AsyncSession = Depends(get_db)) -> ChangeLogService:
+    change_log_repository = ChangeLogRepository(db)
+    return ChangeLogService(change_log_repository)
+
+@router.get("/", response_model=ChangeFeed)
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    table: Optional[str] = None,
+    change_log_service: ChangeLogService = Depends(get_change_log_service)
+):
+    """
+    Изменения каталога (products, listing, author_listing) после позиции since.
+    Клиент хранит next_since и передаёт его в следующий запрос; при has_more=true
+    нужно сразу запросить следующую порцию. Для insert/update актуальная строка
+    забирается по id, для delete — удаляется из локальной копии.
+    """
+    changes, next_since, has_more = await change_log_service.get_changes(since, limit, table)
+    return ChangeFeed(changes=changes, next_since=next_since, has_more=has_more)
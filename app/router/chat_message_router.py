@@ -1,70 +1,85 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
 from app.schemas import ChatMessage, ChatMessageCreate, ChatMessageUpdate
 from app.services.chat_message_service import ChatMessageService
 from app.repositories.chat_message_repository import ChatMessageRepository
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-def get_chat_message_service(db: Session = Depends(get_db)) -> ChatMessageService:
+def get_chat_message_service(db: AsyncSession = Depends(get_db)) -> ChatMessageService:
     chat_message_repository = ChatMessageRepository(db)
     return ChatMessageService(chat_message_repository)
 
 @router.get("/user/{user_id}", response_model=List[ChatMessage])
-def get_user_messages(
+async def get_user_messages(
     user_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: bool = False,
+    after: Optional[str] = None,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
-    return chat_message_service.get_user_messages(user_id, skip, limit)
+    if cursor or after:
+        messages, next_cursor = await chat_message_service.get_page(after, limit, "sent_at", user_id=user_id)
+        set_next_cursor(response, next_cursor)
+        return messages
+    return await chat_message_service.get_user_messages(user_id, skip, limit)
 
 @router.get("/user/{user_id}/conversation", response_model=List[ChatMessage])
-def get_conversation(
+async def get_conversation(
     user_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: bool = False,
+    after: Optional[str] = None,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
-    return chat_message_service.get_conversation(user_id, skip, limit)
+    if cursor or after:
+        messages, next_cursor = await chat_message_service.get_page(after, limit, "sent_at", user_id=user_id)
+        set_next_cursor(response, next_cursor)
+        return messages
+    return await chat_message_service.get_conversation(user_id, skip, limit)
 
 @router.get("/{message_id}", response_model=ChatMessage)
-def get_message(
+async def get_message(
     message_id: int,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
-    message = chat_message_service.get(message_id)
+    message = await chat_message_service.get(message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     return message
 
 @router.post("/", response_model=ChatMessage)
-def send_message(
+async def send_message(
     message_data: ChatMessageCreate,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
-    return chat_message_service.send_message(message_data.user_id, message_data.dict())
+    return await chat_message_service.send_message(message_data.user_id, message_data.dict())
 
 @router.put("/{message_id}", response_model=ChatMessage)
-def update_message(
+async def update_message(
     message_id: int,
     message_data: ChatMessageUpdate,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
-    message = chat_message_service.get(message_id)
+    message = await chat_message_service.get(message_id)
     if not message:
         raise HTTPException(status_code=404, detail="Message not found")
     
-    return chat_message_service.update(message_id, message_data.dict(exclude_unset=True))
+    return await chat_message_service.update(message_id, message_data.dict(exclude_unset=True))
 
 @router.delete("/{message_id}")
-def delete_message(
+async def delete_message(
     message_id: int,
     chat_message_service: ChatMessageService = Depends(get_chat_message_service)
 ):
-    success = chat_message_service.delete(message_id)
+    success = await chat_message_service.delete(message_id)
     if not success:
         raise HTTPException(status_code=404, detail="Message not found")
     return {"message": "Message deleted successfully"}
\ No newline at end of file
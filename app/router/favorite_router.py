@@ -1,10 +1,13 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
 from app.schemas.favorite_schema import Favorite, FavoriteCreate
 from app.services.favorite_service import FavoriteService
 from app.repositories.favorite_repository import FavoriteRepository
+from app.utils.pagination import set_next_cursor
+from app.utils.http_cache import PRIVATE_CACHE_CONTROL, check_not_modified
+from app.dependencies import check_owner, get_caller_id
 from app.exceptions.favorite_exceptions import (
     FavoriteNotFoundException,
     FavoriteAlreadyExistsException,
@@ -14,24 +17,40 @@ from app.exceptions.favorite_exceptions import (
 # Создаем роутер - обратите внимание на переменную 'router' (не 'Router')
 router = APIRouter(prefix="/favorites", tags=["favorites"])
 
-def get_favorite_service(db: Session = Depends(get_db)) -> FavoriteService:
+def get_favorite_service(db: AsyncSession = Depends(get_db)) -> FavoriteService:
     favorite_repository = FavoriteRepository(db)
     return FavoriteService(favorite_repository)
 
 @router.get("/user/{user_id}", response_model=List[Favorite])
-def get_user_favorites(
+async def get_user_favorites(
     user_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: bool = False,
+    after: Optional[str] = None,
+    caller_id: Optional[int] = Depends(get_caller_id),
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
-    return favorite_service.get_user_favorites(user_id, skip, limit)
+    check_owner(user_id, caller_id)
+    cached = await check_not_modified(request, response, favorite_service, PRIVATE_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    if cursor or after:
+        favorites, next_cursor = await favorite_service.get_page(after, limit, "added_at", "desc", user_id=user_id)
+        set_next_cursor(response, next_cursor)
+        return favorites
+    return await favorite_service.get_user_favorites(user_id, skip, limit)
 
 @router.post("/", response_model=Favorite)
-def add_to_favorites(
+async def add_to_favorites(
     favorite_data: FavoriteCreate,
+    caller_id: Optional[int] = Depends(get_caller_id),
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
+    check_owner(favorite_data.user_id, caller_id)
     try:
         # Проверяем, что указан хотя бы один тип товара
         if not any([favorite_data.products_id, favorite_data.listing_id, favorite_data.author_listing_id]):
@@ -40,47 +59,38 @@ def add_to_favorites(
                 detail="At least one of products_id, listing_id, or author_listing_id must be provided"
             )
         
-        # Проверяем, не добавлен ли уже товар в избранное
-        filters = {}
-        if favorite_data.products_id:
-            filters["products_id"] = favorite_data.products_id
-        if favorite_data.listing_id:
-            filters["listing_id"] = favorite_data.listing_id
-        if favorite_data.author_listing_id:
-            filters["author_listing_id"] = favorite_data.author_listing_id
-        
-        if favorite_service.is_item_favorited(favorite_data.user_id, **filters):
-            raise FavoriteAlreadyExistsException(
-                user_id=favorite_data.user_id,
-                item_type="product" if favorite_data.products_id else "listing",
-                item_id=favorite_data.products_id or favorite_data.listing_id or favorite_data.author_listing_id
-            )
-        
-        return favorite_service.add_to_favorites(favorite_data.user_id, favorite_data.dict())
+        # Уже добавленный товар отсекает уникальный индекс, сервис вернёт 409
+        return await favorite_service.add_to_favorites(favorite_data.user_id, favorite_data.dict())
     except FavoriteAlreadyExistsException as e:
         raise e
     except Exception as e:
         raise FavoriteValidationException(detail=str(e))
 
 @router.delete("/{favorite_id}")
-def remove_from_favorites(
+async def remove_from_favorites(
     favorite_id: int,
+    caller_id: Optional[int] = Depends(get_caller_id),
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
     try:
-        success = favorite_service.delete(favorite_id)
+        # Чужую запись DELETE с условием по user_id не найдёт
+        success = await favorite_service.delete(favorite_id, user_id=caller_id)
+        if not success:
+            raise FavoriteNotFoundException(favorite_id)
         return {"message": "Removed from favorites"}
     except FavoriteNotFoundException as e:
         raise e
 
 @router.get("/check/{user_id}")
-def check_if_favorited(
+async def check_if_favorited(
     user_id: int,
     product_id: int = None,
     listing_id: int = None,
     author_listing_id: int = None,
+    caller_id: Optional[int] = Depends(get_caller_id),
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
+    check_owner(user_id, caller_id)
     filters = {}
     if product_id:
         filters["products_id"] = product_id
@@ -89,5 +99,5 @@ def check_if_favorited(
     if author_listing_id:
         filters["author_listing_id"] = author_listing_id
     
-    is_favorited = favorite_service.is_item_favorited(user_id, **filters)
+    is_favorited = await favorite_service.is_item_favorited(user_id, **filters)
     return {"is_favorited": is_favorited}
\ No newline at end of file
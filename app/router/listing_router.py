@@ -1,11 +1,15 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from decimal import Decimal
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
 # Исправленный импорт - из модуля listing_schema
 from app.schemas.listing_schema import Listing, ListingCreate, ListingUpdate
+from app.schemas.facet_schema import FacetPage
 from app.services.listing_service import ListingService
 from app.repositories.listing_repository import ListingRepository
+from app.utils.pagination import set_next_cursor, set_total_count
+from app.utils.http_cache import check_not_modified
 from app.exceptions.listing_exceptions import (
     ListingNotFoundException,
     ListingValidationException,
@@ -14,82 +18,136 @@ from app.exceptions.listing_exceptions import (
 
 router = APIRouter(prefix="/listings", tags=["listings"])
 
-def get_listing_service(db: Session = Depends(get_db)) -> ListingService:
+def get_listing_service(db: AsyncSession = Depends(get_db)) -> ListingService:
     listing_repository = ListingRepository(db)
     return ListingService(listing_repository)
 
 @router.get("/", response_model=List[Listing])
-def get_listings(
+async def get_listings(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     user_id: int = None,
     game_topic: str = None,
     active_only: bool = True,
+    include_total: bool = False,
+    cursor: bool = False,
+    after: Optional[str] = None,
     listing_service: ListingService = Depends(get_listing_service)
 ):
+    cached = await check_not_modified(request, response, listing_service)
+    if cached:
+        return cached
+
+    if cursor or after:
+        if user_id:
+            filters = {"user_id": user_id}
+        elif game_topic:
+            filters = {"game_topic": game_topic}
+        else:
+            filters = {"status": "active"} if active_only else {}
+        listings, next_cursor = await listing_service.get_page(after, limit, **filters)
+        set_next_cursor(response, next_cursor)
+        return listings
+    
     if user_id:
-        return listing_service.get_by_user(user_id, skip, limit)
+        return await listing_service.get_by_user(user_id, skip, limit)
     elif game_topic:
-        return listing_service.get_by_game_topic(game_topic, skip, limit)
+        return await listing_service.get_by_game_topic(game_topic, skip, limit)
     elif active_only:
-        return listing_service.get_active_listings(skip, limit)
+        if include_total:
+            listings, total = await listing_service.get_active_listings(skip, limit, with_total=True)
+            set_total_count(response, total)
+            return listings
+        return await listing_service.get_active_listings(skip, limit)
     else:
-        return listing_service.get_all(skip, limit)
+        return await listing_service.get_all(skip, limit)
+
+@router.get("/facets", response_model=FacetPage[Listing])
+async def browse_listings(
+    request: Request,
+    response: Response,
+    game_topic: List[str] = Query(default=[]),
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    active_only: bool = True,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    listing_service: ListingService = Depends(get_listing_service)
+):
+    """
+    Фасетный просмотр: несколько значений game_topic, диапазон цены [min_price, max_price)
+    и активность. Вместе со страницей возвращаются счётчики по каждому фасету.
+    """
+    cached = await check_not_modified(request, response, listing_service)
+    if cached:
+        return cached
+
+    items, total, facets = await listing_service.browse(
+        {"game_topic": game_topic, "status": "active" if active_only else None}, min_price, max_price, skip, limit
+    )
+    return {"items": items, "total": total, "facets": facets}
 
 @router.get("/{listing_id}", response_model=Listing)
-def get_listing(
+async def get_listing(
     listing_id: int,
+    request: Request,
+    response: Response,
     listing_service: ListingService = Depends(get_listing_service)
 ):
+    cached = await check_not_modified(request, response, listing_service)
+    if cached:
+        return cached
     try:
-        return listing_service.get(listing_id)
+        return await listing_service.get(listing_id)
     except ListingNotFoundException as e:
         raise e
 
 @router.post("/", response_model=Listing)
-def create_listing(
+async def create_listing(
     listing_data: ListingCreate,
     listing_service: ListingService = Depends(get_listing_service)
 ):
     try:
-        return listing_service.create(listing_data.dict())
+        return await listing_service.create(listing_data.dict())
     except Exception as e:
         raise ListingValidationException(detail=str(e))
 
 @router.put("/{listing_id}", response_model=Listing)
-def update_listing(
+async def update_listing(
     listing_id: int,
     listing_data: ListingUpdate,
     listing_service: ListingService = Depends(get_listing_service)
 ):
     try:
-        listing = listing_service.get(listing_id)
-        return listing_service.update(listing_id, listing_data.dict(exclude_unset=True))
+        listing = await listing_service.get(listing_id)
+        return await listing_service.update(listing_id, listing_data.dict(exclude_unset=True))
     except ListingNotFoundException as e:
         raise e
     except Exception as e:
         raise ListingValidationException(detail=str(e))
 
 @router.delete("/{listing_id}")
-def delete_listing(
+async def delete_listing(
     listing_id: int,
     listing_service: ListingService = Depends(get_listing_service)
 ):
     try:
-        success = listing_service.delete(listing_id)
+        success = await listing_service.delete(listing_id)
         return {"message": "Listing deleted successfully"}
     except ListingNotFoundException as e:
         raise e
 
 @router.patch("/{listing_id}/status")
-def update_listing_status(
+async def update_listing_status(
     listing_id: int,
     status: str,
     listing_service: ListingService = Depends(get_listing_service)
 ):
     try:
-        listing = listing_service.get(listing_id)
-        listing_service.update(listing_id, {"status": status})
+        listing = await listing_service.get(listing_id)
+        await listing_service.update(listing_id, {"status": status})
         return {"message": f"Listing status updated to {status}"}
     except ListingNotFoundException as e:
         raise e
\ No newline at end of file
@@ -1,80 +1,144 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
-from app.schemas import Order, OrderCreate, OrderUpdate
+from app.models.order_status import OrderStatus
+from app.schemas import Order, OrderCreate, OrderUpdate, OrderResponse, OrderStats
 from app.services.order_service import OrderService
 from app.repositories.order_repository import OrderRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.order_stats_repository import OrderStatsRepository
+from app.utils.pagination import set_next_cursor
+from app.dependencies import check_owner, get_caller_id, require_admin
+from app.schemas.user_schema import TokenPayload
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
-def get_order_service(db: Session = Depends(get_db)) -> OrderService:
+def get_order_service(db: AsyncSession = Depends(get_db)) -> OrderService:
     order_repository = OrderRepository(db)
-    return OrderService(order_repository)
+    order_item_repository = OrderItemRepository(db)
+    order_stats_repository = OrderStatsRepository(db)
+    return OrderService(order_repository, order_item_repository, order_stats_repository)
 
-@router.get("/", response_model=List[Order])
-def get_orders(
+async def _expand(orders, expand: Optional[str], order_service: OrderService) -> list:
+    if expand == "items":
+        return await order_service.load_items(list(orders))
+    # Незагруженные позиции нельзя подгрузить лениво в async-сессии, отдаём заказ без них
+    return [Order.model_validate(order) for order in orders]
+
+@router.get("/", response_model=List[OrderResponse])
+async def get_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     user_id: int = None,
-    status: str = None,
+    status: Optional[OrderStatus] = None,
+    cursor: bool = False,
+    after: Optional[str] = None,
+    expand: Optional[Literal["items"]] = None,
+    caller_id: Optional[int] = Depends(get_caller_id),
     order_service: OrderService = Depends(get_order_service)
 ):
     if user_id:
-        return order_service.get_by_user(user_id, skip, limit)
+        check_owner(user_id, caller_id)
+    if cursor or after:
+        # Новые заказы первыми
+        filters = {"user_id": user_id, "status": status}
+        filters = {name: value for name, value in filters.items() if value}
+        orders, next_cursor = await order_service.get_page(after, limit, "creat_at", "desc", **filters)
+        set_next_cursor(response, next_cursor)
+    elif user_id:
+        orders = await order_service.get_by_user(user_id, skip, limit, status)
     elif status:
-        return order_service.get_by_status(status, skip, limit)
+        orders = await order_service.get_by_status(status, skip, limit)
     else:
-        return order_service.get_all(skip, limit)
+        orders = await order_service.get_all(skip, limit)
+    return await _expand(orders, expand, order_service)
+
+@router.get("/stats/{user_id}", response_model=OrderStats)
+async def get_order_stats(
+    user_id: int,
+    caller_id: Optional[int] = Depends(get_caller_id),
+    order_service: OrderService = Depends(get_order_service)
+):
+    """Сводка заказов пользователя: количество, сумма за всё время, время последнего заказа; отменённые не учитываются"""
+    check_owner(user_id, caller_id)
+    return await order_service.get_stats(user_id)
+
+@router.post("/queue/{status}", response_model=List[Order])
+async def claim_orders(
+    status: OrderStatus,
+    claim: int = Query(1, ge=1, le=100),
+    admin_user: TokenPayload = Depends(require_admin),
+    order_service: OrderService = Depends(get_order_service)
+):
+    """Забрать до claim самых старых заказов статуса и перевести их в следующий статус.
+
+    Заказ достаётся только одному воркеру; пустой список — очередь пуста.
+    Воркер обращается с токеном админа.
+    """
+    return await order_service.claim(status, claim)
 
-@router.get("/{order_id}", response_model=Order)
-def get_order(
+@router.get("/{order_id}", response_model=OrderResponse)
+async def get_order(
     order_id: int,
+    expand: Optional[Literal["items"]] = None,
+    caller_id: Optional[int] = Depends(get_caller_id),
     order_service: OrderService = Depends(get_order_service)
 ):
-    order = order_service.get(order_id)
+    order = await order_service.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    check_owner(order.user_id, caller_id)
+    return (await _expand([order], expand, order_service))[0]
 
 @router.post("/", response_model=Order)
-def create_order(
+async def create_order(
     order_data: OrderCreate,
+    caller_id: Optional[int] = Depends(get_caller_id),
     order_service: OrderService = Depends(get_order_service)
 ):
-    return order_service.create(order_data.dict())
+    check_owner(order_data.user_id, caller_id)
+    return await order_service.create(order_data.dict())
 
 @router.put("/{order_id}", response_model=Order)
-def update_order(
+async def update_order(
     order_id: int,
     order_data: OrderUpdate,
+    caller_id: Optional[int] = Depends(get_caller_id),
     order_service: OrderService = Depends(get_order_service)
 ):
-    order = order_service.get(order_id)
+    order = await order_service.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
+    check_owner(order.user_id, caller_id)
     
-    return order_service.update(order_id, order_data.dict(exclude_unset=True))
+    return await order_service.update(order_id, order_data.dict(exclude_unset=True))
 
 @router.delete("/{order_id}")
-def delete_order(
+async def delete_order(
     order_id: int,
+    caller_id: Optional[int] = Depends(get_caller_id),
     order_service: OrderService = Depends(get_order_service)
 ):
-    success = order_service.delete(order_id)
+    order = await order_service.get(order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    check_owner(order.user_id, caller_id)
+    success = await order_service.delete(order_id)
     if not success:
         raise HTTPException(status_code=404, detail="Order not found")
     return {"message": "Order deleted successfully"}
 
 @router.patch("/{order_id}/status")
-def update_order_status(
+async def update_order_status(
     order_id: int,
-    status: str,
+    status: OrderStatus,
     order_service: OrderService = Depends(get_order_service)
 ):
-    order = order_service.get(order_id)
+    order = await order_service.get(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    order_service.update_status(order_id, status)
-    return {"message": f"Order status updated to {status}"}
\ No newline at end of file
+    await order_service.update_status(order_id, status)
+    return {"message": f"Order status updated to {status.value}"}
\ No newline at end of file
@@ -1,101 +1,154 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from decimal import Decimal
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
 from app.services.product_service import ProductService
 from app.repositories.product_repository import ProductRepository
 from app.schemas.product_schema import Product, ProductCreate, ProductUpdate
+from app.schemas.facet_schema import FacetPage
+from app.utils.pagination import set_next_cursor, set_total_count
+from app.utils.http_cache import check_not_modified
 from app.services.product_service import ProductService
 from app.repositories.product_repository import ProductRepository
 
 router = APIRouter(prefix="/products", tags=["products"])
 
-def get_product_service(db: Session = Depends(get_db)) -> ProductService:
+def get_product_service(db: AsyncSession = Depends(get_db)) -> ProductService:
     product_repository = ProductRepository(db)
     return ProductService(product_repository)
 
 router = APIRouter(prefix="/products", tags=["products"])
 
-def get_product_service(db: Session = Depends(get_db)) -> ProductService:
+def get_product_service(db: AsyncSession = Depends(get_db)) -> ProductService:
     product_repository = ProductRepository(db)
     return ProductService(product_repository)
 
 @router.get("/", response_model=List[Product])
-def get_products(
+async def get_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category: str = None,
     active_only: bool = True,
+    include_total: bool = False,
+    cursor: bool = False,
+    after: Optional[str] = None,
     product_service: ProductService = Depends(get_product_service)
 ):
+    cached = await check_not_modified(request, response, product_service)
+    if cached:
+        return cached
+
+    if cursor or after:
+        filters = {"category": category} if category else {"is_active": True} if active_only else {}
+        products, next_cursor = await product_service.get_page(after, limit, **filters)
+        set_next_cursor(response, next_cursor)
+        return products
+    
     if category:
-        return product_service.get_by_category(category, skip, limit)
+        return await product_service.get_by_category(category, skip, limit)
     elif active_only:
-        return product_service.get_active_products(skip, limit)
+        if include_total:
+            products, total = await product_service.get_active_products(skip, limit, with_total=True)
+            set_total_count(response, total)
+            return products
+        return await product_service.get_active_products(skip, limit)
     else:
-        return product_service.get_all(skip, limit)
+        return await product_service.get_all(skip, limit)
+
+@router.get("/facets", response_model=FacetPage[Product])
+async def browse_products(
+    request: Request,
+    response: Response,
+    category: List[str] = Query(default=[]),
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    active_only: bool = True,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    product_service: ProductService = Depends(get_product_service)
+):
+    """
+    Фасетный просмотр: несколько значений category, диапазон цены [min_price, max_price)
+    и активность. Вместе со страницей возвращаются счётчики по каждому фасету.
+    """
+    cached = await check_not_modified(request, response, product_service)
+    if cached:
+        return cached
+
+    items, total, facets = await product_service.browse(
+        {"category": category, "is_active": True if active_only else None}, min_price, max_price, skip, limit
+    )
+    return {"items": items, "total": total, "facets": facets}
 
 @router.get("/{product_id}", response_model=Product)
-def get_product(
+async def get_product(
     product_id: int,
+    request: Request,
+    response: Response,
     product_service: ProductService = Depends(get_product_service)
 ):
-    product = product_service.get(product_id)
+    cached = await check_not_modified(request, response, product_service)
+    if cached:
+        return cached
+    product = await product_service.get(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
 @router.post("/", response_model=Product)
-def create_product(
+async def create_product(
     product_data: ProductCreate,
     product_service: ProductService = Depends(get_product_service)
 ):
-    return product_service.create(product_data.dict())
+    return await product_service.create(product_data.dict())
 
 @router.put("/{product_id}", response_model=Product)
-def update_product(
+async def update_product(
     product_id: int,
     product_data: ProductUpdate,
     product_service: ProductService = Depends(get_product_service)
 ):
-    product = product_service.get(product_id)
+    product = await product_service.get(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    return product_service.update(product_id, product_data.dict(exclude_unset=True))
+    return await product_service.update(product_id, product_data.dict(exclude_unset=True))
 
 @router.delete("/{product_id}")
-def delete_product(
+async def delete_product(
     product_id: int,
     product_service: ProductService = Depends(get_product_service)
 ):
-    success = product_service.delete(product_id)
+    success = await product_service.delete(product_id)
     if not success:
         raise HTTPException(status_code=404, detail="Product not found")
     return {"message": "Product deleted successfully"}
 
 @router.patch("/{product_id}/activate")
-def activate_product(
+async def activate_product(
     product_id: int,
     product_service: ProductService = Depends(get_product_service)
 ):
-    product = product_service.get(product_id)
+    product = await product_service.get(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
     # ИСПРАВЛЕНО: is_acctive → is_active
-    product_service.update(product_id, {"is_active": True})
+    await product_service.update(product_id, {"is_active": True})
     return {"message": "Product activated successfully"}
 
 @router.patch("/{product_id}/deactivate")
-def deactivate_product(
+async def deactivate_product(
     product_id: int,
     product_service: ProductService = Depends(get_product_service)
 ):
-    product = product_service.get(product_id)
+    product = await product_service.get(product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
     # ИСПРАВЛЕНО: is_acctive → is_active
-    product_service.update(product_id, {"is_active": False})
+    await product_service.update(product_id, {"is_active": False})
     return {"message": "Product deactivated successfully"}
\ No newline at end of file
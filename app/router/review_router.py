@@ -1,10 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
 from app.schemas.favorite_schema import Favorite, FavoriteCreate
 from app.services.favorite_service import FavoriteService
 from app.repositories.favorite_repository import FavoriteRepository
+from app.utils.pagination import set_next_cursor
+from app.utils.http_cache import PRIVATE_CACHE_CONTROL, check_not_modified
 from app.exceptions.favorite_exceptions import (
     FavoriteNotFoundException,
     FavoriteAlreadyExistsException,
@@ -14,27 +16,41 @@ from app.exceptions.favorite_exceptions import (
 # Создаем роутер - обратите внимание на переменную 'router' (не 'Router')
 router = APIRouter(prefix="/favorites", tags=["favorites"])
 
-def get_favorite_service(db: Session = Depends(get_db)) -> FavoriteService:
+def get_favorite_service(db: AsyncSession = Depends(get_db)) -> FavoriteService:
     favorite_repository = FavoriteRepository(db)
     return FavoriteService(favorite_repository)
 
 @router.get("/user/{user_id}", response_model=List[Favorite])
-def get_user_favorites(
+async def get_user_favorites(
     user_id: int,
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: bool = False,
+    after: Optional[str] = None,
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
     """
     Получить все избранные товары пользователя с пагинацией.
+    С cursor=true или after=<курсор> — keyset-пагинация, курсор следующей страницы в заголовке X-Next-Cursor.
+    Ответ несёт ETag; при совпадении If-None-Match возвращается 304 без тела.
     """
+    cached = await check_not_modified(request, response, favorite_service, PRIVATE_CACHE_CONTROL)
+    if cached:
+        return cached
+
+    if cursor or after:
+        favorites, next_cursor = await favorite_service.get_page(after, limit, "added_at", "desc", user_id=user_id)
+        set_next_cursor(response, next_cursor)
+        return favorites
     try:
-        return favorite_service.get_user_favorites(user_id, skip, limit)
+        return await favorite_service.get_user_favorites(user_id, skip, limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/user/{user_id}/count")
-def get_user_favorites_count(
+async def get_user_favorites_count(
     user_id: int,
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
@@ -42,13 +58,13 @@ def get_user_favorites_count(
     Получить количество избранных товаров пользователя.
     """
     try:
-        favorites = favorite_service.get_user_favorites(user_id, 0, 1000)
-        return {"user_id": user_id, "count": len(favorites)}
+        count = await favorite_service.get_user_favorites_count(user_id)
+        return {"user_id": user_id, "count": count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/", response_model=Favorite)
-def add_to_favorites(
+async def add_to_favorites(
     favorite_data: FavoriteCreate,
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
@@ -60,41 +76,26 @@ def add_to_favorites(
                 detail="At least one of products_id, listing_id, or author_listing_id must be provided"
             )
         
-        # Проверяем, не добавлен ли уже товар в избранное
-        filters = {}
-        if favorite_data.products_id:
-            filters["products_id"] = favorite_data.products_id
-        if favorite_data.listing_id:
-            filters["listing_id"] = favorite_data.listing_id
-        if favorite_data.author_listing_id:
-            filters["author_listing_id"] = favorite_data.author_listing_id
-        
-        if favorite_service.is_item_favorited(favorite_data.user_id, **filters):
-            raise FavoriteAlreadyExistsException(
-                user_id=favorite_data.user_id,
-                item_type="product" if favorite_data.products_id else "listing",
-                item_id=favorite_data.products_id or favorite_data.listing_id or favorite_data.author_listing_id
-            )
-        
-        return favorite_service.add_to_favorites(favorite_data.user_id, favorite_data.dict())
+        # Уже добавленный товар отсекает уникальный индекс, сервис вернёт 409
+        return await favorite_service.add_to_favorites(favorite_data.user_id, favorite_data.dict())
     except FavoriteAlreadyExistsException as e:
         raise e
     except Exception as e:
         raise FavoriteValidationException(detail=str(e))
 
 @router.delete("/{favorite_id}")
-def remove_from_favorites(
+async def remove_from_favorites(
     favorite_id: int,
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
     try:
-        success = favorite_service.delete(favorite_id)
+        success = await favorite_service.delete(favorite_id)
         return {"message": "Removed from favorites"}
     except FavoriteNotFoundException as e:
         raise e
 
 @router.get("/check/{user_id}")
-def check_if_favorited(
+async def check_if_favorited(
     user_id: int,
     product_id: int = Query(None),
     listing_id: int = Query(None),
@@ -118,11 +119,11 @@ def check_if_favorited(
             detail="At least one of product_id, listing_id, or author_listing_id must be provided"
         )
     
-    is_favorited = favorite_service.is_item_favorited(user_id, **filters)
+    is_favorited = await favorite_service.is_item_favorited(user_id, **filters)
     return {"is_favorited": is_favorited}
 
 @router.get("/user/{user_id}/exists")
-def check_user_favorites_exist(
+async def check_user_favorites_exist(
     user_id: int,
     favorite_service: FavoriteService = Depends(get_favorite_service)
 ):
@@ -130,7 +131,7 @@ def check_user_favorites_exist(
     Проверить, есть ли у пользователя избранные товары.
     """
     try:
-        favorites = favorite_service.get_user_favorites(user_id, 0, 1)
+        favorites = await favorite_service.get_user_favorites(user_id, 0, 1)
         return {"user_id": user_id, "has_favorites": len(favorites) > 0}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
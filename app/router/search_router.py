@@ -0,0 +1,54 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_db
+from app.schemas.search_schema import SearchHit, Suggestion
+from app.services.search_service import SearchService
+from app.services.suggest_service import SuggestService
+from app.repositories.search_repository import SearchRepository
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.utils.pagination import set_total_count
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+def get_search_service(db: AsyncSession = Depends(get_db)) -> SearchService:
+    search_repository = SearchRepository(db)
+    return SearchService(search_repository)
+
+def get_suggest_service(db: AsyncSession = Depends(get_db)) -> SuggestService:
+    return SuggestService(SearchRepository(db), ChangeLogRepository(db))
+
+@router.get("/", response_model=List[SearchHit])
+async def search_catalog(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[Literal["product", "listing", "author_listing"]] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    include_total: bool = False,
+    search_service: SearchService = Depends(get_search_service)
+):
+    """
+    Полнотекстовый поиск по товарам, листингам и авторским листингам.
+    Результаты упорядочены по релевантности (совпадение в названии весит больше,
+    чем в теме или описании), последнее слово запроса ищется как префикс.
+    С include_total=true общее количество найденного — в заголовке X-Total-Count.
+    """
+    if include_total:
+        hits, total = await search_service.search(q, type, skip, limit, with_total=True)
+        set_total_count(response, total)
+        return hits
+    return await search_service.search(q, type, skip, limit)
+
+@router.get("/suggest", response_model=List[Suggestion])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    type: Optional[Literal["product", "listing", "author_listing", "topic"]] = None,
+    suggest_service: SuggestService = Depends(get_suggest_service)
+):
+    """
+    Подсказки для строки поиска по началу слов в названиях и темах каталога.
+    Отвечает из индекса в памяти процесса, без запроса к FTS.
+    """
+    return await suggest_service.suggest(q, limit, type)
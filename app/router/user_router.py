@@ -1,97 +1,110 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
 from app.schemas.user_schema import User, UserCreate, UserUpdate
 from app.services.user_service import UserService
 from app.repositories.user_repository import UserRepository
+from app.repositories.cart_repository import CartRepository
+from app.repositories.cart_item_repository import CartItemRepository
+from app.repositories.favorite_repository import FavoriteRepository
+from app.repositories.order_stats_repository import OrderStatsRepository
 from app.exceptions.user_exceptions import (
     UserNotFoundException,
     UserAlreadyExistsException,
     InvalidCredentialsException
 )
+from app.utils.security import create_access_token, is_admin_role
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
+def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
     user_repository = UserRepository(db)
-    return UserService(user_repository)
+    return UserService(
+        user_repository,
+        CartRepository(db),
+        CartItemRepository(db),
+        FavoriteRepository(db),
+        OrderStatsRepository(db)
+    )
 
 @router.get("/", response_model=List[User])
-def get_users(
+async def get_users(
     skip: int = 0,
     limit: int = 100,
     user_service: UserService = Depends(get_user_service)
 ):
-    return user_service.get_all(skip, limit)
+    return await user_service.get_all(skip, limit)
 
 @router.get("/{user_id}", response_model=User)
-def get_user(
+async def get_user(
     user_id: int,
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        return user_service.get(user_id)
+        return await user_service.get(user_id)
     except UserNotFoundException as e:
         raise e
 
 @router.get("/email/{email}", response_model=User)
-def get_user_by_email(
+async def get_user_by_email(
     email: str,
     user_service: UserService = Depends(get_user_service)
 ):
-    user = user_service.get_by_email(email)
+    user = await user_service.get_by_email(email)
     if not user:
         raise UserNotFoundException(email=email)
     return user
 
 @router.post("/", response_model=User)
-def create_user(
+async def create_user(
     user_data: UserCreate,
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        return user_service.create_user(user_data)
+        return await user_service.create_user(user_data)
     except UserAlreadyExistsException as e:
         raise e
 
 @router.put("/{user_id}", response_model=User)
-def update_user(
+async def update_user(
     user_id: int,
     user_data: UserUpdate,
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        return user_service.update_user(user_id, user_data.dict(exclude_unset=True))
+        return await user_service.update_user(user_id, user_data.dict(exclude_unset=True))
     except UserNotFoundException as e:
         raise e
     except UserAlreadyExistsException as e:
         raise e
 
 @router.delete("/{user_id}")
-def delete_user(
+async def delete_user(
     user_id: int,
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        success = user_service.delete(user_id)
+        success = await user_service.delete(user_id)
         return {"message": "User deleted successfully"}
     except UserNotFoundException as e:
         raise e
 
 @router.post("/authenticate")
-def authenticate(
+async def authenticate(
     email: str,
     password: str,
     user_service: UserService = Depends(get_user_service)
 ):
     try:
-        user = user_service.authenticate_user(email, password)
+        user = await user_service.authenticate_user(email, password)
         return {
             "message": "Authenticated successfully", 
             "user_id": user.id,
             "name": user.name,
-            "email": user.email
+            "email": user.email,
+            "access_token": create_access_token(user.id, user.role_id, is_admin_role(user.role.name)),
+            "token_type": "bearer"
         }
     except InvalidCredentialsException as e:
         raise e
\ No newline at end of file
@@ -17,10 +17,10 @@ from .listing_schema import Listing, ListingCreate, ListingUpdate
 from .author_listing_schema import AuthorListing, AuthorListingCreate, AuthorListingUpdate
 
 # Order schemas
-from .order_schema import Order, OrderCreate, OrderUpdate
+from .order_schema import Order, OrderCreate, OrderUpdate, OrderResponse, OrderItemResponse, OrderStats
 
 # Cart schemas
-from .cart_schema import Cart, CartCreate
+from .cart_schema import Cart, CartCreate, CartCheckout
 
 # Cart Item schemas
 from .cart_item_schema import CartItem, CartItemCreate, CartItemUpdate
@@ -37,6 +37,18 @@ from .order_item_schema import OrderItem, OrderItemCreate, OrderItemUpdate
 # Chat Message schemas
 from .chat_message_schema import ChatMessage, ChatMessageCreate, ChatMessageUpdate
 
+# Change feed schemas
+from .change_schema import Change, ChangeFeed
+
+# Facet schemas
+from .facet_schema import FacetValue, FacetPage
+
+# Catalog feed schemas
+from .catalog_schema import FeedItem
+
+# Search schemas
+from .search_schema import SearchHit, Suggestion
+
 __all__ = [
     # Role
     "Role", "RoleCreate", "RoleUpdate",
@@ -54,10 +66,10 @@ __all__ = [
     "AuthorListing", "AuthorListingCreate", "AuthorListingUpdate",
     
     # Order
-    "Order", "OrderCreate", "OrderUpdate",
+    "Order", "OrderCreate", "OrderUpdate", "OrderResponse", "OrderItemResponse", "OrderStats",
     
     # Cart
-    "Cart", "CartCreate",
+    "Cart", "CartCreate", "CartCheckout",
     
     # Cart Item
     "CartItem", "CartItemCreate", "CartItemUpdate",
@@ -73,4 +85,16 @@ __all__ = [
     
     # Chat Message
     "ChatMessage", "ChatMessageCreate", "ChatMessageUpdate",
+    
+    # Change feed
+    "Change", "ChangeFeed",
+    
+    # Facets
+    "FacetValue", "FacetPage",
+    
+    # Catalog feed
+    "FeedItem",
+    
+    # Search
+    "SearchHit", "Suggestion",
 ]
\ No newline at end of file
@@ -27,6 +27,8 @@ class AuthorListingUpdate(BaseModel):
 
 class AuthorListing(AuthorListingBase):
     id: int
+    row_version: int = 1
+    updated_at: Optional[datetime] = None
     created_at: datetime
     
     class Config:
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
 from typing import Optional
 from enum import Enum
@@ -53,4 +53,11 @@ class Cart(CartBase):
     updated_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CartCheckout(BaseModel):
+    """Данные покупателя для оформления заказа из корзины"""
+    customer_name: str
+    customer_email: EmailStr
+    payment_method: str
+    payment_data: Optional[str] = None
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+from decimal import Decimal
+from datetime import datetime
+
+
+class FeedItem(BaseModel):
+    type: str
+    id: int
+    title: str
+    price: Decimal
+    image_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    popularity: int = 0
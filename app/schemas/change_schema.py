@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import List
+from datetime import datetime
+
+
+class Change(BaseModel):
+    id: int
+    table_name: str
+    row_id: int
+    operation: str
+    changed_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class ChangeFeed(BaseModel):
+    changes: List[Change]
+    next_since: int
+    has_more: bool
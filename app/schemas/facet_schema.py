@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Dict, Generic, List, Optional, TypeVar, Union
+from decimal import Decimal
+
+T = TypeVar("T")
+
+
+class FacetValue(BaseModel):
+    value: Union[bool, str, None]
+    count: int
+    # Только для диапазонов цены: [min, max), None — без границы
+    min: Optional[Decimal] = None
+    max: Optional[Decimal] = None
+
+
+class FacetPage(BaseModel, Generic[T]):
+    items: List[T]
+    total: int
+    facets: Dict[str, List[FacetValue]]
@@ -27,6 +27,8 @@ class ListingUpdate(BaseModel):
 
 class Listing(ListingBase):
     id: int
+    row_version: int = 1
+    updated_at: Optional[datetime] = None
     create_at: datetime
     
     class Config:
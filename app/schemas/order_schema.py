@@ -1,13 +1,17 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from decimal import Decimal
 from datetime import datetime
+from app.models.order_status import OrderStatus
+from .author_listing_schema import AuthorListing
+from .listing_schema import Listing
+from .order_item_schema import OrderItem
+from .product_schema import Product
 
 
 class OrderBase(BaseModel):
     user_id: int
     total_amount: Decimal
-    status: str = "pending"
     customer_name: str
     customer_email: EmailStr
     payment_method: str
@@ -15,35 +19,42 @@ class OrderBase(BaseModel):
 
 
 class OrderCreate(OrderBase):
-    pass
+    """Заказ создаётся в статусе pending, дальше статус меняется только по переходам"""
+    total_amount: Decimal = Field(gt=0, max_digits=10, decimal_places=2)
 
 
 class OrderUpdate(BaseModel):
-    status: Optional[str] = None
+    status: Optional[OrderStatus] = None
     payment_data: Optional[str] = None
 
 
 class Order(OrderBase):
     id: int
+    status: OrderStatus
+    item_count: int = 0
     creat_at: datetime
     
     class Config:
         from_attributes = True
 
 
-class OrderItemResponse(BaseModel):
-    product_id: int
-    quantity: int
-    price: Decimal
-
-
-class OrderResponse(BaseModel):
-    id: int
+class OrderStats(BaseModel):
     user_id: int
-    status: str
-    total_price: Decimal
-    created_at: datetime
-    items: Optional[List[OrderItemResponse]] = None
+    order_count: int
+    total_spent: Decimal
+    last_order_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
+
+
+class OrderItemResponse(OrderItem):
+    """Позиция заказа вместе с товаром каталога"""
+    product: Optional[Product] = None
+    listing: Optional[Listing] = None
+    author_listing: Optional[AuthorListing] = None
+
+
+class OrderResponse(Order):
+    """Заказ; items заполняется только при ?expand=items"""
+    items: Optional[List[OrderItemResponse]] = None
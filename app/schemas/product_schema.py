@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 from decimal import Decimal
+from datetime import datetime
 
 
 class ProductBase(BaseModel):
@@ -29,6 +30,9 @@ class ProductUpdate(BaseModel):
 
 class Product(ProductBase):
     id: int
+    row_version: int = 1
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Optional
+from decimal import Decimal
+
+
+class SearchHit(BaseModel):
+    type: str
+    id: int
+    title: str
+    price: Decimal
+    image_url: Optional[str] = None
+    topic: Optional[str] = None
+    snippet: Optional[str] = None
+    rank: float
+
+
+class Suggestion(BaseModel):
+    text: str
+    type: str
+    id: Optional[int] = None
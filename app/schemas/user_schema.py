@@ -22,6 +22,12 @@ class UserUpdate(BaseModel):
     role_id: Optional[int] = None
 
 
+class TokenPayload(BaseModel):
+    user_id: int
+    role_id: int
+    is_admin: bool = False
+
+
 class User(UserBase):
     id: int
     
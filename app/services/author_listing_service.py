@@ -1,17 +1,35 @@
+from typing import Optional
 from app.repositories.author_listing_repository import AuthorListingRepository
 from app.services.service import BaseService
 from app.models.author_listing import AuthorListingModel
+from app.config import settings
+from app.utils.cache import make_cache
+from app.services.suggest_service import mark_suggestions_stale
 
 class AuthorListingService(BaseService[AuthorListingModel]):
+    cache = make_cache("author_listings", settings.CATALOG_CACHE_MAX_SIZE, settings.CATALOG_CACHE_TTL)
+    facet_fields = ("topics_games", "status")
+    price_field = "prise"
+    price_buckets = settings.CATALOG_PRICE_BUCKETS
+    
     def __init__(self, author_listing_repository: AuthorListingRepository):
         super().__init__(author_listing_repository)
         self.author_listing_repository = author_listing_repository
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
-        return self.author_listing_repository.get_by_user(user_id, skip, limit)
+    async def invalidate(self, id: Optional[int] = None) -> None:
+        await super().invalidate(id)
+        mark_suggestions_stale()
+    
+    async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
+        return await self.author_listing_repository.get_by_user(user_id, skip, limit)
     
-    def get_by_topic(self, topic: str, skip: int = 0, limit: int = 100):
-        return self.author_listing_repository.get_by_topic(topic, skip, limit)
+    async def get_by_topic(self, topic: str, skip: int = 0, limit: int = 100):
+        return await self.author_listing_repository.get_by_topic(topic, skip, limit)
     
-    def get_active_listings(self, skip: int = 0, limit: int = 100):
-        return self.author_listing_repository.filter_by(status="active")
\ No newline at end of file
+    async def get_active_listings(self, skip: int = 0, limit: int = 100, with_total: bool = False):
+        return await self._cached(
+            f"list:active:{skip}:{limit}:{with_total}",
+            lambda: self.author_listing_repository.filter_by(
+                skip=skip, limit=limit, order_by="id", with_total=with_total, status="active"
+            )
+        )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from app.repositories.cart_repository import CartRepository
 from app.repositories.cart_item_repository import CartItemRepository
 from app.services.service import BaseService
@@ -14,26 +14,78 @@ class CartService(BaseService[CartModel]):
         self.cart_repository = cart_repository
         self.cart_item_repository = cart_item_repository
     
-    def get_or_create_user_cart(self, user_id: int) -> CartModel:
+    async def get_or_create_user_cart(self, user_id: int) -> CartModel:
         """Получаем корзину пользователя или создаем новую"""
-        cart = self.cart_repository.get_by_user(user_id)
+        cart = await self.cart_repository.get_by_user(user_id)
         if not cart:
             # Создаем новую корзину
             cart_data = {"user_id": user_id}
-            cart = self.cart_repository.create(cart_data)
+            async with self.transaction():
+                cart = await self.cart_repository.create(cart_data)
         return cart
     
-    def get_cart_items(self, cart_id: int, skip: int = 0, limit: int = 100) -> list:
+    async def get_cart_items(self, cart_id: int, skip: int = 0, limit: int = 100) -> list:
         """Получаем элементы корзины"""
-        cart = self.get(cart_id)
+        cart = await self.get(cart_id)
         if not cart:
             raise CartNotFoundException(cart_id=cart_id)
         
-        return self.cart_item_repository.get_by_cart_id(cart_id, skip, limit)
+        return await self.cart_item_repository.get_by_cart_id(cart_id, skip, limit)
     
-    def add_item_to_cart(self, cart_id: int, item_data: Dict[str, Any]) -> CartItemModel:
+    async def get_cart_items_detailed(self, cart_id: int, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        """Получаем элементы корзины с полными данными о товарах"""
+        cart = await self.get(cart_id)
+        if not cart:
+            raise CartNotFoundException(cart_id=cart_id)
+        
+        items = await self.cart_item_repository.get_by_cart_id_with_catalog(cart_id, skip, limit)
+        
+        detailed_items = []
+        for item in items:
+            item_data = {
+                "id": item.id,
+                "cart_id": item.cart_id,
+                "item_type": item.item_type,
+                "product_id": item.product_id,
+                "listing_id": item.listing_id,
+                "author_listing_id": item.author_listing_id,
+                "quantity": item.quantity,
+                "price": float(item.price),
+                "created_at": item.created_at.isoformat() if item.created_at else None,
+                "title": "Unknown Item",
+                "description": "",
+                "image_url": "https://via.placeholder.com/120x90?text=No+Image",
+                "category": ""
+            }
+            
+            if item.item_type == 'product' and item.product:
+                product = item.product
+                item_data["title"] = product.title
+                item_data["description"] = product.description or ""
+                item_data["image_url"] = product.image_url or "https://via.placeholder.com/120x90?text=Product"
+                item_data["category"] = product.category
+            
+            elif item.item_type == 'listing' and item.listing:
+                listing = item.listing
+                item_data["title"] = listing.title
+                item_data["description"] = listing.game_topic
+                item_data["image_url"] = listing.image_url or "https://via.placeholder.com/120x90?text=Listing"
+                item_data["category"] = "Listing"
+            
+            elif item.item_type == 'author_listing' and item.author_listing:
+                author_listing = item.author_listing
+                item_data["title"] = author_listing.title
+                item_data["description"] = ""
+                item_data["image_url"] = author_listing.image_url or "https://via.placeholder.com/120x90?text=Author+Listing"
+                item_data["category"] = "Author Publication"
+            
+            detailed_items.append(item_data)
+        
+        return detailed_items
+    
+    async def add_item_to_cart(self, cart_id: int, item_data: Dict[str, Any]) -> CartItemModel:
         """Добавляем товар в корзину"""
-        cart = self.get(cart_id)
+        cart = await self.get(cart_id)
         if not cart:
             raise CartNotFoundException(cart_id=cart_id)
         
@@ -55,64 +107,55 @@ class CartService(BaseService[CartModel]):
         else:
             item_id = item_data.get(f'{item_type}_id')
         
-        # Проверяем, есть ли уже такой товар в корзине
-        existing_item = self.cart_item_repository.get_by_cart_and_item(cart_id, item_type, item_id)
-        
-        if existing_item:
-            # Обновляем количество
-            existing_item.quantity += item_data.get('quantity', 1)
-            existing_item.price = item_data.get('price', existing_item.price)
-            self.db.commit()
-            self.db.refresh(existing_item)
-            return existing_item
-        else:
-            # Создаем новый элемент
-            cart_item_data = {
-                "cart_id": cart_id,
-                "item_type": item_type,
-                f"{item_type}_id": item_id,
-                "quantity": item_data.get('quantity', 1),
-                "price": item_data.get('price', 0)
-            }
-            return self.cart_item_repository.create(cart_item_data)
+        async with self.transaction():
+            # Новая позиция или увеличение количества существующей одним upsert
+            return await self.cart_item_repository.upsert_item(
+                cart_id,
+                item_type,
+                item_id,
+                item_data.get('quantity', 1),
+                item_data.get('price', 0)
+            )
     
-    def update_cart_item_quantity(self, item_id: int, quantity: int) -> Optional[CartItemModel]:
+    async def update_cart_item_quantity(self, item_id: int, quantity: int) -> Optional[CartItemModel]:
         """Обновляем количество товара в корзине"""
-        item = self.cart_item_repository.get(item_id)
+        item = await self.cart_item_repository.get(item_id)
         if not item:
             raise CartItemNotFoundException(item_id)
         
-        if quantity <= 0:
-            # Удаляем товар если количество 0 или меньше
-            self.cart_item_repository.delete(item_id)
-            return None
-        
-        update_data = {"quantity": quantity}
-        return self.cart_item_repository.update(item_id, update_data)
+        async with self.transaction():
+            if quantity <= 0:
+                # Удаляем товар если количество 0 или меньше
+                await self.cart_item_repository.delete(item_id)
+                return None
+            
+            update_data = {"quantity": quantity}
+            return await self.cart_item_repository.update(item_id, update_data)
     
-    def remove_item_from_cart(self, item_id: int) -> bool:
+    async def remove_item_from_cart(self, item_id: int) -> bool:
         """Удаляем товар из корзины"""
-        return self.cart_item_repository.delete(item_id)
+        async with self.transaction():
+            return await self.cart_item_repository.delete_where(id=item_id) > 0
     
-    def clear_cart(self, cart_id: int) -> bool:
+    async def clear_cart(self, cart_id: int) -> bool:
         """Очищаем корзину"""
-        cart = self.get(cart_id)
+        cart = await self.get(cart_id)
         if not cart:
             raise CartNotFoundException(cart_id=cart_id)
         
-        # Удаляем все элементы корзины
-        items = self.cart_item_repository.get_by_cart_id(cart_id)
-        for item in items:
-            self.cart_item_repository.delete(item.id)
-        
-        # Обновляем время изменения корзины
-        self.cart_repository.update(cart_id, {"updated_at": datetime.utcnow()})
+        # Один commit на всю очистку вместо commit на каждый элемент
+        async with self.transaction():
+            # Удаляем все элементы корзины одним DELETE
+            await self.cart_item_repository.delete_where(cart_id=cart_id)
+            
+            # Обновляем время изменения корзины
+            await self.cart_repository.update(cart_id, {"updated_at": datetime.utcnow()})
         return True
     
-    def get_cart_total(self, cart_id: int) -> float:
+    async def get_cart_total(self, cart_id: int) -> float:
         """Получаем общую стоимость корзины"""
-        items = self.get_cart_items(cart_id)
-        total = 0.0
-        for item in items:
-            total += item.price * item.quantity
-        return total
\ No newline at end of file
+        cart = await self.get(cart_id)
+        if not cart:
+            raise CartNotFoundException(cart_id=cart_id)
+        
+        return await self.cart_item_repository.get_total(cart_id)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from app.repositories.catalog_repository import CatalogRepository
+
+
+class CatalogService:
+    def __init__(self, catalog_repository: CatalogRepository):
+        self.catalog_repository = catalog_repository
+    
+    async def get_feed(
+        self,
+        sort: str = "recent",
+        limit: int = 24,
+        after: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return await self.catalog_repository.get_feed(sort, limit, after)
+    
+    async def table_versions(self) -> List[Tuple[int, Optional[datetime]]]:
+        return await self.catalog_repository.table_versions()
@@ -0,0 +1,23 @@
+from typing import List, Optional, Tuple
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.services.service import BaseService
+from app.models.change_log import ChangeLogModel
+
+
+class ChangeLogService(BaseService[ChangeLogModel]):
+    def __init__(self, change_log_repository: ChangeLogRepository):
+        super().__init__(change_log_repository)
+        self.change_log_repository = change_log_repository
+    
+    async def get_changes(
+        self,
+        since: int = 0,
+        limit: int = 500,
+        table_name: Optional[str] = None
+    ) -> Tuple[List[ChangeLogModel], int, bool]:
+        """Изменения после позиции since: (записи, следующая позиция, есть ли ещё)"""
+        changes = await self.change_log_repository.get_since(since, limit + 1, table_name)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        next_since = changes[-1].id if changes else since
+        return changes, next_since, has_more
@@ -0,0 +1,77 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict
+from app.repositories.cart_repository import CartRepository
+from app.repositories.cart_item_repository import CartItemRepository
+from app.repositories.order_repository import OrderRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.order_stats_repository import OrderStatsRepository
+from app.services.service import BaseService
+from app.models.orders import OrderModel
+from app.models.order_status import OrderStatus
+from app.exceptions.cart_exceptions import CartNotFoundException, CartItemsUnavailableException, EmptyCartException
+
+
+class CheckoutService(BaseService[OrderModel]):
+    """Оформление заказа из корзины одной транзакцией.
+
+    Цены позиций берутся из каталога, а не из корзины: цену в корзину
+    присылает клиент. Заказ, его позиции и очистка корзины коммитятся вместе,
+    при любой ошибке не остаётся ни заказа без позиций, ни списанной корзины.
+    """
+
+    def __init__(
+        self,
+        order_repository: OrderRepository,
+        order_item_repository: OrderItemRepository,
+        cart_repository: CartRepository,
+        cart_item_repository: CartItemRepository,
+        order_stats_repository: OrderStatsRepository
+    ):
+        super().__init__(order_repository)
+        self.order_repository = order_repository
+        self.order_item_repository = order_item_repository
+        self.cart_repository = cart_repository
+        self.cart_item_repository = cart_item_repository
+        self.order_stats_repository = order_stats_repository
+
+    async def checkout(self, user_id: int, customer_data: Dict[str, Any]) -> OrderModel:
+        cart = await self.cart_repository.get_by_user(user_id)
+        if not cart:
+            raise CartNotFoundException(user_id=user_id)
+
+        async with self.transaction():
+            # UPDATE корзины первым оператором захватывает блокировку на запись:
+            # второе оформление той же корзины дождётся коммита и увидит её пустой
+            await self.cart_repository.update_where({"id": cart.id}, {"updated_at": datetime.utcnow()})
+
+            items = await self.cart_item_repository.get_priced_items(cart.id)
+            if not items:
+                raise EmptyCartException(cart.id)
+            unavailable = [item.id for item in items if not item.available]
+            if unavailable:
+                raise CartItemsUnavailableException(unavailable)
+
+            total = sum((Decimal(item.unit_price) * item.quantity for item in items), Decimal("0"))
+            order = await self.order_repository.create({
+                **customer_data,
+                "user_id": user_id,
+                "total_amount": total,
+                "item_count": sum(item.quantity for item in items),
+                "status": OrderStatus.PENDING,
+            })
+            await self.order_item_repository.create_many([
+                {
+                    "order_id": order.id,
+                    "products_id": item.product_id,
+                    "listing_id": item.listing_id,
+                    "author_listing_id": item.author_listing_id,
+                    "unit_price": item.unit_price,
+                    "quantity": item.quantity,
+                }
+                for item in items
+            ])
+            await self.cart_item_repository.delete_where(cart_id=cart.id)
+            await self.order_stats_repository.add_order(user_id, total, order.creat_at)
+        await self.invalidate()
+        return order
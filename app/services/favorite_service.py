@@ -1,33 +1,46 @@
+from typing import Optional
 from app.repositories.favorite_repository import FavoriteRepository
 from app.services.service import BaseService
 from app.models.favorite import FavoriteModel
+from app.exceptions.favorite_exceptions import FavoriteAlreadyExistsException
 
 class FavoriteService(BaseService[FavoriteModel]):
     def __init__(self, favorite_repository: FavoriteRepository):
         super().__init__(favorite_repository)
         self.favorite_repository = favorite_repository
     
-    def get_user_favorites(self, user_id: int, skip: int = 0, limit: int = 100):
+    async def get_user_favorites(self, user_id: int, skip: int = 0, limit: int = 100):
         """Получить избранное пользователя с пагинацией"""
-        return self.favorite_repository.get_by_user(user_id, skip, limit)
+        return await self.favorite_repository.get_by_user(user_id, skip, limit)
     
-    def add_to_favorites(self, user_id: int, favorite_data: dict) -> FavoriteModel:
-        """Добавить товар в избранное пользователя"""
-        return self.favorite_repository.create({**favorite_data, "user_id": user_id})
+    async def add_to_favorites(self, user_id: int, favorite_data: dict) -> FavoriteModel:
+        """Добавить товар в избранное пользователя, повторное добавление -> 409"""
+        async with self.transaction():
+            favorite = await self.favorite_repository.add_if_absent({**favorite_data, "user_id": user_id})
+        if favorite is None:
+            raise FavoriteAlreadyExistsException(
+                user_id=user_id,
+                item_type="product" if favorite_data.get("products_id") else "listing",
+                item_id=favorite_data.get("products_id") or favorite_data.get("listing_id") or favorite_data.get("author_listing_id")
+            )
+        return favorite
     
-    def is_item_favorited(self, user_id: int, **filters) -> bool:
+    async def is_item_favorited(self, user_id: int, **filters) -> bool:
         """Проверить, добавлен ли товар в избранное у пользователя"""
-        favorite = self.favorite_repository.get_one_by(user_id=user_id, **filters)
+        favorite = await self.favorite_repository.get_one_by(user_id=user_id, **filters)
         return favorite is not None
     
-    def get_user_favorites_count(self, user_id: int) -> int:
+    async def get_user_favorites_count(self, user_id: int) -> int:
         """Получить количество избранных товаров пользователя"""
-        favorites = self.favorite_repository.get_by_user(user_id, 0, 1000)
-        return len(favorites)
+        return await self.favorite_repository.count(user_id=user_id)
     
-    def remove_from_favorites(self, user_id: int, **filters) -> bool:
+    async def remove_from_favorites(self, user_id: int, **filters) -> bool:
         """Удалить товар из избранного пользователя"""
-        favorite = self.favorite_repository.get_one_by(user_id=user_id, **filters)
-        if favorite:
-            return self.favorite_repository.delete(favorite.id)
-        return False
\ No newline at end of file
+        async with self.transaction():
+            return await self.favorite_repository.delete_where(user_id=user_id, **filters) > 0
+    
+    async def delete(self, id: int, user_id: Optional[int] = None) -> bool:
+        """Удалить запись избранного одним DELETE без предварительного SELECT; с user_id — только свою"""
+        filters = {"id": id} if user_id is None else {"id": id, "user_id": user_id}
+        async with self.transaction():
+            return await self.favorite_repository.delete_where(**filters) > 0
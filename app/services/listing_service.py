@@ -1,17 +1,35 @@
+from typing import Optional
 from app.repositories.listing_repository import ListingRepository
 from app.services.service import BaseService
 from app.models.listing import ListingModel
+from app.config import settings
+from app.utils.cache import make_cache
+from app.services.suggest_service import mark_suggestions_stale
 
 class ListingService(BaseService[ListingModel]):
+    cache = make_cache("listings", settings.CATALOG_CACHE_MAX_SIZE, settings.CATALOG_CACHE_TTL)
+    facet_fields = ("game_topic", "status")
+    price_field = "price"
+    price_buckets = settings.CATALOG_PRICE_BUCKETS
+    
     def __init__(self, listing_repository: ListingRepository):
         super().__init__(listing_repository)
         self.listing_repository = listing_repository
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
-        return self.listing_repository.get_by_user(user_id, skip, limit)
+    async def invalidate(self, id: Optional[int] = None) -> None:
+        await super().invalidate(id)
+        mark_suggestions_stale()
+    
+    async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
+        return await self.listing_repository.get_by_user(user_id, skip, limit)
     
-    def get_by_game_topic(self, game_topic: str, skip: int = 0, limit: int = 100):
-        return self.listing_repository.get_by_game_topic(game_topic, skip, limit)
+    async def get_by_game_topic(self, game_topic: str, skip: int = 0, limit: int = 100):
+        return await self.listing_repository.get_by_game_topic(game_topic, skip, limit)
     
-    def get_active_listings(self, skip: int = 0, limit: int = 100):
-        return self.listing_repository.filter_by(status="active")
\ No newline at end of file
+    async def get_active_listings(self, skip: int = 0, limit: int = 100, with_total: bool = False):
+        return await self._cached(
+            f"list:active:{skip}:{limit}:{with_total}",
+            lambda: self.listing_repository.filter_by(
+                skip=skip, limit=limit, order_by="id", with_total=with_total, status="active"
+            )
+        )
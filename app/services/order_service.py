@@ -1,17 +1,112 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm.attributes import set_committed_value
 from app.repositories.order_repository import OrderRepository
+from app.repositories.order_item_repository import OrderItemRepository
+from app.repositories.order_stats_repository import OrderStatsRepository
 from app.services.service import BaseService
 from app.models.orders import OrderModel
+from app.models.order_stats import OrderStatsModel
+from app.models.order_status import ORDER_QUEUE_NEXT_STATUS, OrderStatus, can_transition
+from app.exceptions.order_exceptions import OrderNotFoundException, OrderQueueException, OrderStatusException
 
 class OrderService(BaseService[OrderModel]):
-    def __init__(self, order_repository: OrderRepository):
+    def __init__(
+        self,
+        order_repository: OrderRepository,
+        order_item_repository: OrderItemRepository,
+        order_stats_repository: OrderStatsRepository
+    ):
         super().__init__(order_repository)
         self.order_repository = order_repository
+        self.order_item_repository = order_item_repository
+        self.order_stats_repository = order_stats_repository
     
-    def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100):
-        return self.order_repository.get_by_user(user_id, skip, limit)
+    # Сводка пользователя ведётся в той же транзакции, что и запись заказа
+    async def create(self, obj_in: Dict[str, Any]) -> OrderModel:
+        async with self.transaction():
+            order = await self.order_repository.create({**obj_in, "status": OrderStatus.PENDING})
+            await self.order_stats_repository.add_order(order.user_id, order.total_amount, order.creat_at)
+        await self.invalidate()
+        return order
     
-    def get_by_status(self, status: str, skip: int = 0, limit: int = 100):
-        return self.order_repository.get_by_status(status, skip, limit)
+    async def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[OrderModel]:
+        async with self.transaction():
+            order = await self.order_repository.get(id)
+            old_user_id = order.user_id if order else None
+            if order and obj_in.get("status") is not None:
+                self._check_transition(order, OrderStatus(obj_in["status"]))
+            order = await self.order_repository.update(id, obj_in)
+            cancelled = obj_in.get("status") == OrderStatus.CANCELLED
+            if order and ("total_amount" in obj_in or "user_id" in obj_in or cancelled):
+                for user_id in {old_user_id, order.user_id}:
+                    await self.order_stats_repository.refresh(user_id)
+        await self.invalidate(id)
+        return order
     
-    def update_status(self, order_id: int, status: str) -> OrderModel:
-        return self.order_repository.update(order_id, {"status": status})
\ No newline at end of file
+    async def delete(self, id: int) -> bool:
+        async with self.transaction():
+            order = await self.order_repository.get(id)
+            deleted = await self.order_repository.delete(id)
+            if deleted:
+                await self.order_stats_repository.refresh(order.user_id)
+        await self.invalidate(id)
+        return deleted
+    
+    async def get_stats(self, user_id: int) -> OrderStatsModel:
+        stats = await self.order_stats_repository.get_by_user(user_id)
+        if stats is None:
+            # Пользователь без заказов
+            stats = OrderStatsModel(user_id=user_id, order_count=0, total_spent=0, last_order_at=None)
+        return stats
+    
+    async def get_by_user(self, user_id: int, skip: int = 0, limit: int = 100, status: Optional[OrderStatus] = None):
+        return await self.order_repository.get_by_user(user_id, skip, limit, status)
+    
+    async def get_by_status(self, status: OrderStatus, skip: int = 0, limit: int = 100):
+        return await self.order_repository.get_by_status(status, skip, limit)
+    
+    def _check_transition(self, order: OrderModel, target: OrderStatus) -> None:
+        if target != order.status and not can_transition(order.status, target):
+            raise OrderStatusException(order.id, order.status.value, target.value)
+    
+    async def update_status(self, order_id: int, status: OrderStatus) -> OrderModel:
+        order = await self.order_repository.get(order_id)
+        if not order:
+            raise OrderNotFoundException(order_id)
+        if order.status == status:
+            return order
+        self._check_transition(order, status)
+        
+        async with self.transaction():
+            # Переход по прочитанному статусу: если заказ успели изменить, UPDATE не найдёт строку
+            updated = await self.order_repository.set_status(order_id, order.status, status)
+            if updated and status == OrderStatus.CANCELLED:
+                # Отменённый заказ уходит из сводки пользователя
+                await self.order_stats_repository.refresh(updated.user_id)
+        if updated is None:
+            raise OrderStatusException(order_id, order.status.value, status.value)
+        return updated
+    
+    async def claim(self, status: OrderStatus, limit: int) -> List[OrderModel]:
+        """Забрать пачку заказов из очереди статуса и перевести в следующий статус"""
+        target = ORDER_QUEUE_NEXT_STATUS.get(status)
+        if target is None:
+            raise OrderQueueException(status.value)
+        async with self.transaction():
+            return await self.order_repository.claim(status, target, limit)
+    
+    async def load_items(self, orders: List[OrderModel]) -> List[OrderModel]:
+        """Подгрузить позиции и товары для уже выбранных заказов.
+
+        Как selectinload, но для любой выборки заказов, в том числе страницы
+        по курсору: один запрос позиций на все заказы и по одному на таблицу каталога.
+        """
+        if not orders:
+            return orders
+        items_by_order = defaultdict(list)
+        for item in await self.order_item_repository.get_by_orders_with_catalog([order.id for order in orders]):
+            items_by_order[item.order_id].append(item)
+        for order in orders:
+            set_committed_value(order, "items", items_by_order[order.id])
+        return orders
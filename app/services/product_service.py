@@ -1,18 +1,43 @@
 # app/services/product_service.py
 
+from typing import List, Optional
 from app.repositories.product_repository import ProductRepository
 from app.services.service import BaseService
 from app.models.products import ProductModel
+from app.config import settings
+from app.utils.cache import make_cache
+from app.services.suggest_service import mark_suggestions_stale
 
 
 class ProductService(BaseService[ProductModel]):
+    cache = make_cache("products", settings.CATALOG_CACHE_MAX_SIZE, settings.CATALOG_CACHE_TTL)
+    facet_fields = ("category", "is_active")
+    price_field = "price"
+    price_buckets = settings.CATALOG_PRICE_BUCKETS
+    
     def __init__(self, product_repository: ProductRepository):
         super().__init__(product_repository)
         self.product_repository = product_repository
     
-    def get_by_category(self, category: str, skip: int = 0, limit: int = 100):
-        return self.product_repository.get_by_category(category, skip, limit)
+    async def invalidate(self, id: Optional[int] = None) -> None:
+        await super().invalidate(id)
+        mark_suggestions_stale()
+    
+    async def get_by_category(self, category: str, skip: int = 0, limit: int = 100):
+        return await self.product_repository.get_by_category(category, skip, limit)
     
-    def get_active_products(self, skip: int = 0, limit: int = 100):
+    async def get_active_products(self, skip: int = 0, limit: int = 100, with_total: bool = False):
         # ИСПРАВЛЕНО: is_acctive → is_active
-        return self.product_repository.filter_by(is_active=True)
\ No newline at end of file
+        return await self._cached(
+            f"list:active:{skip}:{limit}:{with_total}",
+            lambda: self.product_repository.filter_by(
+                skip=skip, limit=limit, order_by="id", with_total=with_total, is_active=True
+            )
+        )
+    
+    async def set_active(self, product_ids: List[int], is_active: bool) -> int:
+        async with self.transaction():
+            updated = await self.product_repository.update_where({"id": product_ids}, {"is_active": is_active})
+        for product_id in product_ids:
+            await self.invalidate(product_id)
+        return updated
@@ -2,12 +2,21 @@ from typing import Optional
 from app.repositories.role_repository import RoleRepository
 from app.services.service import BaseService
 from app.models.roles import RoleModel
+from app.config import settings
+from app.utils.cache import make_cache
 
 
 class RoleService(BaseService[RoleModel]):
+    cache = make_cache("roles", settings.LOOKUP_CACHE_MAX_SIZE, settings.LOOKUP_CACHE_TTL)
+    
     def __init__(self, role_repository: RoleRepository):
         super().__init__(role_repository)
         self.role_repository = role_repository
     
-    def get_by_name(self, name: str) -> Optional[RoleModel]:
-        return self.role_repository.get_by_name(name)
\ No newline at end of file
+    async def get_by_name(self, name: str) -> Optional[RoleModel]:
+        return await self._cached(f"name:{name}", lambda: self.role_repository.get_by_name(name))
+    
+    async def invalidate(self, id: Optional[int] = None) -> None:
+        await super().invalidate(id)
+        if self.cache is not None:
+            await self.cache.delete_prefix("name:")
@@ -0,0 +1,46 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+from app.repositories.search_repository import SearchRepository
+from app.exceptions.search_exceptions import SearchUnavailableException
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Запрос пользователя -> выражение MATCH: все слова, последнее как префикс.
+
+    Слова берутся в кавычки, поэтому операторы FTS5 (AND, NEAR, *, ")
+    из пользовательского ввода не интерпретируются.
+    """
+    words = _WORD.findall(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class SearchService:
+    def __init__(self, search_repository: SearchRepository):
+        self.search_repository = search_repository
+    
+    async def search(
+        self,
+        query: str,
+        item_type: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20,
+        with_total: bool = False
+    ) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], int]]:
+        """Поиск по названиям, описаниям и темам каталога с ранжированием bm25"""
+        if not self.search_repository.is_supported:
+            raise SearchUnavailableException()
+
+        match = build_match_query(query)
+        if match is None:
+            return ([], 0) if with_total else []
+
+        hits = await self.search_repository.search(match, item_type, skip, limit)
+        if with_total:
+            return hits, await self.search_repository.count(match, item_type)
+        return hits
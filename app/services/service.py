@@ -1,35 +1,176 @@
-from typing import Generic, TypeVar, List, Optional, Dict, Any
+from datetime import datetime
+from typing import Generic, TypeVar, List, Optional, Dict, Any, Tuple, Callable, Awaitable, NamedTuple
+from sqlalchemy import inspect
+from app.database.unit_of_work import UnitOfWork
 from app.repositories.repository import BaseRepository
+from app.utils.cache import CacheBackend
 
 ModelType = TypeVar("ModelType")
 
+
+class CachedValue(NamedTuple):
+    """Значение в кэше сервиса и версия таблицы, прочитанная до его загрузки"""
+    version: Optional[int]
+    value: Any
+
 class BaseService(Generic[ModelType]):
+    # Кэш чтения get/get_all, сервис включает его атрибутом класса: cache = make_cache(...)
+    cache: Optional[CacheBackend] = None
+    # Фасеты для browse(): поля со счётчиками по значениям и поле цены со счётчиками по диапазонам
+    facet_fields: Tuple[str, ...] = ()
+    price_field: Optional[str] = None
+    price_buckets: List[int] = []
+    # Колонки, которые не попадают в кэш (например, учётные данные): в копии из кэша они None
+    uncached_fields: Tuple[str, ...] = ()
+
     def __init__(self, repository: BaseRepository[ModelType]):
         self.repository = repository
+        # Версия таблицы, по которой этот запрос строит ETag (см. table_version)
+        self._table_version: Optional[int] = None
+
+    def transaction(self) -> UnitOfWork:
+        return UnitOfWork(self.repository.db)
+
+    def _snapshot(self, value: Any) -> Any:
+        """Копии строк без привязки к сессии: кэш переживает запрос, в котором их загрузили"""
+        if isinstance(value, list):
+            return [self._snapshot(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self._snapshot(item) for item in value)
+        state = inspect(value, raiseerr=False)
+        if state is None:
+            return value
+        return state.mapper.class_(**{
+            attr.key: getattr(value, attr.key)
+            for attr in state.mapper.column_attrs
+            if attr.key not in self.uncached_fields
+        })
+
+    async def _cached(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Значение из кэша или из loader.
+
+        Если запрос уже прочитал версию таблицы для ETag, запись кэша с другой
+        версией не используется: иначе под новым ETag ушло бы старое тело
+        (кэш другого воркера без канала инвалидации или чтение между коммитом
+        и invalidate), и клиент получал бы 304 на устаревшую копию.
+        """
+        if self.cache is None:
+            return await loader()
+        found, entry = await self.cache.get(key)
+        if found and isinstance(entry, CachedValue):
+            if self._table_version is None or entry.version == self._table_version:
+                return entry.value
+        value = await loader()
+        if value is not None:
+            await self.cache.set(key, CachedValue(self._table_version, self._snapshot(value)))
+        return value
+
+    async def invalidate(self, id: Optional[int] = None) -> None:
+        """Сбросить запись по id и все закэшированные страницы списков"""
+        if self.cache is None:
+            return
+        if id is not None:
+            await self.cache.delete(f"get:{id}")
+        await self.cache.delete_prefix("list:")
 
-    def get(self, id: int) -> Optional[ModelType]:
-        return self.repository.get(id)
+    async def table_version(self) -> Tuple[int, Optional[datetime]]:
+        """Версия таблицы; запоминается, чтобы данные этого запроса были не старше её"""
+        version, updated_at = await self.repository.table_version()
+        self._table_version = version
+        return version, updated_at
 
-    def get_all(
+    async def get(self, id: int) -> Optional[ModelType]:
+        return await self._cached(f"get:{id}", lambda: self.repository.get(id))
+
+    async def get_all(
         self, 
         skip: int = 0, 
         limit: int = 100,
         order_by: Optional[str] = None,
         order_direction: str = "asc"
     ) -> List[ModelType]:
-        return self.repository.get_all(skip, limit, order_by, order_direction)
+        return await self._cached(
+            f"list:all:{skip}:{limit}:{order_by}:{order_direction}",
+            lambda: self.repository.get_all(skip, limit, order_by, order_direction)
+        )
+
+    async def get_page(
+        self,
+        after: Optional[str] = None,
+        limit: int = 100,
+        order_by: str = "id",
+        order_direction: str = "asc",
+        **filters
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        return await self.repository.get_page(after, limit, order_by, order_direction, **filters)
+
+    async def create(self, obj_in: Dict[str, Any]) -> ModelType:
+        async with self.transaction():
+            db_obj = await self.repository.create(obj_in)
+        await self.invalidate()
+        return db_obj
+
+    async def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
+        async with self.transaction():
+            db_obj = await self.repository.update(id, obj_in)
+        await self.invalidate(id)
+        return db_obj
+
+    async def delete(self, id: int) -> bool:
+        async with self.transaction():
+            deleted = await self.repository.delete(id)
+        await self.invalidate(id)
+        return deleted
+
+    async def filter_by(self, **filters) -> List[ModelType]:
+        return await self.repository.filter_by(**filters)
+
+    async def get_one_by(self, **filters) -> Optional[ModelType]:
+        return await self.repository.get_one_by(**filters)
 
-    def create(self, obj_in: Dict[str, Any]) -> ModelType:
-        return self.repository.create(obj_in)
+    async def browse(
+        self,
+        filters: Dict[str, Any],
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[ModelType], int, Dict[str, List[Dict[str, Any]]]]:
+        """Страница по фильтрам, общее количество и счётчики фасетов.
 
-    def update(self, id: int, obj_in: Dict[str, Any]) -> Optional[ModelType]:
-        return self.repository.update(id, obj_in)
+        Счётчики поля считаются без фильтра по самому полю, чтобы в интерфейсе
+        было видно, сколько станет при выборе другого значения. Результат
+        кэшируется по набору фильтров и сбрасывается при записи, как и списки.
+        """
+        key = "list:facets:" + ":".join(
+            f"{field}={sorted(value) if isinstance(value, list) else value}"
+            for field, value in sorted(filters.items())
+        ) + f":{min_price}:{max_price}:{skip}:{limit}"
+        return await self._cached(key, lambda: self._browse(filters, min_price, max_price, skip, limit))
 
-    def delete(self, id: int) -> bool:
-        return self.repository.delete(id)
+    async def _browse(self, filters, min_price, max_price, skip, limit):
+        price_range = {self.price_field: (min_price, max_price)} if self.price_field else {}
+        conditions = self.repository.facet_conditions(filters, price_range)
+        items, total = await self.repository.find(conditions, skip, limit)
 
-    def filter_by(self, **filters) -> List[ModelType]:
-        return self.repository.filter_by(**filters)
+        facets: Dict[str, List[Dict[str, Any]]] = {}
+        for field in self.facet_fields:
+            others = {name: value for name, value in filters.items() if name != field}
+            counts = await self.repository.count_by(field, self.repository.facet_conditions(others, price_range))
+            facets[field] = [{"value": value, "count": count} for value, count in counts]
 
-    def get_one_by(self, **filters) -> Optional[ModelType]:
-        return self.repository.get_one_by(**filters)
\ No newline at end of file
+        if self.price_field:
+            counts = await self.repository.count_by_ranges(
+                self.price_field, self.price_buckets, self.repository.facet_conditions(filters)
+            )
+            bounds = [None, *self.price_buckets, None]
+            facets["price"] = [
+                {
+                    "value": f"{low or 0}-{high}" if high is not None else f"{low}+",
+                    "min": low,
+                    "max": high,
+                    "count": count,
+                }
+                for low, high, count in zip(bounds, bounds[1:], counts)
+            ]
+        return items, total, facets
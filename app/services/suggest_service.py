@@ -0,0 +1,98 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from app.config import settings
+from app.database.search_index import SEARCH_SOURCES
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.repositories.search_repository import SUGGEST_SOURCES, SearchRepository
+from app.utils.suggest_index import suggest_index
+
+# Имя таблицы в change_log -> тип позиции каталога
+_TABLE_TYPES = {table: item_type for item_type, (_, table, *_) in SEARCH_SOURCES.items()}
+
+
+class _SyncState:
+    """Позиция индекса подсказок в change_log, общая для процесса"""
+
+    def __init__(self):
+        self.loaded = False
+        self.last_change_id = 0
+        self.next_sync = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def due(self) -> bool:
+        return not self.loaded or time.monotonic() >= self.next_sync
+
+
+_state = _SyncState()
+
+
+def mark_suggestions_stale() -> None:
+    """Вызывается сервисами каталога после записи: следующий запрос подсказок сразу догонит change_log"""
+    _state.next_sync = 0.0
+
+
+class SuggestService:
+    SYNC_BATCH = 1000
+
+    def __init__(self, search_repository: SearchRepository, change_log_repository: ChangeLogRepository):
+        self.search_repository = search_repository
+        self.change_log_repository = change_log_repository
+    
+    async def suggest(self, query: str, limit: int = 10, item_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        await self.sync()
+        return suggest_index.suggest(query, limit, item_type)
+    
+    async def rebuild(self) -> int:
+        """Построить индекс по активным позициям каталога, вернуть их количество"""
+        async with _state.lock:
+            return await self._rebuild()
+    
+    async def _rebuild(self) -> int:
+        # Позиция журнала читается до данных: изменения между ними применятся повторно, а не потеряются
+        last_change_id = await self.change_log_repository.get_last_id()
+        items = []
+        for item_type in SUGGEST_SOURCES:
+            items += await self.search_repository.get_suggest_items(item_type)
+        suggest_index.load(items)
+        _state.loaded = True
+        _state.last_change_id = last_change_id
+        _state.next_sync = time.monotonic() + settings.SUGGEST_SYNC_INTERVAL
+        return len(items)
+    
+    async def sync(self) -> None:
+        """Применить к индексу изменения каталога из change_log, не чаще SUGGEST_SYNC_INTERVAL"""
+        if not _state.due():
+            return
+        async with _state.lock:
+            if not _state.loaded:
+                await self._rebuild()
+                return
+            if not _state.due():
+                return
+            _state.next_sync = time.monotonic() + settings.SUGGEST_SYNC_INTERVAL
+            while True:
+                changes = await self.change_log_repository.get_since(_state.last_change_id, self.SYNC_BATCH)
+                if not changes:
+                    break
+                touched = defaultdict(set)
+                for change in changes:
+                    if change.table_name in _TABLE_TYPES:
+                        touched[_TABLE_TYPES[change.table_name]].add(change.row_id)
+                for item_type, ids in touched.items():
+                    # Перечитываем строки: неактивные и удалённые из индекса убираются
+                    items = await self.search_repository.get_suggest_items(item_type, ids)
+                    for _, item_id, title, topic in items:
+                        suggest_index.put(item_type, item_id, title, topic)
+                    for item_id in ids - {item[1] for item in items}:
+                        suggest_index.remove(item_type, item_id)
+                _state.last_change_id = changes[-1].id
+                if len(changes) < self.SYNC_BATCH:
+                    break
@@ -1,70 +1,123 @@
 from typing import Optional
-from passlib.context import CryptContext
 from app.repositories.user_repository import UserRepository
+from app.repositories.cart_repository import CartRepository
+from app.repositories.cart_item_repository import CartItemRepository
+from app.repositories.favorite_repository import FavoriteRepository
+from app.repositories.order_stats_repository import OrderStatsRepository
 from app.services.service import BaseService
 from app.models.users import UserModel
 from app.schemas.user_schema import UserCreate
+from app.utils.password_hasher import password_hasher
+from app.config import settings
+from app.utils.cache import make_cache
 from app.exceptions.user_exceptions import (
     UserNotFoundException,
     UserAlreadyExistsException,
+    UserHasRecordsException,
     InvalidCredentialsException
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 class UserService(BaseService[UserModel]):
-    def __init__(self, user_repository: UserRepository):
+    cache = make_cache("users", settings.LOOKUP_CACHE_MAX_SIZE, settings.LOOKUP_CACHE_TTL)
+    # Кэш бывает общим (sqlite, redis): хеш пароля туда не пишем, вход читает его из БД
+    uncached_fields = ("hashed_password",)
+    
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        cart_repository: CartRepository,
+        cart_item_repository: CartItemRepository,
+        favorite_repository: FavoriteRepository,
+        order_stats_repository: OrderStatsRepository
+    ):
         super().__init__(user_repository)
         self.user_repository = user_repository
+        self.cart_repository = cart_repository
+        self.cart_item_repository = cart_item_repository
+        self.favorite_repository = favorite_repository
+        self.order_stats_repository = order_stats_repository
     
-    def get(self, id: int) -> Optional[UserModel]:
-        user = super().get(id)
+    async def get(self, id: int) -> Optional[UserModel]:
+        user = await super().get(id)
         if not user:
             raise UserNotFoundException(user_id=id)
         return user
     
-    def get_by_email(self, email: str) -> Optional[UserModel]:
-        return self.user_repository.get_by_email(email)
+    async def get_by_email(self, email: str) -> Optional[UserModel]:
+        return await self._cached(f"email:{email}", lambda: self.user_repository.get_by_email(email))
     
-    def create_user(self, user_data: UserCreate) -> UserModel:
-        existing_user = self.get_by_email(user_data.email)
+    async def invalidate(self, id: Optional[int] = None) -> None:
+        await super().invalidate(id)
+        if self.cache is not None:
+            await self.cache.delete_prefix("email:")
+    
+    async def create_user(self, user_data: UserCreate) -> UserModel:
+        existing_user = await self.get_by_email(user_data.email)
         if existing_user:
             raise UserAlreadyExistsException(email=user_data.email)
         
         
-        hashed_password = pwd_context.hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         user_dict = user_data.dict(exclude={"password"})
         user_dict["hashed_password"] = hashed_password
         
-        return self.user_repository.create(user_dict)
+        async with self.transaction():
+            user = await self.user_repository.create(user_dict)
+        await self.invalidate()
+        return user
     
-    def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
-        user = self.get_by_email(email)
+    async def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
+        # Мимо кэша: хеш из кэша может пережить смену пароля на другом воркере
+        user = await self.user_repository.get_by_email_with_role(email)
         if not user:
             raise InvalidCredentialsException()
         
-        if not pwd_context.verify(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             raise InvalidCredentialsException()
         
         return user
     
-    def update_user(self, user_id: int, update_data: dict) -> Optional[UserModel]:
+    async def update_user(self, user_id: int, update_data: dict) -> Optional[UserModel]:
         # Проверяем существование пользователя
-        self.get(user_id)
+        await self.get(user_id)
         
         # Проверяем, не используется ли email другим пользователем
         if "email" in update_data:
-            existing_user = self.get_by_email(update_data["email"])
+            existing_user = await self.get_by_email(update_data["email"])
             if existing_user and existing_user.id != user_id:
                 raise UserAlreadyExistsException(email=update_data["email"])
         
         # Хешируем пароль, если он предоставлен
         if "password" in update_data:
-            update_data["hashed_password"] = pwd_context.hash(update_data.pop("password"))
+            update_data["hashed_password"] = await password_hasher.hash(update_data.pop("password"))
         
-        return self.user_repository.update(user_id, update_data)
+        async with self.transaction():
+            user = await self.user_repository.update(user_id, update_data)
+        await self.invalidate(user_id)
+        return user
     
-    def delete(self, id: int) -> bool:
+    async def delete(self, id: int) -> bool:
+        """Удалить пользователя вместе с корзиной, избранным и сводкой заказов.
+
+        Заказы, публикации, отзывы и сообщения не удаляются: пока они есть,
+        удаление отклоняется с 409. Внешние ключи SQLite не проверяет, а id
+        удалённого пользователя получит следующий зарегистрированный, поэтому
+        ни одной строки со ссылкой на удалённого пользователя остаться не должно.
+        """
         # Проверяем существование пользователя
-        self.get(id)
-        return super().delete(id)
\ No newline at end of file
+        await self.get(id)
+        
+        async with self.transaction():
+            owned = await self.user_repository.get_owned_tables(id)
+            if owned:
+                raise UserHasRecordsException(id, owned)
+            
+            cart_ids = [cart.id for cart in await self.cart_repository.filter_by(user_id=id)]
+            if cart_ids:
+                await self.cart_item_repository.delete_where(cart_id=cart_ids)
+                await self.cart_repository.delete_where(user_id=id)
+            await self.favorite_repository.delete_where(user_id=id)
+            await self.order_stats_repository.delete_where(user_id=id)
+            deleted = await self.user_repository.delete(id)
+        await self.invalidate(id)
+        return deleted
\ No newline at end of file
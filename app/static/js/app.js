@@ -10,6 +10,7 @@ const AppState = {
   currentCategory: 'all',
   currentSort: 'popular',
   searchQuery: '',
+  searchResults: null,
   isLoading: false
 };
 
@@ -1020,7 +1021,7 @@ function updateCategoryCounts() {
 }
 
 function getFilteredProductsCount() {
-  let filteredProducts = AppState.products;
+  let filteredProducts = AppState.searchResults || AppState.products;
   
   if (AppState.currentCategory !== 'all') {
     filteredProducts = filteredProducts.filter(product => {
@@ -1030,7 +1031,7 @@ function getFilteredProductsCount() {
     });
   }
   
-  if (AppState.searchQuery) {
+  if (AppState.searchQuery && !AppState.searchResults) {
     const query = AppState.searchQuery.toLowerCase();
     filteredProducts = filteredProducts.filter(product =>
       (product.title || '').toLowerCase().includes(query) ||
@@ -1076,7 +1077,7 @@ function renderProducts() {
     return;
   }
   
-  let filteredProducts = AppState.products;
+  let filteredProducts = AppState.searchResults || AppState.products;
   
   if (AppState.currentCategory !== 'all') {
     filteredProducts = filteredProducts.filter(product => {
@@ -1088,7 +1089,7 @@ function renderProducts() {
     });
   }
   
-  if (AppState.searchQuery) {
+  if (AppState.searchQuery && !AppState.searchResults) {
     const query = AppState.searchQuery.toLowerCase();
     filteredProducts = filteredProducts.filter(product =>
       (product.title || '').toLowerCase().includes(query) ||
@@ -1574,14 +1575,38 @@ function setupListingForms() {
   }
 }
 
+// Поиск идёт на сервере (/search), а не по загруженным 100 товарам.
+// null — поиска нет или сервер недоступен, тогда фильтруем локально.
+async function searchProducts(query) {
+  if (!query.trim()) return null;
+  try {
+    const response = await fetch(`${API_BASE_URL}/search/?q=${encodeURIComponent(query)}&type=product&limit=100`);
+    if (!response.ok) return null;
+    const hits = await response.json();
+    return hits.map(hit => AppState.products.find(product => product.id === hit.id) || {
+      id: hit.id,
+      title: hit.title,
+      price: Number(hit.price),
+      category: hit.topic || '',
+      image_url: hit.image_url,
+      description: '',
+      popularity: 0
+    });
+  } catch (error) {
+    console.error('Ошибка поиска:', error);
+    return null;
+  }
+}
+
 function setupEventListeners() {
   const searchInput = document.getElementById('search');
   if (searchInput) {
     let searchTimeout;
     searchInput.addEventListener('input', (e) => {
       clearTimeout(searchTimeout);
-      searchTimeout = setTimeout(() => {
+      searchTimeout = setTimeout(async () => {
         AppState.searchQuery = e.target.value;
+        AppState.searchResults = await searchProducts(AppState.searchQuery);
         renderProducts();
       }, 300);
     });
@@ -1798,6 +1823,7 @@ function setupPaymentListeners() {
 function resetFilters() {
   AppState.currentCategory = 'all';
   AppState.searchQuery = '';
+  AppState.searchResults = null;
   AppState.currentSort = 'popular';
   
   const searchInput = document.getElementById('search');
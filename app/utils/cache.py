@@ -0,0 +1,371 @@
+import asyncio
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.utils.cache_invalidation import InvalidationChannel, get_invalidation_channel
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis нужен только для CACHE_BACKEND=redis
+    aioredis = None
+
+# Все созданные кэши, для метрик в /health и применения чужих инвалидаций
+caches: Dict[str, "CacheBackend"] = {}
+
+
+class CacheBackend:
+    """Именованный кэш: get/set/delete по строковым ключам и сброс по префиксу.
+
+    Ключи — строки вида "get:5" или "list:...", по префиксу сбрасываются,
+    например, все кэшированные страницы списка. Счётчики ведутся в процессе.
+    Методы асинхронные: файл SQLite и сеть до Redis не должны держать цикл событий.
+    """
+
+    kind = "base"
+
+    def __init__(self, name: str, max_size: int = 1024, ttl: float = 60.0):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        caches[name] = self
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        """(найдено, значение); значение None тоже считается найденным"""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Атомарно записать, только если живой записи по ключу нет; True — записал этот вызов"""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def delete_prefix(self, prefix: str) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        await self.delete_prefix("")
+
+    async def size(self) -> Optional[int]:
+        return None
+
+    async def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.kind,
+            "size": await self.size(),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class MemoryCache(CacheBackend):
+    """LRU-кэш в памяти процесса с ограничением размера и временем жизни записей.
+
+    При переполнении вытесняется давно не читавшаяся запись, просроченная
+    запись удаляется при чтении. Если задан канал инвалидации, удаления
+    рассылаются остальным воркерам, а их удаления применяются перед чтением.
+    """
+
+    kind = "memory"
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        channel: Optional[InvalidationChannel] = None
+    ):
+        super().__init__(name, max_size, ttl)
+        self.channel = channel
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        if self.channel is not None:
+            await apply_remote_invalidations(self.channel)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._put(key, value, expires_at)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._put(key, value, now + (self.ttl if ttl is None else ttl))
+            return True
+
+    def _put(self, key: str, value: Any, expires_at: float) -> None:
+        # Вызывается под self._lock
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self.drop(key)
+        if self.channel is not None:
+            await self.channel.publish(self.name, key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        self.drop(prefix, is_prefix=True)
+        if self.channel is not None:
+            await self.channel.publish(self.name, prefix, is_prefix=True)
+
+    def drop(self, key: str, is_prefix: bool = False) -> None:
+        """Удалить записи только в этом процессе, без рассылки"""
+        with self._lock:
+            keys = [k for k in self._data if k.startswith(key)] if is_prefix else [key]
+            for k in keys:
+                if self._data.pop(k, None) is not None:
+                    self.invalidations += 1
+
+    async def size(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache(CacheBackend):
+    """Общий для воркеров кэш в файле SQLite.
+
+    Значения хранятся в pickle, срок жизни — по времени на стене, поэтому
+    одинаков для всех процессов. При переполнении вытесняются записи
+    с ближайшим сроком истечения. Запросы к файлу идут в потоке (asyncio.to_thread).
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, name: str, path: str, max_size: int = 1024, ttl: float = 60.0):
+        super().__init__(name, max_size, ttl)
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Соединение открывается лениво, уже в процессе воркера
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " cache TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL, PRIMARY KEY (cache, key))"
+            )
+            self._conn = conn
+        return self._conn
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return await asyncio.to_thread(self._add, key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await asyncio.to_thread(self._delete_prefix, prefix)
+
+    async def size(self) -> int:
+        return await asyncio.to_thread(self._size)
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE cache = ? AND key = ?",
+                (self.name, key)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            if row[1] <= time.time():
+                self._connection().execute(
+                    "DELETE FROM cache_entries WHERE cache = ? AND key = ?", (self.name, key)
+                )
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, pickle.loads(row[0])
+
+    def _set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (cache, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.name, key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at)
+            )
+            self._evict_overflow(conn)
+
+    def _add(self, key: str, value: Any, ttl: Optional[float]) -> bool:
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            conn = self._connection()
+            # Просроченная запись не должна мешать вставке
+            cursor = conn.execute(
+                "DELETE FROM cache_entries WHERE cache = ? AND key = ? AND expires_at <= ?",
+                (self.name, key, now)
+            )
+            self.expirations += cursor.rowcount
+            # Из параллельных вставок, в том числе из других процессов, первичный ключ пропустит одну
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO cache_entries (cache, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.name, key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires_at)
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._evict_overflow(conn)
+            return True
+
+    def _evict_overflow(self, conn: sqlite3.Connection) -> None:
+        overflow = conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE cache = ?", (self.name,)
+        ).fetchone()[0] - self.max_size
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE rowid IN ("
+                " SELECT rowid FROM cache_entries WHERE cache = ? ORDER BY expires_at LIMIT ?)",
+                (self.name, overflow)
+            )
+            self.evictions += overflow
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM cache_entries WHERE cache = ? AND key = ?", (self.name, key)
+            )
+            self.invalidations += cursor.rowcount
+
+    def _delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM cache_entries WHERE cache = ? AND substr(key, 1, ?) = ?",
+                (self.name, len(prefix), prefix)
+            )
+            self.invalidations += cursor.rowcount
+
+    def _size(self) -> int:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE cache = ?", (self.name,)
+            ).fetchone()[0]
+
+
+class RedisCache(CacheBackend):
+    """Общий кэш в Redis (или совместимом сервере по протоколу Redis).
+
+    Срок жизни задаётся через PX, вытеснение при нехватке памяти — политикой
+    maxmemory самого сервера, поэтому max_size здесь не применяется.
+    Клиент асинхронный (redis.asyncio).
+    """
+
+    kind = "redis"
+
+    def __init__(self, name: str, url: str, max_size: int = 1024, ttl: float = 60.0):
+        if aioredis is None:
+            raise RuntimeError("CACHE_BACKEND=redis требует установленного пакета redis")
+        super().__init__(name, max_size, ttl)
+        self.url = url
+        self._client = None
+
+    def _redis(self):
+        if self._client is None:
+            self._client = aioredis.Redis.from_url(self.url)
+        return self._client
+
+    def _key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    def _ttl_ms(self, ttl: Optional[float]) -> int:
+        return int((self.ttl if ttl is None else ttl) * 1000)
+
+    async def get(self, key: str) -> Tuple[bool, Any]:
+        raw = await self._redis().get(self._key(key))
+        if raw is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, pickle.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await self._redis().set(
+            self._key(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=self._ttl_ms(ttl)
+        )
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return bool(await self._redis().set(
+            self._key(key), pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=self._ttl_ms(ttl), nx=True
+        ))
+
+    async def delete(self, key: str) -> None:
+        self.invalidations += await self._redis().delete(self._key(key))
+
+    async def delete_prefix(self, prefix: str) -> None:
+        keys = [key async for key in self._redis().scan_iter(match=self._key(prefix) + "*", count=500)]
+        if keys:
+            self.invalidations += await self._redis().delete(*keys)
+
+    async def size(self) -> int:
+        return len([key async for key in self._redis().scan_iter(match=self._key("*"), count=500)])
+
+
+async def apply_remote_invalidations(channel: InvalidationChannel) -> None:
+    """Применить удаления, сделанные другими воркерами, к кэшам этого процесса"""
+    for cache_name, key, is_prefix in await channel.poll():
+        cache = caches.get(cache_name)
+        if isinstance(cache, MemoryCache):
+            cache.drop(key, is_prefix)
+
+
+def make_cache(name: str, max_size: int, ttl: float) -> CacheBackend:
+    """Кэш с бэкендом из настроек CACHE_BACKEND: memory, sqlite или redis"""
+    backend = settings.CACHE_BACKEND.lower()
+    if backend == "sqlite":
+        return SQLiteCache(name, settings.CACHE_URL or "./cache.db", max_size, ttl)
+    if backend == "redis":
+        return RedisCache(name, settings.CACHE_URL or "redis://localhost:6379/0", max_size, ttl)
+    return MemoryCache(name, max_size, ttl, channel=get_invalidation_channel())
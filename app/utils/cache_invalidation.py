@@ -0,0 +1,173 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from app.config import settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis нужен только для канала redis://
+    aioredis = None
+
+# (имя кэша, ключ или префикс, это префикс)
+Invalidation = Tuple[str, str, bool]
+
+
+class InvalidationChannel:
+    """Канал, через который воркеры сообщают друг другу об удалённых ключах.
+
+    Нужен кэшу в памяти процесса: при нескольких воркерах uvicorn каждый
+    держит свою копию, и запись, изменённая в одном воркере, должна пропасть
+    и в остальных. Свои сообщения воркер отличает по origin и пропускает.
+    """
+
+    def __init__(self, poll_interval: float = 0.5):
+        self.poll_interval = poll_interval
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+        self._origin = None
+        self._origin_pid = None
+
+    @property
+    def origin(self) -> str:
+        # Свой идентификатор у каждого процесса, в том числе после fork
+        if self._origin_pid != os.getpid():
+            self._origin = uuid.uuid4().hex
+            self._origin_pid = os.getpid()
+        return self._origin
+
+    async def publish(self, cache_name: str, key: str, is_prefix: bool = False) -> None:
+        raise NotImplementedError
+
+    async def poll(self) -> List[Invalidation]:
+        """Чужие инвалидации с прошлого опроса; опрашивает не чаще poll_interval"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_poll < self.poll_interval:
+                return []
+            self._last_poll = now
+        return await self._receive()
+
+    async def _receive(self) -> List[Invalidation]:
+        raise NotImplementedError
+
+
+class SQLiteInvalidationChannel(InvalidationChannel):
+    """Журнал инвалидаций в общем файле SQLite, воркеры читают его по id.
+
+    Запросы к файлу идут в потоке (asyncio.to_thread), не в цикле событий.
+    """
+
+    RETENTION_SECONDS = 3600
+
+    def __init__(self, path: str, poll_interval: float = 0.5):
+        super().__init__(poll_interval)
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_id = 0
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # После fork у воркера своё соединение
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_invalidations ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL, cache TEXT NOT NULL,"
+                " key TEXT NOT NULL, is_prefix INTEGER NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM cache_invalidations").fetchone()[0]
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    async def publish(self, cache_name: str, key: str, is_prefix: bool = False) -> None:
+        await asyncio.to_thread(self._publish, cache_name, key, is_prefix)
+
+    async def _receive(self) -> List[Invalidation]:
+        return await asyncio.to_thread(self._read)
+
+    def _publish(self, cache_name: str, key: str, is_prefix: bool) -> None:
+        with self._lock:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                "INSERT INTO cache_invalidations (origin, cache, key, is_prefix, created_at) VALUES (?, ?, ?, ?, ?)",
+                (self.origin, cache_name, key, int(is_prefix), now)
+            )
+            conn.execute(
+                "DELETE FROM cache_invalidations WHERE created_at < ?", (now - self.RETENTION_SECONDS,)
+            )
+
+    def _read(self) -> List[Invalidation]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT id, origin, cache, key, is_prefix FROM cache_invalidations WHERE id > ? ORDER BY id",
+                (self._last_id,)
+            ).fetchall()
+            if rows:
+                self._last_id = rows[-1][0]
+        return [(cache, key, bool(is_prefix)) for _, origin, cache, key, is_prefix in rows if origin != self.origin]
+
+
+class RedisInvalidationChannel(InvalidationChannel):
+    """Инвалидации через Redis pub/sub, клиент асинхронный (redis.asyncio)"""
+
+    CHANNEL = "cache-invalidation"
+
+    def __init__(self, url: str, poll_interval: float = 0.5):
+        if aioredis is None:
+            raise RuntimeError("Канал инвалидации redis:// требует установленного пакета redis")
+        super().__init__(poll_interval)
+        self.url = url
+        self._client = None
+        self._pubsub = None
+
+    async def _redis(self):
+        if self._client is None:
+            client = aioredis.Redis.from_url(self.url)
+            pubsub = client.pubsub()
+            await pubsub.subscribe(self.CHANNEL)
+            self._client, self._pubsub = client, pubsub
+        return self._client
+
+    async def publish(self, cache_name: str, key: str, is_prefix: bool = False) -> None:
+        message = {"origin": self.origin, "cache": cache_name, "key": key, "is_prefix": is_prefix}
+        await (await self._redis()).publish(self.CHANNEL, json.dumps(message))
+
+    async def _receive(self) -> List[Invalidation]:
+        await self._redis()
+        events = []
+        while True:
+            message = await self._pubsub.get_message(timeout=0)
+            if message is None:
+                break
+            # Подтверждения подписки пропускаем здесь: с ignore_subscribe_messages
+            # get_message вернул бы на них None, и цикл закончился бы раньше времени
+            if message["type"] != "message":
+                continue
+            data = json.loads(message["data"])
+            if data["origin"] != self.origin:
+                events.append((data["cache"], data["key"], data["is_prefix"]))
+        return events
+
+
+_channel: Optional[InvalidationChannel] = None
+
+
+def get_invalidation_channel() -> Optional[InvalidationChannel]:
+    """Канал из CACHE_INVALIDATION_URL: redis://... или путь к файлу SQLite; None — без канала"""
+    global _channel
+    url = settings.CACHE_INVALIDATION_URL
+    if _channel is None and url:
+        if url.startswith(("redis://", "rediss://", "unix://")):
+            _channel = RedisInvalidationChannel(url, settings.CACHE_INVALIDATION_POLL_INTERVAL)
+        else:
+            _channel = SQLiteInvalidationChannel(url, settings.CACHE_INVALIDATION_POLL_INTERVAL)
+    return _channel
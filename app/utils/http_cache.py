@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+from app.config import settings
+
+ETAG_HEADER = "ETag"
+
+# Каталог общий для всех, избранное — только для своего браузера; оба проверяются по ETag
+CATALOG_CACHE_CONTROL = f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate"
+PRIVATE_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+
+def make_etag(*parts: Any) -> str:
+    """Слабый ETag из версии таблицы и параметров запроса"""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # Сравнение слабое: W/"x" и "x" считаются одним тегом
+    return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # Last-Modified передаётся с точностью до секунды
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """Проставить ETag, Last-Modified и Cache-Control; вернуть 304, если у клиента актуальная копия"""
+    headers = {ETAG_HEADER: etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        # Время в БД хранится в UTC без зоны
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    # If-Modified-Since учитывается, только если клиент не прислал If-None-Match (RFC 9110)
+    if_none_match = request.headers.get("If-None-Match")
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_none_match:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        fresh = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+    if fresh:
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    service,
+    cache_control: str = CATALOG_CACHE_CONTROL
+) -> Optional[Response]:
+    """Условный GET по счётчику изменений таблицы сервиса.
+
+    Версия читается до данных: если запись произойдёт между ними, клиент
+    получит более новые данные со старым ETag и просто перезапросит их позже.
+    Кэш сервиса после этого отдаёт только записи, загруженные при той же версии.
+    """
+    version, updated_at = await service.table_version()
+    etag = make_etag(service.repository.model.__tablename__, version, request.url.path, request.url.query)
+    return not_modified(request, response, etag, cache_control, updated_at)
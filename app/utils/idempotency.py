@@ -0,0 +1,145 @@
+import hashlib
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.exceptions.base_exceptions import handle_api_exception
+from app.exceptions.idempotency_exceptions import (
+    IdempotencyKeyInUseException,
+    IdempotencyKeyMismatchException,
+    InvalidIdempotencyKeyException,
+)
+from app.exceptions.user_exceptions import InvalidTokenException
+from app.utils.cache import CacheBackend, make_cache
+from app.utils.security import decode_access_token
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Сколько держится отметка «выполняется», если воркер упал, не дописав ответ
+IN_FLIGHT_TTL = 60.0
+
+# (отпечаток тела, статус, заголовки, тело); статус None — запрос ещё выполняется
+StoredResponse = Tuple[str, Optional[int], Optional[List[Tuple[bytes, bytes]]], Optional[bytes]]
+
+idempotency_store = make_cache("idempotency", settings.IDEMPOTENCY_MAX_SIZE, settings.IDEMPOTENCY_TTL)
+
+
+class IdempotencyMiddleware:
+    """Повтор POST с тем же Idempotency-Key получает сохранённый ответ первого запроса.
+
+    Ключ действует в пределах пользователя и маршрута. Пользователь берётся
+    из проверенного токена, в режиме AUTH_ALLOW_LEGACY_USER_ID — из X-User-Id.
+    Запрос без пользователя проходит без идемпотентности: иначе все анонимные
+    клиенты делили бы одно пространство ключей. Повтор с другим телом — 422, повтор, пока первый запрос ещё
+    выполняется, — 409. Ответы 5xx не сохраняются: такой запрос можно повторить.
+    С CACHE_BACKEND=memory ключи видны только своему воркеру, sqlite и redis
+    общие для всех.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Iterable[Tuple[str, str]], store: Optional[CacheBackend] = None):
+        self.app = app
+        self.routes = frozenset(routes)
+        self.store = store if store is not None else idempotency_store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await handle_api_exception(InvalidIdempotencyKeyException(MAX_KEY_LENGTH))(scope, receive, send)
+            return
+        caller = _caller(headers)
+        if caller is None:
+            await self.app(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        store_key = hashlib.sha256(
+            "\n".join((scope["method"], scope["path"], caller, key)).encode()
+        ).hexdigest()
+
+        # Ключ захватывается атомарно: из параллельных запросов с одним ключом выполняется один
+        if not await self.store.add(store_key, (fingerprint, None, None, None), ttl=IN_FLIGHT_TTL):
+            found, stored = await self.store.get(store_key)
+            if not found:
+                # Первый запрос завершился 5xx и освободил ключ между add и get
+                error = IdempotencyKeyInUseException()
+            else:
+                stored_fingerprint, status, stored_headers, stored_body = stored
+                if stored_fingerprint != fingerprint:
+                    error = IdempotencyKeyMismatchException()
+                elif status is None:
+                    error = IdempotencyKeyInUseException()
+                else:
+                    await _replay(send, status, stored_headers, stored_body)
+                    return
+            await handle_api_exception(error)(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def replay_receive() -> Message:
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def capture_send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await self.store.delete(store_key)
+            raise
+
+        if start is not None and start["status"] < 500:
+            await self.store.set(store_key, (fingerprint, start["status"], list(start.get("headers", [])), b"".join(chunks)))
+        else:
+            await self.store.delete(store_key)
+
+
+def _caller(headers: Headers) -> Optional[str]:
+    """id пользователя как в get_caller_id; None — пользователь не представился"""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            return str(decode_access_token(token).user_id)
+        except InvalidTokenException:
+            # Маршрут сам ответит 401
+            return None
+    user_id = headers.get("x-user-id", "")
+    if settings.AUTH_ALLOW_LEGACY_USER_ID and user_id.isdigit():
+        return str(int(user_id))
+    return None
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _replay(send: Send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [*headers, (IDEMPOTENT_REPLAYED_HEADER.lower().encode(), b"true")],
+    })
+    await send({"type": "http.response.body", "body": body, "more_body": False})
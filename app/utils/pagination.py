@@ -0,0 +1,15 @@
+from typing import Optional
+from fastapi import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Курсор следующей страницы отдаётся заголовком, тело ответа остаётся списком"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def set_total_count(response: Response, total: int) -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
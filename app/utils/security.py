@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import jwt
+
+from app.config import settings
+from app.exceptions.user_exceptions import InvalidTokenException
+from app.schemas.user_schema import TokenPayload
+
+ADMIN_ROLE_NAME = "admin"
+
+
+def is_admin_role(role_name: Optional[str]) -> bool:
+    """Админ определяется по имени роли: id ролей зависит от порядка, в котором их создали"""
+    return (role_name or "").lower() == ADMIN_ROLE_NAME
+
+
+def create_access_token(user_id: int, role_id: int, is_admin: bool = False) -> str:
+    """Подписанный токен с id и ролью пользователя"""
+    now = datetime.now(timezone.utc)
+    payload = {
+        "sub": str(user_id),
+        "role_id": role_id,
+        "is_admin": is_admin,
+        "iat": now,
+        "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    }
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_access_token(token: str) -> TokenPayload:
+    """Проверка подписи и срока действия токена без обращения к БД"""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        return TokenPayload(
+            user_id=int(payload["sub"]),
+            role_id=int(payload["role_id"]),
+            is_admin=payload.get("is_admin") is True
+        )
+    except jwt.ExpiredSignatureError:
+        raise InvalidTokenException(detail="Срок действия токена истёк")
+    except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+        raise InvalidTokenException()
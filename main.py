@@ -4,7 +4,8 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 import uvicorn
-from app.database.database import engine, Base, create_tables
+from app.config import DEV_SECRET_KEY, settings
+from app.database.database import engine, async_engine, async_session_maker, Base, create_tables
 from app.router import (
     role_router,
     user_router,
@@ -16,9 +17,20 @@ from app.router import (
     favorite_router,
     review_router,
     chat_message_router,
-    admin_router
+    admin_router,
+    change_router,
+    search_router,
+    catalog_router
 )
 from app.exceptions.handler import setup_exception_handlers
+from app.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.utils.http_cache import ETAG_HEADER
+from app.utils.idempotency import IdempotencyMiddleware, IDEMPOTENT_REPLAYED_HEADER
+from app.utils.password_hasher import password_hasher
+from app.utils.cache import caches
+from app.services.suggest_service import SuggestService
+from app.repositories.search_repository import SearchRepository
+from app.repositories.change_log_repository import ChangeLogRepository
 import logging
 import os
 from dotenv import load_dotenv
@@ -46,6 +58,11 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("🚀 Starting E-Commerce API...")
     
+    if settings.SECRET_KEY == DEV_SECRET_KEY:
+        if not settings.API_DEBUG:
+            raise RuntimeError("SECRET_KEY не задан: токены подписывались бы общеизвестным ключом")
+        logger.warning("⚠️ SECRET_KEY не задан, токены подписываются ключом разработки")
+    
     try:
         create_tables()
         logger.info("✅ Database tables created successfully")
@@ -53,12 +70,18 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to create database tables: {e}")
         raise
     
+    async with async_session_maker() as db:
+        indexed = await SuggestService(SearchRepository(db), ChangeLogRepository(db)).rebuild()
+    logger.info(f"🔎 Suggest index built: {indexed} items")
+    
     logger.info(f"📊 Database URL: {os.getenv('DATABASE_URL', 'sqlite:///./app.db')}")
     logger.info("✅ Application started successfully")
     
     yield 
     
     logger.info("🛑 Shutting down E-Commerce API...")
+    await async_engine.dispose()
+    password_hasher.shutdown()
     logger.info("👋 Application stopped successfully")
 
 
@@ -75,12 +98,25 @@ app.mount("/app/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
 
+# Повтор записи с тем же Idempotency-Key отдаётся из хранилища ответов, без запросов в БД.
+# Добавляется до CORS, чтобы CORS-заголовки проставлялись и повторным ответам
+app.add_middleware(
+    IdempotencyMiddleware,
+    routes=[
+        ("POST", "/orders/"),
+        ("POST", "/carts/my/items"),
+        ("POST", "/carts/my/checkout"),
+        ("POST", "/favorites/"),
+    ],
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, ETAG_HEADER, IDEMPOTENT_REPLAYED_HEADER],
 )
 
 setup_exception_handlers(app)
@@ -95,6 +131,9 @@ app.include_router(favorite_router.router)
 app.include_router(review_router.router)
 app.include_router(chat_message_router.router)
 app.include_router(admin_router.router)
+app.include_router(change_router.router)
+app.include_router(search_router.router)
+app.include_router(catalog_router.router)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -126,10 +165,12 @@ async def read_admin_page(request: Request):
     return templates.TemplateResponse("admin.html", {"request": request})
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {
         "status": "healthy",
-        "database": "connected"
+        "database": "connected",
+        "password_hasher": password_hasher.metrics(),
+        "cache": {name: await cache.stats() for name, cache in caches.items()}
     }
 
 
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 from app.database.database import Base
 from app.config import settings
+from app.database.search_index import is_search_table
 
 # TODO Добавить сюда импорт созданных моделей
 # Пример:
@@ -23,6 +24,9 @@ from app.models.carts import CartModel
 from app.models.cart_items import CartItemModel
 from app.models.author_listing import AuthorListingModel
 from app.models.listing import ListingModel
+from app.models.table_version import TableVersionModel
+from app.models.change_log import ChangeLogModel
+from app.models.order_stats import OrderStatsModel
 
 
 
@@ -44,6 +48,12 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_name(name, type_, parent_names) -> bool:
+    # FTS5-индекс каталога создаётся миграцией вручную, моделей у него нет
+    return not (type_ == "table" and is_search_table(name))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -68,6 +78,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -75,7 +86,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_name=include_name)
 
     with context.begin_transaction():
         context.run_migrations()
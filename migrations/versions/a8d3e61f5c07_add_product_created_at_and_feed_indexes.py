@@ -0,0 +1,48 @@
+"""Add products.created_at and catalog feed indexes
+
+Revision ID: a8d3e61f5c07
+Revises: f2c6d8a41b93
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3e61f5c07'
+down_revision: Union[str, None] = 'f2c6d8a41b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('created_at', sa.DateTime(), nullable=True))
+    # Для старых товаров время создания неизвестно, берём последнее изменение.
+    # Значение пишется через тип DateTime, в том же формате, что и из приложения,
+    # иначе строки в SQLite сравнивались бы неверно
+    products = sa.table('products', sa.column('created_at', sa.DateTime()), sa.column('updated_at', sa.DateTime()))
+    op.execute(
+        products.update().values(
+            created_at=sa.func.coalesce(products.c.updated_at, sa.literal(datetime.utcnow(), sa.DateTime()))
+        )
+    )
+
+    op.create_index('ix_products_is_active_created_at', 'products', ['is_active', 'created_at'], unique=False)
+    op.create_index('ix_listing_status_create_at', 'listing', ['status', 'create_at'], unique=False)
+    op.create_index('ix_author_listing_status_created_at', 'author_listing', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_author_listing_status_created_at', table_name='author_listing')
+    op.drop_index('ix_listing_status_create_at', table_name='listing')
+    op.drop_index('ix_products_is_active_created_at', table_name='products')
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # batch-пересоздание таблицы удалило бы триггеры поискового индекса (catalog_search)
+        op.execute("ALTER TABLE products DROP COLUMN created_at")
+    else:
+        op.drop_column('products', 'created_at')
@@ -0,0 +1,60 @@
+"""Add secondary indexes
+
+Revision ID: b7c41e9d2a10
+Revises: 4f0dfaed07e3
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c41e9d2a10'
+down_revision: Union[str, None] = '4f0dfaed07e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_author_listing_topics_games'), 'author_listing', ['topics_games'], unique=False)
+    op.create_index(op.f('ix_author_listing_user_id'), 'author_listing', ['user_id'], unique=False)
+    op.create_index(op.f('ix_author_listing_status'), 'author_listing', ['status'], unique=False)
+    op.create_index(op.f('ix_carts_user_id'), 'carts', ['user_id'], unique=False)
+    op.create_index(op.f('ix_cart_items_cart_id'), 'cart_items', ['cart_id'], unique=False)
+    op.create_index('ix_chat_massage_user_id_sent_at', 'chat_massage', ['user_id', 'sent_at'], unique=False)
+    op.create_index('ix_favorite_user_id_added_at', 'favorite', ['user_id', 'added_at'], unique=False)
+    op.create_index(op.f('ix_listing_game_topic'), 'listing', ['game_topic'], unique=False)
+    op.create_index(op.f('ix_listing_user_id'), 'listing', ['user_id'], unique=False)
+    op.create_index(op.f('ix_listing_status'), 'listing', ['status'], unique=False)
+    op.create_index(op.f('ix_order_items_order_id'), 'order_items', ['order_id'], unique=False)
+    op.create_index('ix_orders_user_id_creat_at', 'orders', ['user_id', 'creat_at'], unique=False)
+    op.create_index(op.f('ix_orders_status'), 'orders', ['status'], unique=False)
+    op.create_index(op.f('ix_products_category'), 'products', ['category'], unique=False)
+    op.create_index(op.f('ix_products_is_active'), 'products', ['is_active'], unique=False)
+    op.create_index(op.f('ix_review_user_id'), 'review', ['user_id'], unique=False)
+    op.create_index(op.f('ix_review_products_id'), 'review', ['products_id'], unique=False)
+    op.create_index(op.f('ix_review_rating'), 'review', ['rating'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_review_rating'), table_name='review')
+    op.drop_index(op.f('ix_review_products_id'), table_name='review')
+    op.drop_index(op.f('ix_review_user_id'), table_name='review')
+    op.drop_index(op.f('ix_products_is_active'), table_name='products')
+    op.drop_index(op.f('ix_products_category'), table_name='products')
+    op.drop_index(op.f('ix_orders_status'), table_name='orders')
+    op.drop_index('ix_orders_user_id_creat_at', table_name='orders')
+    op.drop_index(op.f('ix_order_items_order_id'), table_name='order_items')
+    op.drop_index(op.f('ix_listing_status'), table_name='listing')
+    op.drop_index(op.f('ix_listing_user_id'), table_name='listing')
+    op.drop_index(op.f('ix_listing_game_topic'), table_name='listing')
+    op.drop_index('ix_favorite_user_id_added_at', table_name='favorite')
+    op.drop_index('ix_chat_massage_user_id_sent_at', table_name='chat_massage')
+    op.drop_index(op.f('ix_cart_items_cart_id'), table_name='cart_items')
+    op.drop_index(op.f('ix_carts_user_id'), table_name='carts')
+    op.drop_index(op.f('ix_author_listing_status'), table_name='author_listing')
+    op.drop_index(op.f('ix_author_listing_user_id'), table_name='author_listing')
+    op.drop_index(op.f('ix_author_listing_topics_games'), table_name='author_listing')
@@ -0,0 +1,77 @@
+"""Add orders.item_count and user_order_stats
+
+Revision ID: b7d2e94c3f18
+Revises: a8d3e61f5c07
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e94c3f18'
+down_revision: Union[str, None] = 'a8d3e61f5c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('orders', sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_table(
+        'user_order_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('total_spent', sa.DECIMAL(precision=12, scale=2), nullable=False),
+        sa.Column('last_order_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    orders = sa.table(
+        'orders',
+        sa.column('id', sa.Integer()),
+        sa.column('user_id', sa.Integer()),
+        sa.column('total_amount', sa.DECIMAL(10, 2)),
+        sa.column('item_count', sa.Integer()),
+        sa.column('creat_at', sa.DateTime()),
+    )
+    order_items = sa.table('order_items', sa.column('order_id', sa.Integer()), sa.column('quantity', sa.Integer()))
+    stats = sa.table(
+        'user_order_stats',
+        sa.column('user_id', sa.Integer()),
+        sa.column('order_count', sa.Integer()),
+        sa.column('total_spent', sa.DECIMAL(12, 2)),
+        sa.column('last_order_at', sa.DateTime()),
+        sa.column('updated_at', sa.DateTime()),
+    )
+
+    op.execute(
+        orders.update().values(
+            item_count=sa.select(sa.func.coalesce(sa.func.sum(order_items.c.quantity), 0))
+            .where(order_items.c.order_id == orders.c.id)
+            .scalar_subquery()
+        )
+    )
+    op.execute(
+        stats.insert().from_select(
+            ['user_id', 'order_count', 'total_spent', 'last_order_at', 'updated_at'],
+            sa.select(
+                orders.c.user_id,
+                sa.func.count(orders.c.id),
+                sa.func.coalesce(sa.func.sum(orders.c.total_amount), 0),
+                sa.func.max(orders.c.creat_at),
+                sa.literal(datetime.utcnow(), sa.DateTime()),
+            ).group_by(orders.c.user_id)
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_order_stats')
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('item_count')
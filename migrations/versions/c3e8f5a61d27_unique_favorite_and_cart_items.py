@@ -0,0 +1,61 @@
+"""Unique favorite and cart item per user/cart
+
+Revision ID: c3e8f5a61d27
+Revises: b7c41e9d2a10
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8f5a61d27'
+down_revision: Union[str, None] = 'b7c41e9d2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ITEM_COLUMNS = {
+    'favorite': ('products_id', 'listing_id', 'author_listing_id'),
+    'cart_items': ('product_id', 'listing_id', 'author_listing_id'),
+}
+
+
+def upgrade() -> None:
+    # Перед созданием уникальных индексов убираем дубли: в корзине количество
+    # складывается в самую раннюю позицию, в избранном остаётся первая запись
+    for column in ITEM_COLUMNS['cart_items']:
+        op.execute(
+            f"UPDATE cart_items SET quantity = ("
+            f" SELECT SUM(d.quantity) FROM cart_items d"
+            f" WHERE d.cart_id = cart_items.cart_id AND d.item_type = cart_items.item_type"
+            f" AND d.{column} = cart_items.{column})"
+            f" WHERE id IN (SELECT MIN(id) FROM cart_items WHERE {column} IS NOT NULL"
+            f" GROUP BY cart_id, item_type, {column} HAVING COUNT(*) > 1)"
+        )
+        op.execute(
+            f"DELETE FROM cart_items WHERE {column} IS NOT NULL AND id NOT IN ("
+            f" SELECT MIN(id) FROM cart_items WHERE {column} IS NOT NULL"
+            f" GROUP BY cart_id, item_type, {column})"
+        )
+        op.create_index(
+            f'uq_cart_items_cart_id_item_type_{column}', 'cart_items',
+            ['cart_id', 'item_type', column], unique=True
+        )
+
+    for column in ITEM_COLUMNS['favorite']:
+        op.execute(
+            f"DELETE FROM favorite WHERE {column} IS NOT NULL AND id NOT IN ("
+            f" SELECT MIN(id) FROM favorite WHERE {column} IS NOT NULL"
+            f" GROUP BY user_id, {column})"
+        )
+        op.create_index(f'uq_favorite_user_id_{column}', 'favorite', ['user_id', column], unique=True)
+
+
+def downgrade() -> None:
+    for column in reversed(ITEM_COLUMNS['favorite']):
+        op.drop_index(f'uq_favorite_user_id_{column}', table_name='favorite')
+    for column in reversed(ITEM_COLUMNS['cart_items']):
+        op.drop_index(f'uq_cart_items_cart_id_item_type_{column}', table_name='cart_items')
@@ -0,0 +1,74 @@
+"""Store orders.status as a SmallInteger code, index (status, creat_at)
+
+Revision ID: c4f9a2d7e615
+Revises: b7d2e94c3f18
+Create Date: 2026-10-18 00:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f9a2d7e615'
+down_revision: Union[str, None] = 'b7d2e94c3f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Коды как в app.models.order_status.ORDER_STATUS_CODES, на момент этой миграции
+STATUS_CODES = {
+    'pending': 1,
+    'paid': 2,
+    'processing': 3,
+    'shipped': 4,
+    'delivered': 5,
+    'cancelled': 6,
+}
+# Написания, встречавшиеся до появления перечня статусов
+LEGACY_STATUSES = {
+    'new': 'pending',
+    'completed': 'delivered',
+    'canceled': 'cancelled',
+}
+
+
+def upgrade() -> None:
+    op.add_column('orders', sa.Column('status_code', sa.SmallInteger(), nullable=True))
+    orders = sa.table('orders', sa.column('status', sa.String(50)), sa.column('status_code', sa.SmallInteger()))
+    names = {**{name: STATUS_CODES[target] for name, target in LEGACY_STATUSES.items()}, **STATUS_CODES}
+    # Неизвестные значения становятся pending: до этой миграции статус не проверялся
+    op.execute(
+        orders.update().values(
+            status_code=sa.case(
+                *[(sa.func.lower(orders.c.status) == name, code) for name, code in names.items()],
+                else_=STATUS_CODES['pending']
+            )
+        )
+    )
+
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_index('ix_orders_status')
+        batch_op.drop_column('status')
+        batch_op.alter_column('status_code', new_column_name='status', existing_type=sa.SmallInteger(), nullable=False)
+    op.create_index('ix_orders_status_creat_at', 'orders', ['status', 'creat_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.add_column('orders', sa.Column('status_name', sa.String(50), nullable=True))
+    orders = sa.table('orders', sa.column('status', sa.SmallInteger()), sa.column('status_name', sa.String(50)))
+    op.execute(
+        orders.update().values(
+            status_name=sa.case(
+                *[(orders.c.status == code, name) for name, code in STATUS_CODES.items()],
+                else_='pending'
+            )
+        )
+    )
+
+    op.drop_index('ix_orders_status_creat_at', table_name='orders')
+    with op.batch_alter_table('orders') as batch_op:
+        batch_op.drop_column('status')
+        batch_op.alter_column('status_name', new_column_name='status', existing_type=sa.String(50), nullable=False)
+    op.create_index('ix_orders_status', 'orders', ['status'], unique=False)
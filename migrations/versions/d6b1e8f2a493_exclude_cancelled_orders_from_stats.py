@@ -0,0 +1,65 @@
+"""Recount user_order_stats without cancelled orders
+
+Revision ID: d6b1e8f2a493
+Revises: c4f9a2d7e615
+Create Date: 2026-10-18 02:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6b1e8f2a493'
+down_revision: Union[str, None] = 'c4f9a2d7e615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Код cancelled из app.models.order_status.ORDER_STATUS_CODES
+CANCELLED_CODE = 6
+
+
+def _recount(excluded_status: Optional[int]) -> None:
+    orders = sa.table(
+        'orders',
+        sa.column('id', sa.Integer()),
+        sa.column('user_id', sa.Integer()),
+        sa.column('total_amount', sa.DECIMAL(10, 2)),
+        sa.column('status', sa.SmallInteger()),
+        sa.column('creat_at', sa.DateTime()),
+    )
+    stats = sa.table(
+        'user_order_stats',
+        sa.column('user_id', sa.Integer()),
+        sa.column('order_count', sa.Integer()),
+        sa.column('total_spent', sa.DECIMAL(12, 2)),
+        sa.column('last_order_at', sa.DateTime()),
+        sa.column('updated_at', sa.DateTime()),
+    )
+    totals = sa.select(
+        orders.c.user_id,
+        sa.func.count(orders.c.id),
+        sa.func.coalesce(sa.func.sum(orders.c.total_amount), 0),
+        sa.func.max(orders.c.creat_at),
+        sa.literal(datetime.utcnow(), sa.DateTime()),
+    ).group_by(orders.c.user_id)
+    if excluded_status is not None:
+        totals = totals.where(orders.c.status != excluded_status)
+
+    op.execute(stats.delete())
+    op.execute(
+        stats.insert().from_select(
+            ['user_id', 'order_count', 'total_spent', 'last_order_at', 'updated_at'], totals
+        )
+    )
+
+
+def upgrade() -> None:
+    _recount(CANCELLED_CODE)
+
+
+def downgrade() -> None:
+    _recount(None)
@@ -0,0 +1,46 @@
+"""Add row versions and change_log
+
+Revision ID: e4a7b3c90f16
+Revises: d91a0c4b7e52
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7b3c90f16'
+down_revision: Union[str, None] = 'd91a0c4b7e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATALOG_TABLES = ('products', 'listing', 'author_listing')
+
+
+def upgrade() -> None:
+    for table in CATALOG_TABLES:
+        op.add_column(table, sa.Column('row_version', sa.Integer(), server_default='1', nullable=False))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    op.create_table('change_log',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('table_name', sa.String(length=100), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('operation', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_change_log_table_name_id', 'change_log', ['table_name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_log_table_name_id', table_name='change_log')
+    op.drop_table('change_log')
+
+    for table in CATALOG_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
+            batch_op.drop_column('row_version')
@@ -0,0 +1,26 @@
+"""Index review.is_verified
+
+Revision ID: e8c3a1f5b742
+Revises: d6b1e8f2a493
+Create Date: 2026-10-18 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c3a1f5b742'
+down_revision: Union[str, None] = 'd6b1e8f2a493'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_review_is_verified'), 'review', ['is_verified'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_review_is_verified'), table_name='review')
@@ -0,0 +1,68 @@
+"""Add catalog_search FTS5 index
+
+Revision ID: f2c6d8a41b93
+Revises: e4a7b3c90f16
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d8a41b93'
+down_revision: Union[str, None] = 'e4a7b3c90f16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# тип -> (код в rowid, таблица, описание, тема)
+SOURCES = {
+    'product': (1, 'products', 'description', 'category'),
+    'listing': (2, 'listing', None, 'game_topic'),
+    'author_listing': (3, 'author_listing', None, 'topics_games'),
+}
+COLUMNS = 'rowid, item_type, item_id, title, description, topic'
+
+
+def _values(item_type: str, alias: str) -> str:
+    code, _, description, topic = SOURCES[item_type]
+    description_sql = f'{alias}.{description}' if description else 'NULL'
+    return f"{alias}.id * 4 + {code}, '{item_type}', {alias}.id, {alias}.title, {description_sql}, {alias}.{topic}"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE catalog_search USING fts5("
+        "item_type UNINDEXED, item_id UNINDEXED, title, description, topic, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    for item_type, (code, table, description, topic) in SOURCES.items():
+        indexed = ', '.join(column for column in ('title', description, topic) if column)
+        op.execute(
+            f"CREATE TRIGGER {table}_search_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO catalog_search ({COLUMNS}) VALUES ({_values(item_type, 'new')}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_search_au AFTER UPDATE OF {indexed} ON {table} BEGIN "
+            f"DELETE FROM catalog_search WHERE rowid = old.id * 4 + {code}; "
+            f"INSERT INTO catalog_search ({COLUMNS}) VALUES ({_values(item_type, 'new')}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_search_ad AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM catalog_search WHERE rowid = old.id * 4 + {code}; END"
+        )
+        op.execute(f"INSERT INTO catalog_search ({COLUMNS}) SELECT {_values(item_type, 't')} FROM {table} t")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for _, table, _, _ in SOURCES.values():
+        for suffix in ('ai', 'au', 'ad'):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+    op.execute("DROP TABLE IF EXISTS catalog_search")
@@ -0,0 +1,8 @@
+from app.database.index_check import find_unindexed_filters
+
+
+def test_repository_and_service_filters_are_indexed():
+    problems = find_unindexed_filters()
+    assert problems == [], "\n".join(
+        f"{method}: {table}({', '.join(sorted(columns))})" for method, table, columns in problems
+    )